@@ -0,0 +1,45 @@
+"""Throughput of KonanSDK.predict_many against a serial predict() loop.
+
+Each prediction takes 5ms, and about 1% of them fail with HTTP 500.
+Run from the repository's root, which must be importable for the fake server of the tests:
+
+    PYTHONPATH=. poetry run python benchmarks/bench_predict_many.py
+"""
+import time
+
+from konan_sdk.sdk import KonanSDK
+from tests.conftest import FakeKonanServer
+
+INPUTS_COUNT = 2000
+
+
+def main() -> None:
+    server = FakeKonanServer(predict_delay=0.005, fail_predict=lambda body: body['i'] % 97 == 0)
+    server.start()
+    url = server.url
+
+    sdk = KonanSDK(auth_url=url, api_url=url)
+    sdk.login(api_key='benchmark')
+    started_at = time.perf_counter()
+    for i in range(INPUTS_COUNT):
+        try:
+            sdk.predict('d', {'i': i})
+        except Exception:
+            pass
+    print(f"serial predict() loop:           {INPUTS_COUNT / (time.perf_counter() - started_at):4.0f} predictions/s")
+
+    for max_concurrency in (1, 8, 32):
+        sdk = KonanSDK(auth_url=url, api_url=url, pool_maxsize=max(max_concurrency, 10))
+        sdk.login(api_key='benchmark')
+        started_at = time.perf_counter()
+        results = list(sdk.predict_many('d', ({'i': i} for i in range(INPUTS_COUNT)), max_concurrency=max_concurrency))
+        elapsed = time.perf_counter() - started_at
+        assert [result.index for result in results] == list(range(INPUTS_COUNT))
+        print(
+            f"predict_many max_concurrency={max_concurrency:<2}: {INPUTS_COUNT / elapsed:4.0f} predictions/s, "
+            f"{sum(not result.is_success for result in results)} failed"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""Latency of sequential predictions, through bare requests.post and through KonanSDK's pooled transport.
+
+Run from the repository's root, which must be importable for the fake server of the tests:
+
+    PYTHONPATH=. poetry run python benchmarks/bench_transport.py
+"""
+import statistics
+import time
+
+import requests
+
+from konan_sdk.sdk import KonanSDK
+from tests.conftest import FakeKonanServer
+
+CALLS_COUNT = 2000
+
+
+def measure(function) -> str:
+    latencies = []
+    for _ in range(CALLS_COUNT):
+        started_at = time.perf_counter()
+        function()
+        latencies.append(time.perf_counter() - started_at)
+    latencies.sort()
+    return f"mean {statistics.mean(latencies) * 1e6:.0f}us p99 {latencies[int(CALLS_COUNT * 0.99)] * 1e6:.0f}us"
+
+
+def main() -> None:
+    server = FakeKonanServer()
+    server.start()
+    url = server.url
+    sdk = KonanSDK(auth_url=url, api_url=url)
+    sdk.login(api_key='benchmark')
+    headers = {'Authorization': f'Bearer {sdk.auth.user.access_token}'}
+
+    print(f"bare requests.post: {measure(lambda: requests.post(f'{url}/deployments/d/predict/', json={'a': 1}, headers=headers).json())}")
+    print(f"KonanSDK.predict:   {measure(lambda: sdk.predict('d', {'a': 1}))}")
+
+
+if __name__ == '__main__':
+    main()
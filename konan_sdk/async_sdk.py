@@ -0,0 +1,536 @@
+import datetime
+from typing import (
+    AsyncGenerator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union
+)
+
+from konan_sdk.auth import KonanAPIKeyAuth
+from konan_sdk.base_sdk import _AbstractKonanSDK
+from konan_sdk.endpoints.circuit_breakers import KonanCircuitBreaker
+from konan_sdk.endpoints.deadlines import KonanDeadline, KonanDeadlineLike
+from konan_sdk.endpoints.deployments import EvaluateEndpoint
+from konan_sdk.endpoints.models import (
+    GetModelsEndpoint,
+    SwitchLiveModelEndpoint,
+    SwitchNonLiveModelEndpoint,
+)
+from konan_sdk.endpoints.predictions import (
+    FeedbackEndpoint,
+    PredictionEndpoint,
+)
+from konan_sdk.endpoints.rate_limiters import KonanRateLimiter
+from konan_sdk.endpoints.retries import KonanRetryPolicy
+from konan_sdk.endpoints.transports import (
+    DEFAULT_POOL_MAXSIZE,
+    DEFAULT_TIMEOUT,
+    KonanAsyncClientTransport,
+    KonanBaseAsyncTransport,
+    KonanTimeout,
+)
+from konan_sdk.konan_metrics import KonanBaseMetric
+from konan_sdk.konan_token_stores import KonanBaseTokenStore
+from konan_sdk.konan_types import (
+    KonanFeedbackSubmission,
+    KonanFeedbacksResult,
+    KonanLiveModelSwitchState,
+    KonanModel,
+    KonanModelState,
+    KonanPrediction,
+    KonanPredictionBatch,
+    KonanTimeWindow,
+)
+from konan_sdk.konan_utils.caches import KonanPredictionCache
+from konan_sdk.konan_utils.concurrency import KonanSingleFlight
+from konan_sdk.konan_utils.models import KonanModelIndex, KonanModelRegistry
+
+
+class AsyncKonanSDK(_AbstractKonanSDK):
+    """konan-sdk's asyncio class for API integration.
+
+    Mirrors the KonanSDK prediction and model management methods as coroutines,
+    sharing one pooled connection pool with a bounded number of requests in flight.
+    """
+    def __init__(
+        self, auth_url="https://auth.konan.ai", api_url="https://api.konan.ai",
+        verbose=False,
+        transport: Optional[KonanBaseAsyncTransport] = None,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[KonanTimeout] = DEFAULT_TIMEOUT,
+        retry_policy: Optional[KonanRetryPolicy] = None,
+        circuit_breaker: Optional[KonanCircuitBreaker] = None,
+        rate_limiter: Optional[KonanRateLimiter] = None,
+        prediction_cache: Optional[KonanPredictionCache] = None,
+        single_flight: Optional[KonanSingleFlight] = None,
+        model_registry: Optional[KonanModelRegistry] = None,
+    ):
+        """Initialize a new AsyncKonanSDK
+
+        :param auth_url: base URL of the Konan authentication API, defaults to "https://auth.konan.ai"
+        :type auth_url: str, optional
+        :param api_url: base URL of the Konan API, defaults to "https://api.konan.ai"
+        :type api_url: str, optional
+        :param verbose: whether to log debug messages, defaults to False
+        :type verbose: bool, optional
+        :param transport: transport shared by all requests, defaults to None.
+            If left as None, a KonanAsyncClientTransport is created
+        :type transport: Optional[KonanBaseAsyncTransport], optional
+        :param pool_maxsize: maximum number of connections to keep alive, defaults to DEFAULT_POOL_MAXSIZE.
+            Ignored if transport is passed
+        :type pool_maxsize: int, optional
+        :param max_concurrency: maximum number of requests in flight, defaults to None (pool_maxsize).
+            Ignored if transport is passed
+        :type max_concurrency: Optional[int], optional
+        :param timeout: default (connect, read) timeout of every request, defaults to DEFAULT_TIMEOUT.
+            Pass None to wait indefinitely. Ignored if transport is passed
+        :type timeout: Optional[KonanTimeout], optional
+        :param retry_policy: policy to retry failed requests with, defaults to None.
+            If left as None, a default KonanRetryPolicy is used, which never retries non-idempotent requests
+            such as predictions. Pass KonanRetryPolicy(max_attempts=1) to never retry
+        :type retry_policy: Optional[KonanRetryPolicy], optional
+        :param circuit_breaker: circuit breaker failing predictions and evaluations fast, per deployment,
+            while the deployment is unhealthy, defaults to None (never fail fast).
+            Its circuits' states are available through circuit_breaker.get_statuses()
+        :type circuit_breaker: Optional[KonanCircuitBreaker], optional
+        :param rate_limiter: limiter smoothing the rate and number in flight of all requests,
+            with optional tighter limits per endpoint, defaults to None (unlimited)
+        :type rate_limiter: Optional[KonanRateLimiter], optional
+        :param prediction_cache: cache serving repeated predictions of the same input by the same live model,
+            for deployments whose models are deterministic, defaults to None (never cache).
+            Its hit and miss counts are available through prediction_cache.hits and prediction_cache.misses
+        :type prediction_cache: Optional[KonanPredictionCache], optional
+        :param single_flight: coalescer sharing one prediction request, and its result, between concurrent
+            predictions of the same input by the same deployment, defaults to None (never coalesce).
+            The number of coalesced predictions is available through single_flight.coalesced_count
+        :type single_flight: Optional[KonanSingleFlight], optional
+        :param model_registry: cache of the models of each deployment, used to switch model states
+            without listing the deployment's models every time, defaults to None (always list them)
+        :type model_registry: Optional[KonanModelRegistry], optional
+        """
+        super().__init__(
+            auth_url=auth_url, api_url=api_url,
+            verbose=verbose,
+            transport=transport or KonanAsyncClientTransport(
+                pool_maxsize=pool_maxsize,
+                max_concurrency=max_concurrency,
+                timeout=timeout,
+            ),
+            retry_policy=retry_policy,
+            circuit_breaker=circuit_breaker,
+            rate_limiter=rate_limiter,
+            prediction_cache=prediction_cache,
+            single_flight=single_flight,
+            model_registry=model_registry,
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Stop renewing tokens in the background, and close all connections held by the AsyncKonanSDK's transport
+        """
+        if self.auth is not None:
+            self.auth.stop_background_refresh()
+        await self.transport.aclose()
+
+    async def login(
+        self, api_key: str,
+        background_refresh_margin: Optional[float] = None,
+        token_store: Optional[KonanBaseTokenStore] = None,
+    ) -> None:
+        """Login to Konan with an API Key.
+
+        :param api_key: API Key of registered user
+        :type api_key: str
+        :param background_refresh_margin: if passed, renew the tokens from a background task
+            this many seconds before they expire, instead of inline on the first request after they do,
+            defaults to None
+        :type background_refresh_margin: Optional[float], optional
+        :param token_store: store to share tokens through with other processes using the same API Key,
+            e.g. a KonanFileTokenStore, defaults to None
+        :type token_store: Optional[KonanBaseTokenStore], optional
+        """
+        if self.auth is not None:
+            self.auth.stop_background_refresh()
+
+        self.auth = KonanAPIKeyAuth(
+            auth_url=self.auth_url, api_key=api_key,
+            transport=self.transport, retry_policy=self.retry_policy,
+            token_store=token_store,
+        )
+
+        await self.auth.alogin()
+
+        if background_refresh_margin is not None:
+            self.auth.astart_background_refresh(margin=background_refresh_margin)
+
+    async def get_models(
+        self,
+        deployment_uuid: str,
+        timeout: Optional[KonanTimeout] = None,
+        deadline: Optional[KonanDeadlineLike] = None,
+    ) -> List[KonanModel]:
+        """Call the get models function
+
+        :param deployment_uuid: uuid of the deployment to get its models
+        :type deployment_uuid: str
+        :param timeout: timeout of every request, defaults to None (the SDK's default timeout)
+        :type timeout: Optional[KonanTimeout], optional
+        :param deadline: seconds the whole call may take, including retries and token refresh,
+            or a KonanDeadline shared with other calls, defaults to None (no deadline).
+            Once it passes, a KonanDeadlineExceededError is raised
+        :type deadline: Optional[KonanDeadlineLike], optional
+        :return: konan_models
+        :rtype: List[KonanModel]
+        """
+        deadline = KonanDeadline.create(deadline)
+        # check user performed login
+        self.auth._post_login_checks()
+
+        # Check if access token is valid and retrieve a new one if needed
+        await self.auth.aauto_refresh_token(deadline=deadline)
+
+        konan_models = await self._create_endpoint(
+            GetModelsEndpoint,
+            timeout=timeout, deadline=deadline,
+            deployment_uuid=deployment_uuid,
+        ).arequest(None)
+
+        self._on_models_listed(deployment_uuid, konan_models)
+        return konan_models
+
+    async def _get_model_index(
+        self,
+        deployment_uuid: str,
+        model_uuids: Iterable[Optional[str]] = (),
+        timeout: Optional[KonanTimeout] = None,
+        deadline: Optional[KonanDeadline] = None,
+    ) -> KonanModelIndex:
+        index = self._get_registered_model_index(deployment_uuid, model_uuids)
+        if index is not None:
+            return index
+        return KonanModelIndex(await self.get_models(deployment_uuid, timeout=timeout, deadline=deadline))
+
+    async def _switch_nonlive_model(
+        self,
+        model_uuid: str,
+        switch_to: KonanModelState,
+        timeout: Optional[KonanTimeout] = None,
+        deadline: Optional[KonanDeadlineLike] = None,
+    ) -> None:
+        deadline = KonanDeadline.create(deadline)
+        # check user performed login
+        self.auth._post_login_checks()
+        # Check if access token is valid and retrieve a new one if needed
+        await self.auth.aauto_refresh_token(deadline=deadline)
+
+        return await self._create_endpoint(
+            SwitchNonLiveModelEndpoint,
+            timeout=timeout, deadline=deadline,
+            model_uuid=model_uuid,
+        ).arequest(
+            switch_to,
+        )
+
+    async def _switch_live_model(
+        self,
+        deployment_uuid: str,
+        live_model_uuid: str,
+        switch_to: KonanModelState,
+        models: KonanModelIndex,
+        new_live_model_uuid: str = None,
+        timeout: Optional[KonanTimeout] = None,
+        deadline: Optional[KonanDeadlineLike] = None,
+    ) -> None:
+        deadline = KonanDeadline.create(deadline)
+        self._check_live_model_switch(deployment_uuid, live_model_uuid, models, new_live_model_uuid)
+        # check user performed login
+        self.auth._post_login_checks()
+        # Check if access token is valid and retrieve a new one if needed
+        await self.auth.aauto_refresh_token(deadline=deadline)
+
+        switch_result = await self._create_endpoint(
+            SwitchLiveModelEndpoint,
+            timeout=timeout, deadline=deadline,
+            deployment_uuid=deployment_uuid,
+        ).arequest(
+            KonanLiveModelSwitchState(
+                switch_to,
+                new_live_model_uuid,
+            ),
+        )
+        self._on_model_states_switched(deployment_uuid, {
+            live_model_uuid: switch_to,
+            new_live_model_uuid: KonanModelState.Live,
+        })
+        return switch_result
+
+    async def switch_model_state(
+        self,
+        deployment_uuid: str,
+        model_uuid: str,
+        switch_to: KonanModelState,
+        new_live_model_uuid: str = None,
+        timeout: Optional[KonanTimeout] = None,
+        deadline: Optional[KonanDeadlineLike] = None,
+    ) -> None:
+        """Switch the sate of a Konan Model
+
+        If model_uuid is the UUID of the current Live model then:
+        - it will be demoted to Challenger, and
+        - the parameter new_live_model_uuid is required
+
+        :param deployment_uuid: UUID of deployment
+        :type deployment_uuid: str
+        :param model_uuid: UUID of model to switch
+        :type model_uuid: str
+        :param switch_to: new state to switch mode to. Must be different from the model's current state
+        :type switch_to: KonanModelState
+        :param new_live_model_uuid: UUID of the model to promote to live, defaults to None.
+        Required only if model_uuid is the UUID of the current Live model
+        :type new_live_model_uuid: str, optional
+        :param timeout: timeout of every request, defaults to None (the SDK's default timeout)
+        :type timeout: Optional[KonanTimeout], optional
+        :param deadline: seconds the whole call may take, including retries and token refresh,
+            or a KonanDeadline shared with other calls, defaults to None (no deadline).
+            Once it passes, a KonanDeadlineExceededError is raised
+        :type deadline: Optional[KonanDeadlineLike], optional
+        :return: None
+        :rtype: None
+        """
+        deadline = KonanDeadline.create(deadline)
+        # Retrieve models linked with this deployment, indexed by uuid and state
+        models = await self._get_model_index(
+            deployment_uuid,
+            model_uuids=(model_uuid, new_live_model_uuid),
+            timeout=timeout, deadline=deadline,
+        )
+        live_model_switch = self._get_live_model_switch(
+            deployment_uuid, model_uuid, switch_to, models, new_live_model_uuid,
+        )
+        try:
+            if live_model_switch is not None:
+                return await self._switch_live_model(
+                    deployment_uuid=deployment_uuid,
+                    models=models,
+                    timeout=timeout, deadline=deadline,
+                    **live_model_switch,
+                )
+            switch_result = await self._switch_nonlive_model(
+                model_uuid, switch_to,
+                timeout=timeout, deadline=deadline,
+            )
+            self._on_model_states_switched(deployment_uuid, {model_uuid: switch_to})
+            return switch_result
+        except Exception:
+            self._on_model_switch_failed(deployment_uuid)
+            raise
+
+    async def predict(
+        self,
+        deployment_uuid: str, input_data: Union[Dict, str],
+        timeout: Optional[KonanTimeout] = None,
+        deadline: Optional[KonanDeadlineLike] = None,
+    ) -> Tuple[str, Dict]:
+        """Call the predict function for a given deployment
+
+        :param deployment_uuid: uuid of deployment to use for prediction
+        :type deployment_uuid: str
+        :param input_data: data to pass to the model
+        :type input_data: Union[Dict, str]
+        :param timeout: timeout of every request, defaults to None (the SDK's default timeout)
+        :type timeout: Optional[KonanTimeout], optional
+        :param deadline: seconds the whole call may take, including retries and token refresh,
+            or a KonanDeadline shared with other calls, defaults to None (no deadline).
+            Once it passes, a KonanDeadlineExceededError is raised
+        :type deadline: Optional[KonanDeadlineLike], optional
+        :return: A tuple of prediction uuid and the prediction output
+        :rtype: Tuple[str, Dict]
+        """
+        deadline = KonanDeadline.create(deadline)
+        cache_key = None
+        if self.prediction_cache is not None:
+            cache_key, cached_prediction = self._get_cached_prediction(
+                deployment_uuid,
+                await self._get_live_model_uuid(deployment_uuid, timeout=timeout, deadline=deadline),
+                input_data,
+            )
+            if cached_prediction is not None:
+                return cached_prediction
+
+        if self.single_flight is None:
+            return await self._request_prediction(deployment_uuid, input_data, cache_key, timeout, deadline)
+        # Identical predictions arriving while this one is in flight share its request
+        return await self.single_flight.acall(
+            self._get_single_flight_key(deployment_uuid, input_data),
+            lambda: self._request_prediction(deployment_uuid, input_data, cache_key, timeout, deadline),
+            deadline=deadline,
+        )
+
+    async def _request_prediction(
+        self,
+        deployment_uuid: str, input_data: Union[Dict, str],
+        cache_key: Optional[str],
+        timeout: Optional[KonanTimeout],
+        deadline: Optional[KonanDeadline],
+    ) -> Tuple[str, Dict]:
+        # check user performed login
+        self.auth._post_login_checks()
+
+        # Check if access token is valid and retrieve a new one if needed
+        await self.auth.aauto_refresh_token(deadline=deadline)
+
+        prediction = await self._create_endpoint(
+            PredictionEndpoint,
+            timeout=timeout, deadline=deadline,
+            deployment_uuid=deployment_uuid,
+            circuit_breaker=self.circuit_breaker,
+        ).arequest(input_data)
+        return self._on_prediction(deployment_uuid, cache_key, prediction)
+
+    async def _get_live_model_uuid(
+        self,
+        deployment_uuid: str,
+        timeout: Optional[KonanTimeout] = None,
+        deadline: Optional[KonanDeadline] = None,
+    ) -> Optional[str]:
+        # Remembered by the prediction cache, to avoid listing the deployment's models on every prediction
+        live_model_uuid = self.prediction_cache.get_live_model(deployment_uuid)
+        if live_model_uuid is None:
+            live_model_uuid = (
+                await self._get_model_index(deployment_uuid, timeout=timeout, deadline=deadline)
+            ).live_model_uuid
+            self.prediction_cache.set_live_model(deployment_uuid, live_model_uuid)
+        return live_model_uuid
+
+    async def evaluate(
+        self, deployment_uuid: str,
+        start_time: datetime.datetime, end_time: datetime.datetime,
+        timeout: Optional[KonanTimeout] = None,
+        deadline: Optional[KonanDeadlineLike] = None,
+    ) -> List[KonanBaseMetric]:
+        """Call the evaluate function for a given deployment
+
+        :param deployment_uuid: uuid of deployment to use for evaluation
+        :type deployment_uuid: str
+        :param start_time: use predictions made at or after this time
+        :type start_time: datetime.datetime
+        :param end_time: use predictions made before or at this time
+        :type end_time: datetime.datetime
+        :param timeout: timeout of every request, defaults to None (the SDK's default timeout)
+        :type timeout: Optional[KonanTimeout], optional
+        :param deadline: seconds the whole call may take, including retries and token refresh,
+            or a KonanDeadline shared with other calls, defaults to None (no deadline).
+            Once it passes, a KonanDeadlineExceededError is raised
+        :type deadline: Optional[KonanDeadlineLike], optional
+        :return: A model evaluation object
+        :rtype: List[KonanBaseMetric]
+        """
+        deadline = KonanDeadline.create(deadline)
+        # check user performed login
+        self.auth._post_login_checks()
+
+        # Check if access token is valid and retrieve a new one if needed
+        await self.auth.aauto_refresh_token(deadline=deadline)
+
+        model_metrics = await self._create_endpoint(
+            EvaluateEndpoint,
+            deployment_uuid=deployment_uuid,
+            timeout=timeout, deadline=deadline,
+            circuit_breaker=self.circuit_breaker,
+        ).arequest(KonanTimeWindow(start_time, end_time))
+
+        return model_metrics
+
+    async def feedback(
+        self, deployment_uuid: str,
+        feedbacks: List[KonanFeedbackSubmission],
+        timeout: Optional[KonanTimeout] = None,
+        deadline: Optional[KonanDeadlineLike] = None,
+    ) -> KonanFeedbacksResult:
+        """Call the feedback function for a given deployment
+
+        :param deployment_uuid: uuid of deployment to use for prediction
+        :type deployment_uuid: str
+        :param feedbacks: feedback objects to register with the deployment
+        :type feedbacks: List[KonanFeedbackSubmission]
+        :param timeout: timeout of every request, defaults to None (the SDK's default timeout)
+        :type timeout: Optional[KonanTimeout], optional
+        :param deadline: seconds the whole call may take, including retries and token refresh,
+            or a KonanDeadline shared with other calls, defaults to None (no deadline).
+            Once it passes, a KonanDeadlineExceededError is raised
+        :type deadline: Optional[KonanDeadlineLike], optional
+        :return: feedback result
+        :rtype: KonanFeedbacksResult
+        """
+        deadline = KonanDeadline.create(deadline)
+        # check user performed login
+        self.auth._post_login_checks()
+
+        # Check if access token is valid and retrieve a new one if needed
+        await self.auth.aauto_refresh_token(deadline=deadline)
+
+        feedbacks_result = await self._create_endpoint(
+            FeedbackEndpoint,
+            deployment_uuid=deployment_uuid,
+            timeout=timeout, deadline=deadline,
+        ).arequest(feedbacks)
+        return feedbacks_result
+
+    async def get_predictions(
+        self, deployment_uuid: str,
+        start_time: datetime.datetime, end_time: datetime.datetime,
+        page_size: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        as_batches: bool = False,
+        timeout: Optional[KonanTimeout] = None,
+        deadline: Optional[KonanDeadlineLike] = None,
+    ) -> AsyncGenerator[Union[List[KonanPrediction], KonanPredictionBatch], None]:
+        """Iterate over the pages of predictions made by a given deployment
+
+        :param deployment_uuid: uuid of deployment to list its predictions
+        :type deployment_uuid: str
+        :param start_time: list predictions made at or after this time
+        :type start_time: datetime.datetime
+        :param end_time: list predictions made before or at this time
+        :type end_time: datetime.datetime
+        :param page_size: number of predictions per page, defaults to None (the API's default)
+        :type page_size: Optional[int], optional
+        :param fields: KonanPrediction attributes to retrieve, any of "uuid", "output", "features" and "feedback",
+            defaults to None (all of them)
+        :type fields: Optional[List[str]], optional
+        :param as_batches: whether to return each page as a columnar KonanPredictionBatch
+            instead of a list of KonanPredictions, defaults to False
+        :type as_batches: bool, optional
+        :param timeout: timeout of every request, defaults to None (the SDK's default timeout)
+        :type timeout: Optional[KonanTimeout], optional
+        :param deadline: seconds the whole call may take, including retries and token refresh,
+            or a KonanDeadline shared with other calls, defaults to None (no deadline).
+            Once it passes, a KonanDeadlineExceededError is raised
+        :type deadline: Optional[KonanDeadlineLike], optional
+        :return: async generator of pages of predictions
+        :rtype: AsyncGenerator[Union[List[KonanPrediction], KonanPredictionBatch], None]
+        """
+        deadline = KonanDeadline.create(deadline)
+        # check user performed login
+        self.auth._post_login_checks()
+
+        # Check if access token is valid and retrieve a new one if needed
+        await self.auth.aauto_refresh_token(deadline=deadline)
+
+        predictions_generator = self._create_predictions_endpoint(
+            deployment_uuid,
+            page_size=page_size, fields=fields, as_batches=as_batches,
+            timeout=timeout, deadline=deadline,
+        ).aget_pages(request_object=KonanTimeWindow(start_time, end_time))
+
+        async for predictions in predictions_generator:
+            yield predictions
@@ -1,42 +1,128 @@
 
+import asyncio
+import hashlib
+import threading
+import time
 from abc import abstractmethod
 from loguru import logger
-from typing import Optional
+from typing import Any, Dict, Optional, Union
 from konan_sdk.konan_types import KonanCredentials
 import deprecated
+import jwt
 
+from konan_sdk.konan_token_stores import KonanBaseTokenStore
 from konan_sdk.konan_user import KonanUser
 from konan_sdk.endpoints.auth import APIKeyLoginEndpoint, LoginEndpoint, RefreshTokenEndpoint
+from konan_sdk.endpoints.deadlines import KonanDeadline
+from konan_sdk.endpoints.retries import KonanRetryPolicy
+from konan_sdk.endpoints.transports import KonanBaseAsyncTransport, KonanBaseTransport
+from konan_sdk.konan_exceptions import KonanDeadlineExceededError
+
+DEFAULT_BACKGROUND_REFRESH_MARGIN = 60.0  #: Default seconds before a token expires to renew it in the background
+DEFAULT_BACKGROUND_REFRESH_RETRY_INTERVAL = 5.0  #: Default seconds to wait before retrying a failed background renewal
+MIN_BACKGROUND_REFRESH_DELAY = 1.0  #: Minimum seconds between consecutive background renewals
 
 
 class _AbstractKonanAuth():
-    def __init__(self, auth_url: str) -> None:
+    def __init__(
+        self, auth_url: str,
+        transport: Optional[Union[KonanBaseTransport, KonanBaseAsyncTransport]] = None,
+        retry_policy: Optional[KonanRetryPolicy] = None,
+    ) -> None:
         self.auth_url = auth_url
+        self.transport = transport
+        self.retry_policy = retry_policy
         self.user: Optional[KonanUser] = None
 
+        # Ensure only one caller refreshes the tokens at a time, while others wait for, then reuse, its result
+        self._refresh_lock = threading.Lock()
+        self._async_refresh_lock: Optional[asyncio.Lock] = None
+
     def _post_login_checks(self) -> None:
         assert self.user is not None, "User credentials were not provided. Please use the .login() method first."
 
-    def refresh_token(self) -> None:
+    def _set_user(self, user: KonanUser) -> KonanUser:
+        # Updated in place, so that endpoints created with the current user send the new tokens too
+        if self.user is None:
+            self.user = user
+        else:
+            self.user.update(user)
+        return self.user
+
+    def _endpoint_kwargs(self, deadline: Optional[KonanDeadline]) -> Dict[str, Any]:
+        return dict(transport=self.transport, retry_policy=self.retry_policy, deadline=deadline)
+
+    def refresh_token(self, deadline: Optional[KonanDeadline] = None) -> None:
         self._post_login_checks()
 
-        new_access_token = RefreshTokenEndpoint(self.auth_url).request(
+        new_access_token = RefreshTokenEndpoint(self.auth_url, **self._endpoint_kwargs(deadline)).request(
             self.user.refresh_token
         )
         self.user.set_access_token(new_access_token)
 
-    def auto_refresh_token(self) -> None:
+    async def arefresh_token(self, deadline: Optional[KonanDeadline] = None) -> None:
+        self._post_login_checks()
+
+        new_access_token = await RefreshTokenEndpoint(self.auth_url, **self._endpoint_kwargs(deadline)).arequest(
+            self.user.refresh_token
+        )
+        self.user.set_access_token(new_access_token)
+
+    def auto_refresh_token(self, deadline: Optional[KonanDeadline] = None) -> None:
         # Check if access token is valid and retrieve a new one if needed
-        if not self.user.is_access_valid():
+        if self.user.is_access_valid():
+            return
+
+        if not self._refresh_lock.acquire(timeout=deadline.remaining() if deadline is not None else -1):
+            raise KonanDeadlineExceededError(deadline.seconds)
+        try:
+            # Another thread may have refreshed the tokens while this one was waiting for the lock
+            if self.user.is_access_valid():
+                return
+            if self.user.is_refresh_valid():
+                logger.debug("Access token has expired. Refreshing.")
+                self.refresh_token(deadline=deadline)
+            else:
+                logger.debug("Both access and refresh tokens have expired, re-logging in.")
+                self.login(deadline=deadline)
+        finally:
+            self._refresh_lock.release()
+
+    async def aauto_refresh_token(self, deadline: Optional[KonanDeadline] = None) -> None:
+        # Check if access token is valid and retrieve a new one if needed
+        if self.user.is_access_valid():
+            return
+
+        # Created lazily so that it binds to the running event loop
+        if self._async_refresh_lock is None:
+            self._async_refresh_lock = asyncio.Lock()
+
+        try:
+            await asyncio.wait_for(
+                self._async_refresh_lock.acquire(),
+                timeout=deadline.remaining() if deadline is not None else None,
+            )
+        except asyncio.TimeoutError:
+            raise KonanDeadlineExceededError(deadline.seconds)
+        try:
+            # Another task may have refreshed the tokens while this one was waiting for the lock
+            if self.user.is_access_valid():
+                return
             if self.user.is_refresh_valid():
                 logger.debug("Access token has expired. Refreshing.")
-                self.refresh_token()
+                await self.arefresh_token(deadline=deadline)
             else:
                 logger.debug("Both access and refresh tokens have expired, re-logging in.")
-                self.login()
+                await self.alogin(deadline=deadline)
+        finally:
+            self._async_refresh_lock.release()
 
     @abstractmethod
-    def login(self) -> KonanUser:
+    def login(self, deadline: Optional[KonanDeadline] = None) -> KonanUser:
+        ...
+
+    @abstractmethod
+    async def alogin(self, deadline: Optional[KonanDeadline] = None) -> KonanUser:
         ...
 
 
@@ -51,26 +137,259 @@ class KonanAuth(_AbstractKonanAuth):
         self.password = password
         super().__init__(auth_url=auth_url, *args, **kwargs)
 
-    def login(self) -> KonanUser:
-        response = LoginEndpoint(self.auth_url).request(
+    def login(self, deadline: Optional[KonanDeadline] = None) -> KonanUser:
+        response = LoginEndpoint(self.auth_url, **self._endpoint_kwargs(deadline)).request(
             KonanCredentials(self.email, self.password)
         )
 
         logger.info(f"Successfully logged in using {self.email}")
 
-        self.user = KonanUser(response.access, response.refresh)
-        return self.user
+        return self._set_user(KonanUser(response.access, response.refresh))
+
+    async def alogin(self, deadline: Optional[KonanDeadline] = None) -> KonanUser:
+        response = await LoginEndpoint(self.auth_url, **self._endpoint_kwargs(deadline)).arequest(
+            KonanCredentials(self.email, self.password)
+        )
+
+        logger.info(f"Successfully logged in using {self.email}")
+
+        return self._set_user(KonanUser(response.access, response.refresh))
 
 
 class KonanAPIKeyAuth(_AbstractKonanAuth):
-    def __init__(self, auth_url: str, api_key: str, *args, **kwargs) -> None:
+    def __init__(
+        self, auth_url: str, api_key: str, *args,
+        token_store: Optional[KonanBaseTokenStore] = None,
+        **kwargs,
+    ) -> None:
         self.api_key = api_key
+        self.token_store = token_store
         super().__init__(auth_url=auth_url, *args, **kwargs)
 
-    def login(self) -> KonanUser:
-        response = APIKeyLoginEndpoint(self.auth_url).request(request_object=self.api_key)
+        # Never store tokens under the API Key itself
+        self._token_store_key = hashlib.sha256(f"{auth_url}\n{api_key}".encode()).hexdigest()
 
-        logger.info("Successfully logged in using an API Key")
+        self._background_refresh_stop = threading.Event()
+        self._background_refresh_thread: Optional[threading.Thread] = None
+        self._background_refresh_task: Optional[asyncio.Task] = None
+
+    def _background_refresh_delay(self, margin: float) -> float:
+        # Seconds until either token is within margin of its expiry
+        renew_at = min(self.user.access_exp, self.user.refresh_exp) - margin
+        return max(renew_at - time.time(), MIN_BACKGROUND_REFRESH_DELAY)
+
+    def _is_background_login_due(self, margin: float) -> bool:
+        # The refresh token itself can only be renewed by logging in again
+        return self.user.refresh_exp - margin <= time.time()
+
+    def _background_refresh(self, margin: float, retry_interval: float) -> None:
+        delay = self._background_refresh_delay(margin)
+        while not self._background_refresh_stop.wait(delay):
+            try:
+                with self._refresh_lock:
+                    if self._is_background_login_due(margin):
+                        logger.debug("Refresh token is about to expire. Re-logging in in the background.")
+                        self.login()
+                    else:
+                        logger.debug("Access token is about to expire. Refreshing in the background.")
+                        self.refresh_token()
+                delay = self._background_refresh_delay(margin)
+            except Exception as e:
+                logger.warning(f"Background token refresh failed, retrying in {retry_interval}s: {e}")
+                delay = retry_interval
+
+    async def _abackground_refresh(self, margin: float, retry_interval: float) -> None:
+        if self._async_refresh_lock is None:
+            self._async_refresh_lock = asyncio.Lock()
+
+        delay = self._background_refresh_delay(margin)
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                async with self._async_refresh_lock:
+                    if self._is_background_login_due(margin):
+                        logger.debug("Refresh token is about to expire. Re-logging in in the background.")
+                        await self.alogin()
+                    else:
+                        logger.debug("Access token is about to expire. Refreshing in the background.")
+                        await self.arefresh_token()
+                delay = self._background_refresh_delay(margin)
+            except Exception as e:
+                logger.warning(f"Background token refresh failed, retrying in {retry_interval}s: {e}")
+                delay = retry_interval
+
+    def start_background_refresh(
+        self,
+        margin: float = DEFAULT_BACKGROUND_REFRESH_MARGIN,
+        retry_interval: float = DEFAULT_BACKGROUND_REFRESH_RETRY_INTERVAL,
+    ) -> None:
+        """Renew the tokens from a daemon thread ahead of their expiry,
+        so that requests never block on auth while the tokens are being renewed.
+
+        The access token is refreshed margin seconds before it expires,
+        and the session is renewed by logging in again margin seconds before the refresh token expires.
+        Requires a prior call to login(), and a synchronous transport.
 
-        self.user = KonanUser(response.access, response.refresh)
+        :param margin: seconds before a token expires to renew it, defaults to DEFAULT_BACKGROUND_REFRESH_MARGIN.
+            Should be less than the lifetime of the access token
+        :type margin: float, optional
+        :param retry_interval: seconds to wait before retrying a failed renewal,
+            defaults to DEFAULT_BACKGROUND_REFRESH_RETRY_INTERVAL
+        :type retry_interval: float, optional
+        """
+        self._post_login_checks()
+        self.stop_background_refresh()
+
+        self._background_refresh_stop.clear()
+        self._background_refresh_thread = threading.Thread(
+            target=self._background_refresh,
+            args=(margin, retry_interval),
+            name="konan-sdk-token-refresh",
+            daemon=True,
+        )
+        self._background_refresh_thread.start()
+
+    def astart_background_refresh(
+        self,
+        margin: float = DEFAULT_BACKGROUND_REFRESH_MARGIN,
+        retry_interval: float = DEFAULT_BACKGROUND_REFRESH_RETRY_INTERVAL,
+    ) -> None:
+        """Renew the tokens from an asyncio task ahead of their expiry,
+        so that requests never block on auth while the tokens are being renewed.
+
+        Same as start_background_refresh(), but for asynchronous transports.
+        Must be called from within the running event loop.
+
+        :param margin: seconds before a token expires to renew it, defaults to DEFAULT_BACKGROUND_REFRESH_MARGIN.
+            Should be less than the lifetime of the access token
+        :type margin: float, optional
+        :param retry_interval: seconds to wait before retrying a failed renewal,
+            defaults to DEFAULT_BACKGROUND_REFRESH_RETRY_INTERVAL
+        :type retry_interval: float, optional
+        """
+        self._post_login_checks()
+        self.stop_background_refresh()
+
+        self._background_refresh_task = asyncio.get_running_loop().create_task(
+            self._abackground_refresh(margin, retry_interval)
+        )
+
+    def stop_background_refresh(self) -> None:
+        """Stop renewing the tokens in the background, if started
+        """
+        if self._background_refresh_thread is not None:
+            self._background_refresh_stop.set()
+            if self._background_refresh_thread is not threading.current_thread():
+                self._background_refresh_thread.join()
+            self._background_refresh_thread = None
+        if self._background_refresh_task is not None:
+            self._background_refresh_task.cancel()
+            self._background_refresh_task = None
+
+    def _load_stored_user(self) -> Optional[KonanUser]:
+        tokens = self.token_store.load(self._token_store_key)
+        if tokens is None:
+            return None
+        try:
+            return KonanUser(*tokens)
+        except (jwt.PyJWTError, KeyError):
+            logger.warning("Ignoring invalid tokens found in the token store")
+            return None
+
+    def _save_stored_user(self) -> None:
+        self.token_store.save(self._token_store_key, self.user.access_token, self.user.refresh_token)
+
+    def _reuse_stored_user(self, stored_user: Optional[KonanUser]) -> bool:
+        # Another process may have obtained newer tokens while this one was waiting for the store's lock
+        if stored_user is None or not stored_user.is_access_valid():
+            return False
+        if self.user is not None and stored_user.access_exp <= self.user.access_exp:
+            return False
+        self._set_user(stored_user)
+        return True
+
+    def refresh_token(self, deadline: Optional[KonanDeadline] = None) -> None:
+        if self.token_store is None:
+            return super().refresh_token(deadline=deadline)
+
+        self._post_login_checks()
+        with self.token_store.lock(self._token_store_key):
+            if self._reuse_stored_user(self._load_stored_user()):
+                logger.debug("Reusing access token refreshed by another process.")
+                return
+            super().refresh_token(deadline=deadline)
+            self._save_stored_user()
+
+    async def arefresh_token(self, deadline: Optional[KonanDeadline] = None) -> None:
+        if self.token_store is None:
+            return await super().arefresh_token(deadline=deadline)
+
+        self._post_login_checks()
+        async with self.token_store.alock(self._token_store_key):
+            if self._reuse_stored_user(self._load_stored_user()):
+                logger.debug("Reusing access token refreshed by another process.")
+                return
+            await super().arefresh_token(deadline=deadline)
+            self._save_stored_user()
+
+    def login(self, deadline: Optional[KonanDeadline] = None) -> KonanUser:
+        if self.token_store is None:
+            return self._login(deadline=deadline)
+
+        # Saves are atomic, so valid tokens can be reused without waiting for the lock
+        if self._reuse_stored_user(self._load_stored_user()):
+            logger.info("Successfully logged in using stored tokens")
+            return self.user
+
+        with self.token_store.lock(self._token_store_key):
+            stored_user = self._load_stored_user()
+            if self._reuse_stored_user(stored_user):
+                logger.info("Successfully logged in using stored tokens")
+            elif stored_user is not None and stored_user.is_refresh_valid():
+                self._set_user(stored_user)
+                super().refresh_token(deadline=deadline)
+                self._save_stored_user()
+                logger.info("Successfully logged in using a stored refresh token")
+            else:
+                self._login(deadline=deadline)
+                self._save_stored_user()
+        return self.user
+
+    async def alogin(self, deadline: Optional[KonanDeadline] = None) -> KonanUser:
+        if self.token_store is None:
+            return await self._alogin(deadline=deadline)
+
+        # Saves are atomic, so valid tokens can be reused without waiting for the lock
+        if self._reuse_stored_user(self._load_stored_user()):
+            logger.info("Successfully logged in using stored tokens")
+            return self.user
+
+        async with self.token_store.alock(self._token_store_key):
+            stored_user = self._load_stored_user()
+            if self._reuse_stored_user(stored_user):
+                logger.info("Successfully logged in using stored tokens")
+            elif stored_user is not None and stored_user.is_refresh_valid():
+                self._set_user(stored_user)
+                await super().arefresh_token(deadline=deadline)
+                self._save_stored_user()
+                logger.info("Successfully logged in using a stored refresh token")
+            else:
+                await self._alogin(deadline=deadline)
+                self._save_stored_user()
         return self.user
+
+    def _login(self, deadline: Optional[KonanDeadline] = None) -> KonanUser:
+        response = APIKeyLoginEndpoint(self.auth_url, **self._endpoint_kwargs(deadline)).request(request_object=self.api_key)
+
+        logger.info("Successfully logged in using an API Key")
+
+        return self._set_user(KonanUser(response.access, response.refresh))
+
+    async def _alogin(self, deadline: Optional[KonanDeadline] = None) -> KonanUser:
+        response = await APIKeyLoginEndpoint(self.auth_url, **self._endpoint_kwargs(deadline)).arequest(
+            request_object=self.api_key
+        )
+
+        logger.info("Successfully logged in using an API Key")
+
+        return self._set_user(KonanUser(response.access, response.refresh))
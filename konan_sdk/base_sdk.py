@@ -0,0 +1,223 @@
+import sys
+from loguru import logger
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union
+)
+
+from konan_sdk.auth import _AbstractKonanAuth
+from konan_sdk.endpoints.base_endpoint import KonanBaseEndpoint
+from konan_sdk.endpoints.circuit_breakers import KonanCircuitBreaker
+from konan_sdk.endpoints.deadlines import KonanDeadline
+from konan_sdk.endpoints.predictions import GetPaginatedPredictionsEndpoint
+from konan_sdk.endpoints.rate_limiters import KonanRateLimiter
+from konan_sdk.endpoints.retries import KonanRetryPolicy
+from konan_sdk.endpoints.transports import KonanBaseAsyncTransport, KonanBaseTransport, KonanTimeout
+from konan_sdk.konan_types import KonanModel, KonanModelState, KonanPrediction
+from konan_sdk.konan_utils.caches import KonanPredictionCache, hash_prediction_input
+from konan_sdk.konan_utils.concurrency import KonanSingleFlight
+from konan_sdk.konan_utils.models import KonanModelIndex, KonanModelRegistry
+
+EndpointT = TypeVar('EndpointT', bound=KonanBaseEndpoint)
+
+
+class _AbstractKonanSDK:
+    """State and logic shared by KonanSDK and AsyncKonanSDK, i.e. everything but sending requests.
+
+    Both SDKs build their endpoints, validate model switches, and keep their prediction cache and model registry
+    up to date through these methods, then send the requests themselves, synchronously or as coroutines.
+    """
+    def __init__(
+        self, auth_url: str, api_url: str,
+        verbose: bool,
+        transport: Union[KonanBaseTransport, KonanBaseAsyncTransport],
+        retry_policy: Optional[KonanRetryPolicy],
+        circuit_breaker: Optional[KonanCircuitBreaker],
+        rate_limiter: Optional[KonanRateLimiter],
+        prediction_cache: Optional[KonanPredictionCache],
+        single_flight: Optional[KonanSingleFlight],
+        model_registry: Optional[KonanModelRegistry],
+    ) -> None:
+        self.auth_url = auth_url
+        self.api_url = api_url
+        self.transport = transport
+        self.retry_policy = retry_policy if retry_policy is not None else KonanRetryPolicy()
+        self.circuit_breaker = circuit_breaker
+        self.rate_limiter = rate_limiter
+        self.prediction_cache = prediction_cache
+        self.single_flight = single_flight
+        self.model_registry = model_registry
+
+        self.auth: Optional[_AbstractKonanAuth] = None
+
+        if not verbose:
+            logger.remove()
+            logger.add(sys.stderr, level="INFO")
+
+    def _create_endpoint(
+        self,
+        endpoint_class: Type[EndpointT],
+        timeout: Optional[KonanTimeout] = None,
+        deadline: Optional[KonanDeadline] = None,
+        **kwargs: Any,
+    ) -> EndpointT:
+        # Authenticated as the logged in user, through the SDK's shared transport, retry policy and rate limiter
+        return endpoint_class(
+            self.api_url,
+            user=self.auth.user,
+            transport=self.transport,
+            retry_policy=self.retry_policy,
+            rate_limiter=self.rate_limiter,
+            timeout=timeout, deadline=deadline,
+            **kwargs,
+        )
+
+    def _create_predictions_endpoint(
+        self, deployment_uuid: str,
+        page_size: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        as_batches: bool = False,
+        timeout: Optional[KonanTimeout] = None,
+        deadline: Optional[KonanDeadline] = None,
+    ) -> GetPaginatedPredictionsEndpoint:
+        return self._create_endpoint(
+            GetPaginatedPredictionsEndpoint,
+            timeout=timeout, deadline=deadline,
+            auth_object=self.auth,
+            deployment_uuid=deployment_uuid,
+            page_size=page_size, fields=fields, as_batches=as_batches,
+        )
+
+    def _get_registered_model_index(
+        self, deployment_uuid: str, model_uuids: Iterable[Optional[str]] = (),
+    ) -> Optional[KonanModelIndex]:
+        # Served by the model registry, unless it is missing any of model_uuids, e.g. models created elsewhere
+        if self.model_registry is None:
+            return None
+        index = self.model_registry.get(deployment_uuid)
+        if index is not None and all(
+            index.get_model(model_uuid) is not None for model_uuid in model_uuids if model_uuid is not None
+        ):
+            return index
+        return None
+
+    def _on_models_listed(self, deployment_uuid: str, models: List[KonanModel]) -> None:
+        if self.model_registry is not None:
+            self.model_registry.set(deployment_uuid, models)
+
+    def _on_model_created(self, deployment_uuid: str, model: KonanModel, model_state: KonanModelState) -> None:
+        if model_state == KonanModelState.Live:
+            # The deployment's previous live model, if any, was demoted
+            if self.model_registry is not None:
+                self.model_registry.invalidate(deployment_uuid)
+            if self.prediction_cache is not None:
+                self.prediction_cache.invalidate(deployment_uuid)
+        elif self.model_registry is not None:
+            self.model_registry.add_model(deployment_uuid, model)
+
+    def _on_model_deleted(self, model_uuid: str) -> None:
+        if self.model_registry is not None:
+            self.model_registry.remove_model(model_uuid)
+
+    def _on_deployment_deleted(self, deployment_uuid: str) -> None:
+        if self.model_registry is not None:
+            self.model_registry.invalidate(deployment_uuid)
+        if self.prediction_cache is not None:
+            self.prediction_cache.invalidate(deployment_uuid)
+
+    def _get_live_model_switch(
+        self,
+        deployment_uuid: str,
+        model_uuid: str,
+        switch_to: KonanModelState,
+        models: KonanModelIndex,
+        new_live_model_uuid: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        # Validates switching model_uuid to switch_to, and returns the arguments of _switch_live_model()
+        # if the switch changes the deployment's live model, or None if it only changes model_uuid's state
+        model_state = models.get_model_state(model_uuid)
+        assert model_state, (
+            f"Model with uuid {model_uuid} not found",
+            f" within the models of Deployment with uuid {deployment_uuid}",
+        )
+        assert model_state != switch_to, (
+            f"Model with uuid {model_uuid} already at {switch_to} state",
+        )
+        if model_state == KonanModelState.Live:
+            return dict(
+                live_model_uuid=model_uuid,
+                switch_to=switch_to,
+                new_live_model_uuid=new_live_model_uuid,
+            )
+        if switch_to == KonanModelState.Live:
+            return dict(
+                live_model_uuid=models.live_model_uuid,
+                switch_to=KonanModelState.Challenger,
+                new_live_model_uuid=model_uuid,
+            )
+        return None
+
+    def _check_live_model_switch(
+        self,
+        deployment_uuid: str,
+        live_model_uuid: str,
+        models: KonanModelIndex,
+        new_live_model_uuid: Optional[str] = None,
+    ) -> None:
+        assert live_model_uuid, (
+            f"Unable to find live model of deployment with uuid {deployment_uuid}",
+        )
+        assert new_live_model_uuid, (
+            f"Attempting to demote live model with uuid {live_model_uuid}",
+            " and no model to promote specified",
+        )
+        assert live_model_uuid != new_live_model_uuid, (
+            f"Attempting to demote live model with uuid {live_model_uuid}",
+            " and model to promote instead is the same",
+        )
+        # Get the state of the model to be promoted
+        new_live_model_current_state = models.get_model_state(new_live_model_uuid)
+        assert new_live_model_current_state, (
+            f"Attempting to demote live model with uuid {live_model_uuid}",
+            f" and model to promote instead with uuid {new_live_model_uuid}",
+            " not found",
+            f" within the models of deployment with uuid {deployment_uuid}",
+        )
+
+    def _on_model_states_switched(self, deployment_uuid: str, states: Dict[str, KonanModelState]) -> None:
+        if self.model_registry is not None:
+            self.model_registry.set_model_states(deployment_uuid, states)
+        if self.prediction_cache is not None and KonanModelState.Live in states.values():
+            # Predictions of the demoted live model must not be served anymore
+            self.prediction_cache.invalidate(deployment_uuid)
+
+    def _on_model_switch_failed(self, deployment_uuid: str) -> None:
+        if self.model_registry is not None:
+            # The cached models may be stale, e.g. switched by another client
+            self.model_registry.invalidate(deployment_uuid)
+
+    def _get_cached_prediction(
+        self, deployment_uuid: str, live_model_uuid: Optional[str], input_data: Union[Dict, str],
+    ) -> Tuple[str, Optional[Tuple[str, Dict]]]:
+        # Returns the cache key of the prediction, and the cached prediction, if any
+        cache_key = self.prediction_cache.key(deployment_uuid, live_model_uuid, input_data)
+        return cache_key, self.prediction_cache.get(cache_key)
+
+    def _on_prediction(
+        self, deployment_uuid: str, cache_key: Optional[str], prediction: KonanPrediction,
+    ) -> Tuple[str, Dict]:
+        if self.prediction_cache is not None:
+            self.prediction_cache.put(cache_key, deployment_uuid, prediction.uuid, prediction.output)
+        return prediction.uuid, prediction.output
+
+    @staticmethod
+    def _get_single_flight_key(deployment_uuid: str, input_data: Union[Dict, str]) -> str:
+        # Identical predictions by the same deployment share a key, whichever model is live
+        return hash_prediction_input(input_data, deployment_uuid)
@@ -58,6 +58,11 @@ class RefreshTokenEndpoint(KonanBaseEndpoint[str, str]):
     def endpoint_operation(self) -> KonanEndpointOperationEnum:
         return KonanEndpointOperationEnum.POST
 
+    @property
+    def is_idempotent(self) -> bool:
+        # Refreshing again only issues a new access token
+        return True
+
     def prepare_request(self, request_object: str) -> KonanEndpointRequest:
         return KonanEndpointRequest(json={'refresh': request_object})
 
@@ -1,24 +1,53 @@
+import asyncio
+import contextlib
+import time
 from enum import Enum
 from json import JSONDecodeError
 import requests
 from loguru import logger
-from typing import Dict, Generic, Optional, TypeVar
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterator,
+    ContextManager,
+    Dict,
+    Generic,
+    Optional,
+    TypeVar,
+    Union,
+)
 from abc import abstractmethod
 
 from konan_sdk.konan_user import KonanUser
 from konan_sdk.endpoints.interfaces import (
     KonanEndpointRequest, KonanEndpointResponse
 )
+from konan_sdk.endpoints.circuit_breakers import KonanCircuitBreaker
+from konan_sdk.endpoints.deadlines import KonanDeadline
+from konan_sdk.endpoints.rate_limiters import KonanRateLimiter
+from konan_sdk.endpoints.retries import KonanRetryPolicy
+from konan_sdk.endpoints.transports import (
+    KonanBaseAsyncTransport,
+    KonanBaseTransport,
+    KonanSessionTransport,
+    KonanTimeout,
+)
+from konan_sdk.konan_exceptions import KonanDeadlineExceededError
 from konan_sdk.konan_types import KonanTokens
 
 ReqT = TypeVar('ReqT')
 ResT = TypeVar('ResT')
 
 
+@contextlib.asynccontextmanager
+async def _anullcontext() -> AsyncIterator[None]:
+    yield
+
+
 class KonanEndpointOperationEnum(Enum):
-    GET = requests.get
-    POST = requests.post
-    DELETE = requests.delete
+    GET = 'GET'
+    POST = 'POST'
+    DELETE = 'DELETE'
 
 
 class KonanBaseEndpoint(Generic[ReqT, ResT]):
@@ -30,13 +59,44 @@ class KonanBaseEndpoint(Generic[ReqT, ResT]):
     :type ResT: type
     """
 
-    def __init__(self, api_url: str, **kwargs) -> None:
+    def __init__(
+        self, api_url: str,
+        transport: Optional[Union[KonanBaseTransport, KonanBaseAsyncTransport]] = None,
+        retry_policy: Optional[KonanRetryPolicy] = None,
+        circuit_breaker: Optional[KonanCircuitBreaker] = None,
+        rate_limiter: Optional[KonanRateLimiter] = None,
+        timeout: Optional[KonanTimeout] = None,
+        deadline: Optional[KonanDeadline] = None,
+        **kwargs
+    ) -> None:
         """Initializes a Konan base endpoint
 
         :param api_url: base URL of Konan API
         :type api_url: str
+        :param transport: transport to send requests with, defaults to None.
+            Must be a KonanBaseAsyncTransport to use .arequest().
+            If left as None, a new non-shared KonanSessionTransport is used
+        :type transport: Optional[Union[KonanBaseTransport, KonanBaseAsyncTransport]], optional
+        :param retry_policy: policy to retry failed requests with, defaults to None (never retry).
+            Its override for the endpoint's name is used, if any
+        :type retry_policy: Optional[KonanRetryPolicy], optional
+        :param circuit_breaker: circuit breaker to fail requests fast with while the endpoint's circuit is open,
+            defaults to None. Only used by endpoints with a circuit_key
+        :type circuit_breaker: Optional[KonanCircuitBreaker], optional
+        :param rate_limiter: limiter to wait for before sending every request, defaults to None (never wait)
+        :type rate_limiter: Optional[KonanRateLimiter], optional
+        :param timeout: timeout of every attempt, defaults to None (the transport's default timeout)
+        :type timeout: Optional[KonanTimeout], optional
+        :param deadline: deadline by which requests, including their retries, must complete, defaults to None
+        :type deadline: Optional[KonanDeadline], optional
         """
         self.api_url = api_url
+        self.transport = transport or KonanSessionTransport()
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.rate_limiter = rate_limiter
+        self.timeout = timeout
+        self.deadline = deadline
 
     @property
     @abstractmethod
@@ -68,6 +128,24 @@ class KonanBaseEndpoint(Generic[ReqT, ResT]):
         """
         return None
 
+    @property
+    def circuit_key(self) -> Optional[str]:
+        """Returns the key of the circuit breaker circuit tracking the endpoint's requests
+
+        :return: circuit key, or None to not use a circuit breaker
+        :rtype: Optional[str]
+        """
+        return None
+
+    @property
+    def is_idempotent(self) -> bool:
+        """Returns whether requests can be repeated without repeating their side effects, e.g. when retried
+
+        :return: whether requests are idempotent
+        :rtype: bool
+        """
+        return self.endpoint_operation in (KonanEndpointOperationEnum.GET, KonanEndpointOperationEnum.DELETE)
+
     @property
     def request_url(self) -> str:
         """Returns the full API URL
@@ -110,13 +188,196 @@ class KonanBaseEndpoint(Generic[ReqT, ResT]):
         """
         endpoint_request = self.prepare_request(request_object)
 
-        logger.debug(f"Sending {self.name} request")
-        response: requests.Response = self.endpoint_operation(
-            self.request_url, headers=self.headers,
-            json=endpoint_request.json, params=endpoint_request.params
-        )
+        attempt = 1
+        while True:
+            circuit_generation = self._before_attempt()
+            logger.debug(f"Sending {self.name} request")
+            try:
+                with self._rate_limit():
+                    response: requests.Response = self.transport.request(
+                        self.endpoint_operation.value, self.request_url, headers=self.headers,
+                        json=endpoint_request.json, params=endpoint_request.params,
+                        timeout=self._attempt_timeout(),
+                    )
+            except Exception as e:
+                self._after_attempt(circuit_generation, error=e)
+                if self.deadline is not None and self.deadline.is_expired:
+                    raise KonanDeadlineExceededError(self.deadline.seconds) from e
+                retry_delay = self._retry_delay(attempt, error=e)
+                if retry_delay is None:
+                    raise
+            except BaseException:
+                # e.g. cancelled, which says nothing about the health of the endpoint
+                self._release_attempt(circuit_generation)
+                raise
+            else:
+                self._after_attempt(circuit_generation, response=response)
+                retry_delay = self._retry_delay(attempt, response=response)
+                if retry_delay is None:
+                    break
+            time.sleep(retry_delay)
+            attempt += 1
         logger.debug(f"Received response from {self.name}, parsing output")
 
+        return self._handle_response(response)
+
+    async def arequest(self, request_object: ReqT) -> ResT:
+        """Asyncio counterpart of .request(), sending the request using the endpoint's KonanBaseAsyncTransport
+
+        :param request_object: endpoint request
+        :type request_object: ReqT
+        :return: endpoint response
+        :rtype: ResT
+        """
+        endpoint_request = self.prepare_request(request_object)
+
+        attempt = 1
+        while True:
+            circuit_generation = self._before_attempt()
+            logger.debug(f"Sending {self.name} request")
+            try:
+                async with self._arate_limit():
+                    response = await self.transport.request(
+                        self.endpoint_operation.value, self.request_url, headers=self.headers,
+                        json=endpoint_request.json, params=endpoint_request.params,
+                        timeout=self._attempt_timeout(),
+                    )
+            except Exception as e:
+                self._after_attempt(circuit_generation, error=e)
+                if self.deadline is not None and self.deadline.is_expired:
+                    raise KonanDeadlineExceededError(self.deadline.seconds) from e
+                retry_delay = self._retry_delay(attempt, error=e)
+                if retry_delay is None:
+                    raise
+            except BaseException:
+                # e.g. cancelled, which says nothing about the health of the endpoint
+                self._release_attempt(circuit_generation)
+                raise
+            else:
+                self._after_attempt(circuit_generation, response=response)
+                retry_delay = self._retry_delay(attempt, response=response)
+                if retry_delay is None:
+                    break
+            await asyncio.sleep(retry_delay)
+            attempt += 1
+        logger.debug(f"Received response from {self.name}, parsing output")
+
+        return self._handle_response(response)
+
+    def _rate_limit(self) -> ContextManager:
+        """Wait for the endpoint's rate limiter, if any, before sending a request
+
+        :return: context to send the request within
+        :rtype: ContextManager
+        """
+        if self.rate_limiter is None:
+            return contextlib.nullcontext()
+        return self.rate_limiter.limit(self.name)
+
+    def _arate_limit(self) -> AsyncContextManager:
+        """Asyncio counterpart of ._rate_limit()
+
+        :return: context to send the request within
+        :rtype: AsyncContextManager
+        """
+        if self.rate_limiter is None:
+            return _anullcontext()
+        return self.rate_limiter.alimit(self.name)
+
+    def _attempt_timeout(self) -> Optional[KonanTimeout]:
+        """Returns the timeout of the next attempt, shortened to expire no later than the endpoint's deadline
+
+        :return: timeout, or None to use the transport's default
+        :rtype: Optional[KonanTimeout]
+        """
+        if self.deadline is None:
+            return self.timeout
+        return self.deadline.clip_timeout(self.timeout if self.timeout is not None else self.transport.timeout)
+
+    def _before_attempt(self) -> Optional[int]:
+        """Fail fast if the endpoint's deadline has passed or its circuit is open
+
+        :raises KonanDeadlineExceededError: if the endpoint's deadline has passed
+        :raises KonanCircuitOpenError: if the endpoint's circuit is open
+        :return: generation of the endpoint's circuit the attempt is sent in, or None if it has no circuit
+        :rtype: Optional[int]
+        """
+        if self.deadline is not None:
+            self.deadline.check()
+        if self.circuit_breaker is not None and self.circuit_key is not None:
+            return self.circuit_breaker.before_call(self.circuit_key)
+        return None
+
+    def _after_attempt(
+        self, circuit_generation: Optional[int],
+        response: Optional[Any] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Record the outcome of an attempt on the endpoint's circuit
+
+        :param circuit_generation: generation of the circuit the attempt was sent in, as returned by _before_attempt()
+        :type circuit_generation: Optional[int]
+        :param response: response of the attempt, defaults to None
+        :type response: Optional[Any], optional
+        :param error: error raised by the attempt, defaults to None
+        :type error: Optional[BaseException], optional
+        """
+        if circuit_generation is not None:
+            self.circuit_breaker.record(
+                self.circuit_key, circuit_generation,
+                success=not self.circuit_breaker.is_failure(response=response, error=error),
+            )
+
+    def _release_attempt(self, circuit_generation: Optional[int]) -> None:
+        """Release an attempt that ended without an outcome from the endpoint's circuit
+
+        :param circuit_generation: generation of the circuit the attempt was sent in, as returned by _before_attempt()
+        :type circuit_generation: Optional[int]
+        """
+        if circuit_generation is not None:
+            self.circuit_breaker.release(self.circuit_key, circuit_generation)
+
+    def _retry_delay(
+        self, attempt: int,
+        response: Optional[Any] = None,
+        error: Optional[BaseException] = None,
+    ) -> Optional[float]:
+        """Decide whether to retry a request after its attempt-th attempt, using the endpoint's retry policy
+
+        :param attempt: number of attempts made so far
+        :type attempt: int
+        :param response: response of the last attempt, defaults to None
+        :type response: Optional[Any], optional
+        :param error: error raised by the last attempt, defaults to None
+        :type error: Optional[BaseException], optional
+        :return: seconds to wait before retrying, or None to not retry
+        :rtype: Optional[float]
+        """
+        if self.retry_policy is None:
+            return None
+
+        retry_policy = self.retry_policy.for_endpoint(self.name)
+        if not retry_policy.should_retry(attempt, self.is_idempotent, response=response, error=error):
+            return None
+
+        retry_delay = retry_policy.delay(attempt, response=response)
+        if self.deadline is not None and retry_delay >= self.deadline.remaining():
+            logger.warning(f"Not retrying {self.name} request, since its deadline would pass first")
+            return None
+        logger.warning(
+            f"Attempt {attempt} of {self.name} request failed with "
+            f"{response.status_code if response is not None else repr(error)}, retrying in {retry_delay:.2f}s"
+        )
+        return retry_delay
+
+    def _handle_response(self, response: Any) -> ResT:
+        """Raise for unsuccessful responses, then parse successful ones using process_response()
+
+        :param response: HTTP response received by the endpoint
+        :type response: Any
+        :return: endpoint response
+        :rtype: ResT
+        """
         response.raise_for_status()
 
         try:
@@ -140,6 +401,11 @@ class KonanBaseLoginEndpoint(KonanBaseEndpoint[ReqT, KonanTokens]):
     def endpoint_operation(self) -> KonanEndpointOperationEnum:
         return KonanEndpointOperationEnum.POST
 
+    @property
+    def is_idempotent(self) -> bool:
+        # Logging in again only issues new tokens
+        return True
+
     def process_response(
         self, endpoint_response: KonanEndpointResponse
     ) -> KonanTokens:
@@ -248,6 +514,10 @@ class KonanBaseDeploymentEndpoint(
         """
         return super().endpoint_path + f"/{self.deployment_uuid}"
 
+    @property
+    def circuit_key(self) -> Optional[str]:
+        return self.deployment_uuid
+
 
 class KonanBaseDeploymentGenericModelsEndpoint(
     KonanBaseDeploymentEndpoint[ReqT, ResT]
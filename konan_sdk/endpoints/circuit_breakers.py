@@ -0,0 +1,233 @@
+import datetime
+import threading
+import time
+from collections import deque
+from loguru import logger
+from typing import Any, Deque, Dict, FrozenSet, Iterable, List, Optional
+
+from konan_sdk.endpoints.retries import _is_connection_error
+from konan_sdk.konan_exceptions import KonanCircuitOpenError
+from konan_sdk.konan_types import KonanCircuitState, KonanCircuitStatus
+
+DEFAULT_FAILURE_STATUSES = frozenset({500, 502, 503, 504})  #: Default HTTP statuses counted as failures
+
+
+class _KonanCircuit():
+    """State of a single circuit of a KonanCircuitBreaker.
+    """
+    def __init__(self, window_size: int) -> None:
+        self.state = KonanCircuitState.Closed
+        self.outcomes: Deque[bool] = deque(maxlen=window_size)
+        self.opened_at: Optional[datetime.datetime] = None
+        self.retry_at_monotonic = 0.0
+        self.trial_calls_count = 0
+        self.trial_successes_count = 0
+        # Incremented on every state change, so that requests are only counted in the state they were sent in
+        self.generation = 0
+
+    @property
+    def failure_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+
+class KonanCircuitBreaker():
+    """Circuit breaker failing requests fast, per key (e.g. deployment uuid), while their target is unhealthy.
+
+    Each key's circuit starts closed, tracking the outcomes of its most recent requests.
+    Once their failure rate reaches failure_rate_threshold, the circuit opens, and requests fail fast
+    with a KonanCircuitOpenError without being sent.
+    After cooldown seconds, the circuit becomes half-open, letting through up to half_open_max_calls trial requests:
+    if they all succeed, the circuit closes again, but if any fails, it opens for another cooldown.
+
+    Connection errors, timeouts and responses with one of failure_statuses count as failures.
+    """
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        minimum_calls: int = 10,
+        window_size: int = 50,
+        cooldown: float = 30.0,
+        half_open_max_calls: int = 1,
+        failure_statuses: Iterable[int] = DEFAULT_FAILURE_STATUSES,
+    ) -> None:
+        """Initialize a new KonanCircuitBreaker
+
+        :param failure_rate_threshold: rate of failed requests at which to open a circuit, defaults to 0.5
+        :type failure_rate_threshold: float, optional
+        :param minimum_calls: minimum number of requests tracked before a circuit may open, defaults to 10
+        :type minimum_calls: int, optional
+        :param window_size: number of most recent requests to track per circuit, defaults to 50
+        :type window_size: int, optional
+        :param cooldown: seconds a circuit stays open before trying requests again, defaults to 30.0
+        :type cooldown: float, optional
+        :param half_open_max_calls: number of trial requests to let through a half-open circuit, defaults to 1
+        :type half_open_max_calls: int, optional
+        :param failure_statuses: HTTP statuses counted as failures, defaults to DEFAULT_FAILURE_STATUSES
+        :type failure_statuses: Iterable[int], optional
+        """
+        if not 0 < failure_rate_threshold <= 1:
+            raise ValueError("failure_rate_threshold must be in (0, 1]")
+        if not 0 < minimum_calls <= window_size:
+            raise ValueError("minimum_calls must be a positive integer, no larger than window_size")
+        if half_open_max_calls < 1:
+            raise ValueError("half_open_max_calls must be a positive integer")
+
+        self.failure_rate_threshold = failure_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.window_size = window_size
+        self.cooldown = cooldown
+        self.half_open_max_calls = half_open_max_calls
+        self.failure_statuses: FrozenSet[int] = frozenset(failure_statuses)
+
+        self._circuits: Dict[str, _KonanCircuit] = dict()
+        self._lock = threading.Lock()
+
+    def _circuit(self, key: str) -> _KonanCircuit:
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            circuit = self._circuits[key] = _KonanCircuit(self.window_size)
+        return circuit
+
+    def _open(self, key: str, circuit: _KonanCircuit) -> None:
+        logger.warning(f"Opening circuit of {key} for {self.cooldown}s, at a failure rate of {circuit.failure_rate:.0%}")
+        circuit.state = KonanCircuitState.Open
+        circuit.generation += 1
+        circuit.opened_at = datetime.datetime.now()
+        circuit.retry_at_monotonic = time.monotonic() + self.cooldown
+
+    def _close(self, key: str, circuit: _KonanCircuit) -> None:
+        logger.info(f"Closing circuit of {key}")
+        circuit.state = KonanCircuitState.Closed
+        circuit.generation += 1
+        circuit.outcomes.clear()
+
+    def is_failure(self, response: Optional[Any] = None, error: Optional[BaseException] = None) -> bool:
+        """Return whether the outcome of a request counts as a failure
+
+        :param response: response of the request, defaults to None
+        :type response: Optional[Any], optional
+        :param error: error raised by the request, if it did not receive a response, defaults to None
+        :type error: Optional[BaseException], optional
+        :return: whether the outcome counts as a failure
+        :rtype: bool
+        """
+        if response is not None:
+            return response.status_code in self.failure_statuses
+        return error is not None and _is_connection_error(error)
+
+    def before_call(self, key: str) -> int:
+        """Check that a request may be sent on the circuit of key
+
+        :param key: key of the circuit
+        :type key: str
+        :raises KonanCircuitOpenError: if the circuit is open, or half-open with all its trial requests in flight
+        :return: generation of the circuit the request is sent in, to pass to record()
+        :rtype: int
+        """
+        with self._lock:
+            circuit = self._circuit(key)
+            if circuit.state == KonanCircuitState.Open:
+                retry_in = circuit.retry_at_monotonic - time.monotonic()
+                if retry_in > 0:
+                    raise KonanCircuitOpenError(key, datetime.datetime.now() + datetime.timedelta(seconds=retry_in))
+                circuit.state = KonanCircuitState.HalfOpen
+                circuit.generation += 1
+                circuit.trial_calls_count = 0
+                circuit.trial_successes_count = 0
+
+            if circuit.state == KonanCircuitState.HalfOpen:
+                if circuit.trial_calls_count >= self.half_open_max_calls:
+                    raise KonanCircuitOpenError(key)
+                circuit.trial_calls_count += 1
+            return circuit.generation
+
+    def record(self, key: str, generation: int, success: bool) -> None:
+        """Record the outcome of a request sent on the circuit of key, after before_call() allowed it.
+        Every request allowed by before_call() must be either recorded or released.
+
+        Outcomes of requests sent before the circuit last changed state are ignored,
+        e.g. ones sent while closed that finish once it is half-open, which are not trial requests.
+
+        :param key: key of the circuit
+        :type key: str
+        :param generation: generation of the circuit the request was sent in, as returned by before_call()
+        :type generation: int
+        :param success: whether the request succeeded
+        :type success: bool
+        """
+        with self._lock:
+            circuit = self._circuit(key)
+            if generation != circuit.generation:
+                return
+            if circuit.state == KonanCircuitState.HalfOpen:
+                if not success:
+                    self._open(key, circuit)
+                    return
+                circuit.trial_successes_count += 1
+                if circuit.trial_successes_count >= self.half_open_max_calls:
+                    self._close(key, circuit)
+                return
+
+            circuit.outcomes.append(success)
+            if len(circuit.outcomes) >= self.minimum_calls and circuit.failure_rate >= self.failure_rate_threshold:
+                self._open(key, circuit)
+
+    def release(self, key: str, generation: int) -> None:
+        """Release a request sent on the circuit of key that ended without an outcome, e.g. because it was cancelled
+
+        A trial request of a half-open circuit frees its slot for another trial request.
+
+        :param key: key of the circuit
+        :type key: str
+        :param generation: generation of the circuit the request was sent in, as returned by before_call()
+        :type generation: int
+        """
+        with self._lock:
+            circuit = self._circuit(key)
+            if generation == circuit.generation and circuit.state == KonanCircuitState.HalfOpen:
+                circuit.trial_calls_count -= 1
+
+    def get_status(self, key: str) -> KonanCircuitStatus:
+        """Return a snapshot of the circuit of key
+
+        :param key: key of the circuit
+        :type key: str
+        :return: status of the circuit
+        :rtype: KonanCircuitStatus
+        """
+        with self._lock:
+            circuit = self._circuit(key)
+            state = circuit.state
+            if state == KonanCircuitState.Open and circuit.retry_at_monotonic <= time.monotonic():
+                # The next request will be a trial one
+                state = KonanCircuitState.HalfOpen
+            return KonanCircuitStatus(
+                key, state,
+                failure_rate=circuit.failure_rate,
+                calls_count=len(circuit.outcomes),
+                opened_at=circuit.opened_at,
+            )
+
+    def get_statuses(self) -> List[KonanCircuitStatus]:
+        """Return snapshots of all circuits that received requests
+
+        :return: status of every circuit
+        :rtype: List[KonanCircuitStatus]
+        """
+        with self._lock:
+            keys = list(self._circuits)
+        return [self.get_status(key) for key in keys]
+
+    def reset(self, key: Optional[str] = None) -> None:
+        """Close the circuit of key, forgetting the outcomes of its past requests
+
+        :param key: key of the circuit, defaults to None (all circuits)
+        :type key: Optional[str], optional
+        """
+        with self._lock:
+            if key is None:
+                self._circuits.clear()
+            else:
+                self._circuits.pop(key, None)
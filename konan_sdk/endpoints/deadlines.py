@@ -0,0 +1,84 @@
+import time
+from typing import Optional, Union
+
+from konan_sdk.endpoints.transports import KonanTimeout
+from konan_sdk.konan_exceptions import KonanDeadlineExceededError
+
+
+class KonanDeadline():
+    """Point in time by which an operation, made of any number of requests, must complete.
+
+    Shared by all requests of the operation, including retries and token refresh,
+    whose timeouts are shortened to never outlive it.
+    """
+    def __init__(self, seconds: float) -> None:
+        """Initialize a new KonanDeadline, starting now
+
+        :param seconds: seconds the operation may take
+        :type seconds: float
+        """
+        if seconds <= 0:
+            raise ValueError("seconds must be a positive number")
+
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    @classmethod
+    def create(cls, deadline: Optional[Union[float, "KonanDeadline"]]) -> Optional["KonanDeadline"]:
+        """Create a KonanDeadline from a number of seconds, or pass an existing one through
+
+        :param deadline: seconds the operation may take, or an existing deadline to share
+        :type deadline: Optional[Union[float, KonanDeadline]]
+        :return: deadline, or None if deadline is None
+        :rtype: Optional[KonanDeadline]
+        """
+        if deadline is None or isinstance(deadline, KonanDeadline):
+            return deadline
+        return cls(deadline)
+
+    def remaining(self) -> float:
+        """Return the number of seconds left before the deadline
+
+        :return: seconds left, or 0 once expired
+        :rtype: float
+        """
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    @property
+    def is_expired(self) -> bool:
+        """Returns whether the deadline has passed
+
+        :return: whether the deadline has passed
+        :rtype: bool
+        """
+        return self.remaining() <= 0
+
+    def check(self) -> None:
+        """Raise if the deadline has passed
+
+        :raises KonanDeadlineExceededError: if the deadline has passed
+        """
+        if self.is_expired:
+            raise KonanDeadlineExceededError(self.seconds)
+
+    def clip_timeout(self, timeout: Optional[KonanTimeout]) -> KonanTimeout:
+        """Shorten timeout to expire no later than the deadline
+
+        :param timeout: timeout to shorten, or None for no timeout
+        :type timeout: Optional[KonanTimeout]
+        :return: shortened timeout
+        :rtype: KonanTimeout
+        """
+        remaining = self.remaining()
+        if timeout is None:
+            return remaining
+        if isinstance(timeout, tuple):
+            connect_timeout, read_timeout = timeout
+            return (
+                min(connect_timeout, remaining) if connect_timeout is not None else remaining,
+                min(read_timeout, remaining) if read_timeout is not None else remaining,
+            )
+        return min(timeout, remaining)
+
+
+KonanDeadlineLike = Union[float, KonanDeadline]  #: Either seconds an operation may take, or a shared KonanDeadline
@@ -1,9 +1,10 @@
 
-from typing import Generator, Generic, List, Optional, TypeVar
+from typing import AsyncGenerator, Generator, Generic, List, Optional, Tuple, TypeVar
 
 from konan_sdk.auth import _AbstractKonanAuth
 from konan_sdk.endpoints.base_endpoint import KonanEndpointOperationEnum
 from konan_sdk.endpoints.interfaces import KonanEndpointRequest, KonanEndpointResponse
+from konan_sdk.konan_utils.concurrency import prefetch_generator
 
 ReqT = TypeVar('ReqT')
 ResT = TypeVar('ResT')
@@ -45,12 +46,61 @@ class KonanPaginatedEndpointMixin(Generic[ReqT, ResT]):
             endpoint_request.params = None
         return endpoint_request
 
-    def get_pages(self, request_object: ReqT) -> Generator[List[ResT], None, None]:
-        # TODO: refactor prepare_request to allow to dynamically set page_size
+    def get_pages(self, request_object: ReqT, prefetch: int = 0) -> Generator[List[ResT], None, None]:
+        """Iterate over all pages of the endpoint
+
+        :param request_object: endpoint request
+        :type request_object: ReqT
+        :param prefetch: number of pages to fetch in the background while the caller processes the current one,
+            defaults to 0 (fetch a page only when it is requested)
+        :type prefetch: int, optional
+        :return: generator of pages
+        :rtype: Generator[List[ResT], None, None]
+        """
+        for page, _ in self.get_pages_with_cursors(request_object=request_object, prefetch=prefetch):
+            yield page
+
+    def get_pages_with_cursors(
+        self, request_object: ReqT,
+        prefetch: int = 0,
+        next_url: Optional[str] = None,
+    ) -> Generator[Tuple[List[ResT], Optional[str]], None, None]:
+        """Iterate over all pages of the endpoint, alongside the cursor to resume iterating after each of them
+
+        :param request_object: endpoint request
+        :type request_object: ReqT
+        :param prefetch: number of pages to fetch in the background while the caller processes the current one,
+            defaults to 0 (fetch a page only when it is requested)
+        :type prefetch: int, optional
+        :param next_url: cursor returned alongside a page by a previous iteration, defaults to None.
+            If passed, iteration resumes with the page following that one
+        :type next_url: Optional[str], optional
+        :return: generator of (page, URL of the next page or None if it is the last page)
+        :rtype: Generator[Tuple[List[ResT], Optional[str]], None, None]
+        """
+        pages = self._iter_pages(request_object=request_object, next_url=next_url)
+        if prefetch > 0:
+            return prefetch_generator(pages, prefetch=prefetch)
+        return pages
+
+    def _iter_pages(
+        self, request_object: ReqT,
+        next_url: Optional[str] = None,
+    ) -> Generator[Tuple[List[ResT], Optional[str]], None, None]:
+        self._next_url = next_url
         first_page: List[ResT] = self.request(request_object=request_object)
-        yield first_page
+        yield first_page, self._next_url
         while self._next_url is not None:
             if self._auth_object is not None:
-                self._auth_object.auto_refresh_token()
+                self._auth_object.auto_refresh_token(deadline=self.deadline)
             next_page: List[ResT] = self.request(request_object=request_object)
+            yield next_page, self._next_url
+
+    async def aget_pages(self, request_object: ReqT) -> AsyncGenerator[List[ResT], None]:
+        first_page: List[ResT] = await self.arequest(request_object=request_object)
+        yield first_page
+        while self._next_url is not None:
+            if self._auth_object is not None:
+                await self._auth_object.aauto_refresh_token(deadline=self.deadline)
+            next_page: List[ResT] = await self.arequest(request_object=request_object)
             yield next_page
@@ -1,4 +1,4 @@
-from typing import Any, Dict, Generator, List, Union
+from typing import Any, Dict, Generator, List, Optional, Union
 
 from konan_sdk.endpoints.base_endpoint import (
     KonanBaseDeploymentPredictionsEndpoint,
@@ -12,10 +12,18 @@ from konan_sdk.endpoints.interfaces import (
 from konan_sdk.endpoints.mixins import KonanPaginatedEndpointMixin
 from konan_sdk.konan_types import (
     KonanPrediction,
+    KonanPredictionBatch,
     KonanFeedbackSubmission, KonanFeedbackStatus, KonanFeedbacksResult,
     KonanTimeWindow,
 )
 
+KONAN_PREDICTION_FIELDS: Dict[str, str] = {  #: Maps KonanPrediction attributes to the API's prediction fields
+    'uuid': 'uuid',
+    'output': 'mls_output_json',
+    'features': 'features_json',
+    'feedback': 'feedback',
+}
+
 
 class PredictionEndpoint(
     KonanBaseDeploymentEndpoint[Union[Dict, str], KonanPrediction]
@@ -100,6 +108,36 @@ class GetPredictionsEndpoint(
         Generator[List[KonanPrediction], None, None],
     ]
 ):
+    def __init__(
+        self, api_url: str,
+        page_size: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        as_batches: bool = False,
+        **kwargs
+    ) -> None:
+        """Initializes a Konan endpoint that lists a deployment's predictions
+
+        :param api_url: base URL of Konan API
+        :type api_url: str
+        :param page_size: number of predictions per page, defaults to None (the API's default)
+        :type page_size: Optional[int], optional
+        :param fields: KonanPrediction attributes to retrieve, defaults to None (all of them).
+            Must be keys of KONAN_PREDICTION_FIELDS
+        :type fields: Optional[List[str]], optional
+        :param as_batches: whether to return each page as a columnar KonanPredictionBatch
+            instead of a list of KonanPredictions, defaults to False
+        :type as_batches: bool, optional
+        :raises ValueError: raises ValueError with unknown fields
+        """
+        super().__init__(api_url, **kwargs)
+        if fields is not None:
+            unknown_fields = set(fields) - set(KONAN_PREDICTION_FIELDS)
+            if unknown_fields:
+                raise ValueError(f"Unknown prediction fields {sorted(unknown_fields)}")
+        self.page_size = page_size
+        self.fields = fields
+        self.as_batches = as_batches
+
     @property
     def name(self) -> str:
         return 'get-predictions'
@@ -111,10 +149,15 @@ class GetPredictionsEndpoint(
     def prepare_request(
         self, request_object: KonanTimeWindow,
     ) -> KonanEndpointRequest:
-        return KonanEndpointRequest(params={
+        params = {
             'start_time': request_object.start_time.isoformat(),
             'end_time': request_object.end_time.isoformat(),
-        })
+        }
+        if self.page_size is not None:
+            params['page_size'] = self.page_size
+        if self.fields is not None:
+            params['fields'] = ','.join(KONAN_PREDICTION_FIELDS[field] for field in self.fields)
+        return KonanEndpointRequest(params=params)
 
 
 class GetPaginatedPredictionsEndpoint(
@@ -123,12 +166,32 @@ class GetPaginatedPredictionsEndpoint(
 ):
     def _process_page(
         self, results: List[Dict[str, Any]]
-    ) -> List[KonanPrediction]:
+    ) -> Union[List[KonanPrediction], KonanPredictionBatch]:
+        # Leave out fields that were not asked for, even if the API returns them
+        fields = KONAN_PREDICTION_FIELDS if self.fields is None else {
+            field: KONAN_PREDICTION_FIELDS[field] for field in self.fields
+        }
+        predictions = [prediction for prediction in results["outputs"] if isinstance(prediction, dict)]
+
+        if self.as_batches:
+            return KonanPredictionBatch(
+                uuids=[prediction.get(fields['uuid']) for prediction in predictions] if 'uuid' in fields else None,
+                outputs=[
+                    prediction.get(fields['output']) for prediction in predictions
+                ] if 'output' in fields else None,
+                features=[
+                    prediction.get(fields['features']) for prediction in predictions
+                ] if 'features' in fields else None,
+                feedbacks=[
+                    prediction.get(fields['feedback']) for prediction in predictions
+                ] if 'feedback' in fields else None,
+            )
+
         return [
             KonanPrediction(
-                uuid=prediction.get('uuid'),
-                output=prediction.get('mls_output_json'),
-                features=prediction.get('features_json'),
-                feedback=prediction.get('feedback'),
-            ) for prediction in results["outputs"] if isinstance(prediction, dict)
+                uuid=prediction.get(fields['uuid']) if 'uuid' in fields else None,
+                output=prediction.get(fields['output']) if 'output' in fields else None,
+                features=prediction.get(fields['features']) if 'features' in fields else None,
+                feedback=prediction.get(fields['feedback']) if 'feedback' in fields else None,
+            ) for prediction in predictions
         ]
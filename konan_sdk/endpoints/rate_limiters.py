@@ -0,0 +1,106 @@
+import asyncio
+import threading
+import time
+from contextlib import AsyncExitStack, ExitStack, asynccontextmanager, contextmanager
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+
+
+class KonanRateLimiter():
+    """Client-side limiter smoothing bursts of requests, instead of having the server reject them with 429s.
+
+    Limits both the rate of requests, using a token bucket, and the number of requests in flight at any time.
+    Limits for specific endpoints can be added through endpoint_limiters, and apply on top of this limiter's own.
+    """
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        endpoint_limiters: Optional[Dict[str, "KonanRateLimiter"]] = None,
+    ) -> None:
+        """Initialize a new KonanRateLimiter
+
+        :param rate: maximum sustained number of requests per second, defaults to None (unlimited)
+        :type rate: Optional[float], optional
+        :param burst: maximum number of requests sent at once after a quiet period, defaults to None.
+            If left as None, defaults to one second's worth of requests
+        :type burst: Optional[int], optional
+        :param max_in_flight: maximum number of requests in flight, defaults to None (unlimited).
+            Blocking and asyncio callers are counted separately
+        :type max_in_flight: Optional[int], optional
+        :param endpoint_limiters: limiters to additionally apply to some endpoints, keyed by endpoint name
+            (e.g. 'predict', 'feedback' or 'get-predictions'), defaults to None
+        :type endpoint_limiters: Optional[Dict[str, KonanRateLimiter]], optional
+        """
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be a positive number")
+        if max_in_flight is not None and max_in_flight < 1:
+            raise ValueError("max_in_flight must be a positive integer")
+
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate or 1))
+        self.max_in_flight = max_in_flight
+        self.endpoint_limiters = endpoint_limiters or dict()
+
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._semaphore = threading.Semaphore(max_in_flight) if max_in_flight is not None else None
+        self._async_semaphore: Optional[asyncio.Semaphore] = None
+
+    def _reserve(self) -> float:
+        # Take a token, possibly borrowing it from the future, and return how long until it is available
+        if self.rate is None:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens -= 1
+            return max(-self._tokens / self.rate, 0.0)
+
+    def _limiters(self, endpoint_name: Optional[str]) -> List["KonanRateLimiter"]:
+        # The endpoint's limiter comes first, so that requests waiting on it hold none of this limiter's slots
+        endpoint_limiter = self.endpoint_limiters.get(endpoint_name)
+        return [self] if endpoint_limiter is None else [endpoint_limiter, self]
+
+    def _get_async_semaphore(self) -> Optional[asyncio.Semaphore]:
+        if self.max_in_flight is None:
+            return None
+        # Created lazily so that it binds to the running event loop
+        if self._async_semaphore is None:
+            self._async_semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self._async_semaphore
+
+    @contextmanager
+    def limit(self, endpoint_name: Optional[str] = None) -> Iterator[None]:
+        """Block until a request to the endpoint named endpoint_name may be sent,
+        and count it as in flight until exiting the context
+
+        :param endpoint_name: name of the endpoint, defaults to None
+        :type endpoint_name: Optional[str], optional
+        """
+        limiters = self._limiters(endpoint_name)
+        # Wait for the rates of all limiters before taking any in-flight slot, so that waiting requests hold none
+        time.sleep(max(limiter._reserve() for limiter in limiters))
+        with ExitStack() as stack:
+            for limiter in limiters:
+                if limiter._semaphore is not None:
+                    stack.enter_context(limiter._semaphore)
+            yield
+
+    @asynccontextmanager
+    async def alimit(self, endpoint_name: Optional[str] = None) -> AsyncIterator[None]:
+        """Asyncio counterpart of .limit()
+
+        :param endpoint_name: name of the endpoint, defaults to None
+        :type endpoint_name: Optional[str], optional
+        """
+        limiters = self._limiters(endpoint_name)
+        await asyncio.sleep(max(limiter._reserve() for limiter in limiters))
+        async with AsyncExitStack() as stack:
+            for limiter in limiters:
+                async_semaphore = limiter._get_async_semaphore()
+                if async_semaphore is not None:
+                    await stack.enter_async_context(async_semaphore)
+            yield
@@ -0,0 +1,159 @@
+import datetime
+import random
+import sys
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, FrozenSet, Iterable, Optional
+
+import requests
+
+DEFAULT_RETRY_STATUSES = frozenset({429, 502, 503, 504})  #: Default HTTP statuses of transient failures
+
+
+def _is_connection_error(error: BaseException) -> bool:
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    # Only check for httpx errors if it is used, since it is an optional dependency
+    httpx = sys.modules.get('httpx')
+    return httpx is not None and isinstance(error, httpx.TransportError)
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    # Retry-After is either a number of seconds or an HTTP date
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+    return max((retry_at - datetime.datetime.now(datetime.timezone.utc)).total_seconds(), 0.0)
+
+
+class KonanRetryPolicy():
+    """Policy deciding whether, and when, Konan endpoints retry failed requests.
+
+    Requests are retried on connection errors and on responses with one of retry_statuses,
+    waiting an exponentially growing, randomly jittered, delay between attempts,
+    or as long as the server asks for using the Retry-After header.
+
+    Only idempotent requests (e.g. GET and DELETE) are retried by default,
+    since retrying others (e.g. POST predict) may repeat their side effects.
+    This includes 429 responses, which a gateway may return for requests the server already processed.
+    """
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        jitter: bool = True,
+        retry_statuses: Iterable[int] = DEFAULT_RETRY_STATUSES,
+        retry_connection_errors: bool = True,
+        respect_retry_after: bool = True,
+        retry_non_idempotent: bool = False,
+        overrides: Optional[Dict[str, "KonanRetryPolicy"]] = None,
+    ) -> None:
+        """Initialize a new KonanRetryPolicy
+
+        :param max_attempts: maximum number of attempts of a request, including the first, defaults to 3.
+            Set to 1 to never retry
+        :type max_attempts: int, optional
+        :param backoff_factor: delay before the first retry, doubling on every subsequent one, defaults to 0.5
+        :type backoff_factor: float, optional
+        :param max_backoff: maximum delay between attempts, including ones asked for by Retry-After,
+            defaults to 30.0
+        :type max_backoff: float, optional
+        :param jitter: whether to pick every delay uniformly at random between 0 and its exponential value,
+            so that many clients failing at once do not retry in lockstep, defaults to True
+        :type jitter: bool, optional
+        :param retry_statuses: HTTP statuses to retry, defaults to DEFAULT_RETRY_STATUSES
+        :type retry_statuses: Iterable[int], optional
+        :param retry_connection_errors: whether to retry connection errors and timeouts, defaults to True
+        :type retry_connection_errors: bool, optional
+        :param respect_retry_after: whether to wait as long as the Retry-After response header asks for,
+            defaults to True
+        :type respect_retry_after: bool, optional
+        :param retry_non_idempotent: whether to also retry non-idempotent requests, e.g. POST predict,
+            defaults to False
+        :type retry_non_idempotent: bool, optional
+        :param overrides: policies to use instead of this one for some endpoints, keyed by endpoint name
+            (e.g. 'predict' or 'get-predictions'), defaults to None
+        :type overrides: Optional[Dict[str, KonanRetryPolicy]], optional
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be a positive integer")
+
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_statuses: FrozenSet[int] = frozenset(retry_statuses)
+        self.retry_connection_errors = retry_connection_errors
+        self.respect_retry_after = respect_retry_after
+        self.retry_non_idempotent = retry_non_idempotent
+        self.overrides = overrides or dict()
+
+    def for_endpoint(self, endpoint_name: str) -> "KonanRetryPolicy":
+        """Return the policy to use for the endpoint named endpoint_name
+
+        :param endpoint_name: name of the endpoint
+        :type endpoint_name: str
+        :return: the endpoint's override if any, otherwise this policy
+        :rtype: KonanRetryPolicy
+        """
+        return self.overrides.get(endpoint_name, self)
+
+    def should_retry(
+        self,
+        attempt: int,
+        idempotent: bool,
+        response: Optional[Any] = None,
+        error: Optional[BaseException] = None,
+    ) -> bool:
+        """Return whether to retry a request after its attempt-th attempt failed
+
+        :param attempt: number of attempts made so far
+        :type attempt: int
+        :param idempotent: whether the request can be repeated without repeating its side effects
+        :type idempotent: bool
+        :param response: response of the last attempt, defaults to None
+        :type response: Optional[Any], optional
+        :param error: error raised by the last attempt, if it did not receive a response, defaults to None
+        :type error: Optional[BaseException], optional
+        :return: whether to retry the request
+        :rtype: bool
+        """
+        if attempt >= self.max_attempts:
+            return False
+
+        if response is not None:
+            if response.status_code not in self.retry_statuses:
+                return False
+        elif error is None or not self.retry_connection_errors or not _is_connection_error(error):
+            return False
+
+        return idempotent or self.retry_non_idempotent
+
+    def delay(self, attempt: int, response: Optional[Any] = None) -> float:
+        """Return the number of seconds to wait before retrying a request after its attempt-th attempt
+
+        :param attempt: number of attempts made so far
+        :type attempt: int
+        :param response: response of the last attempt, defaults to None
+        :type response: Optional[Any], optional
+        :return: seconds to wait
+        :rtype: float
+        """
+        if self.respect_retry_after and response is not None:
+            retry_after = _parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                return min(retry_after, self.max_backoff)
+
+        backoff = min(self.backoff_factor * (2 ** (attempt - 1)), self.max_backoff)
+        if self.jitter:
+            return random.uniform(0, backoff)
+        return backoff
@@ -0,0 +1,234 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+KonanTimeout = Union[float, Tuple[float, float]]  #: Either a total timeout, or a (connect, read) timeout pair
+
+DEFAULT_POOL_CONNECTIONS = 10  #: Default number of per-host connection pools to cache
+DEFAULT_POOL_MAXSIZE = 10  #: Default maximum number of connections kept alive per host
+DEFAULT_TIMEOUT = (10.0, 120.0)  #: Default (connect, read) timeout of every request
+
+
+class KonanBaseTransport(ABC):
+    """Base class for the HTTP transports used by Konan endpoints to send their requests.
+    """
+    timeout: Optional[KonanTimeout] = None  #: Default timeout of every request
+
+    @abstractmethod
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict] = None,
+        json: Optional[Any] = None,
+        params: Optional[Dict] = None,
+        timeout: Optional[KonanTimeout] = None,
+    ) -> requests.Response:
+        """Send a single HTTP request
+
+        :param method: HTTP method to use
+        :type method: str
+        :param url: full URL to send the request to
+        :type url: str
+        :param headers: request headers, defaults to None
+        :type headers: Optional[Dict], optional
+        :param json: JSON-serializable request body, defaults to None
+        :type json: Optional[Any], optional
+        :param params: query parameters, defaults to None
+        :type params: Optional[Dict], optional
+        :param timeout: timeout to use instead of the transport's default, defaults to None
+        :type timeout: Optional[KonanTimeout], optional
+        :return: HTTP response
+        :rtype: requests.Response
+        """
+        ...
+
+    def close(self) -> None:
+        """Release any resources (e.g. open connections) held by the transport
+        """
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class KonanSessionTransport(KonanBaseTransport):
+    """Transport that keeps connections alive and pools them per host using a requests.Session.
+    """
+    def __init__(
+        self,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        pool_block: bool = False,
+        timeout: Optional[KonanTimeout] = DEFAULT_TIMEOUT,
+        session: Optional[requests.Session] = None,
+    ) -> None:
+        """Initialize a new KonanSessionTransport
+
+        :param pool_connections: number of per-host connection pools to cache, defaults to DEFAULT_POOL_CONNECTIONS
+        :type pool_connections: int, optional
+        :param pool_maxsize: maximum number of connections to keep alive per host, defaults to DEFAULT_POOL_MAXSIZE
+        :type pool_maxsize: int, optional
+        :param pool_block: whether to wait for a free connection once pool_maxsize connections are in use,
+            instead of opening (and later discarding) extra ones, defaults to False
+        :type pool_block: bool, optional
+        :param timeout: default timeout of every request, defaults to DEFAULT_TIMEOUT.
+            Pass None to wait indefinitely
+        :type timeout: Optional[KonanTimeout], optional
+        :param session: session to use instead of creating a new one, defaults to None
+        :type session: Optional[requests.Session], optional
+        """
+        self.timeout = timeout
+        self.session = session or requests.Session()
+
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict] = None,
+        json: Optional[Any] = None,
+        params: Optional[Dict] = None,
+        timeout: Optional[KonanTimeout] = None,
+    ) -> requests.Response:
+        return self.session.request(
+            method, url, headers=headers,
+            json=json, params=params,
+            timeout=timeout if timeout is not None else self.timeout,
+        )
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class KonanBaseAsyncTransport(ABC):
+    """Base class for the asyncio HTTP transports used by Konan endpoints to send their requests.
+    """
+    timeout: Optional[KonanTimeout] = None  #: Default timeout of every request
+
+    @abstractmethod
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict] = None,
+        json: Optional[Any] = None,
+        params: Optional[Dict] = None,
+        timeout: Optional[KonanTimeout] = None,
+    ) -> Any:
+        """Send a single HTTP request
+
+        :param method: HTTP method to use
+        :type method: str
+        :param url: full URL to send the request to
+        :type url: str
+        :param headers: request headers, defaults to None
+        :type headers: Optional[Dict], optional
+        :param json: JSON-serializable request body, defaults to None
+        :type json: Optional[Any], optional
+        :param params: query parameters, defaults to None
+        :type params: Optional[Dict], optional
+        :param timeout: timeout to use instead of the transport's default, defaults to None
+        :type timeout: Optional[KonanTimeout], optional
+        :return: HTTP response, exposing status_code, headers, json() and raise_for_status()
+        :rtype: Any
+        """
+        ...
+
+    async def aclose(self) -> None:
+        """Release any resources (e.g. open connections) held by the transport
+        """
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.aclose()
+
+
+class KonanAsyncClientTransport(KonanBaseAsyncTransport):
+    """Transport that pools keep-alive connections using an httpx.AsyncClient,
+    and bounds the number of requests in flight at any time.
+
+    Requires the optional httpx package.
+    """
+    def __init__(
+        self,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[KonanTimeout] = DEFAULT_TIMEOUT,
+    ) -> None:
+        """Initialize a new KonanAsyncClientTransport
+
+        :param pool_maxsize: maximum number of connections to keep alive, defaults to DEFAULT_POOL_MAXSIZE
+        :type pool_maxsize: int, optional
+        :param max_concurrency: maximum number of requests in flight, defaults to None.
+            If left as None, defaults to pool_maxsize
+        :type max_concurrency: Optional[int], optional
+        :param timeout: default timeout of every request, defaults to DEFAULT_TIMEOUT.
+            Pass None to wait indefinitely
+        :type timeout: Optional[KonanTimeout], optional
+        """
+        try:
+            import httpx
+        except ImportError as e:
+            raise ImportError(
+                "KonanAsyncClientTransport requires the httpx package. Install it using `pip install httpx`"
+            ) from e
+
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency or pool_maxsize
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=pool_maxsize,
+                max_keepalive_connections=pool_maxsize,
+            ),
+            timeout=self._httpx_timeout(timeout),
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @staticmethod
+    def _httpx_timeout(timeout: Optional[KonanTimeout]) -> Any:
+        import httpx
+
+        if isinstance(timeout, tuple):
+            connect_timeout, read_timeout = timeout
+            return httpx.Timeout(read_timeout, connect=connect_timeout)
+        return httpx.Timeout(timeout)
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict] = None,
+        json: Optional[Any] = None,
+        params: Optional[Dict] = None,
+        timeout: Optional[KonanTimeout] = None,
+    ) -> Any:
+        # Created lazily so that it binds to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async with self._semaphore:
+            return await self.client.request(
+                method, url, headers=headers,
+                json=json, params=params,
+                timeout=self._httpx_timeout(timeout if timeout is not None else self.timeout),
+            )
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
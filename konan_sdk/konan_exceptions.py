@@ -0,0 +1,39 @@
+import datetime
+from typing import Optional
+
+
+class KonanError(Exception):
+    """Base class for errors raised by konan-sdk.
+    """
+    pass
+
+
+class KonanCircuitOpenError(KonanError):
+    """Raised instead of sending a request while the circuit it belongs to is open.
+    """
+    def __init__(self, key: str, retry_at: Optional[datetime.datetime] = None) -> None:
+        """Initialize a new KonanCircuitOpenError
+
+        :param key: key of the open circuit, e.g. a deployment uuid
+        :type key: str
+        :param retry_at: time at which requests will be tried again, defaults to None
+        :type retry_at: Optional[datetime.datetime], optional
+        """
+        self.key = key
+        self.retry_at = retry_at
+        super().__init__(
+            f"Circuit of {key} is open" + (f" until {retry_at.isoformat()}" if retry_at is not None else "")
+        )
+
+
+class KonanDeadlineExceededError(KonanError, TimeoutError):
+    """Raised when an operation does not complete within its deadline, including any retries and token refresh.
+    """
+    def __init__(self, seconds: float) -> None:
+        """Initialize a new KonanDeadlineExceededError
+
+        :param seconds: deadline of the operation, in seconds from its start
+        :type seconds: float
+        """
+        self.seconds = seconds
+        super().__init__(f"Deadline of {seconds}s exceeded")
@@ -0,0 +1,189 @@
+import mmap
+import os
+import pickle
+import sys
+import threading
+import time
+import types
+from loguru import logger
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from konan_sdk.konan_service.constants import MODELS_DIR
+from konan_sdk.konan_service.serializers import KonanServiceArtifactStats
+
+_PICKLE_EXTENSIONS = ('.joblib', '.pkl', '.pickle')
+
+
+def _get_rss_bytes() -> Optional[int]:
+    # Resident memory of the current process, only measurable where /proc is available, e.g. on Linux
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _load_numpy(path: str, memory_map: bool) -> Tuple[Any, bool]:
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            f"Loading {os.path.basename(path)} requires numpy. Install it using `pip install numpy`"
+        ) from e
+
+    if path.endswith('.npz'):
+        # Archives cannot be memory-mapped, but their arrays are only read once accessed
+        return numpy.load(path), False
+    return numpy.load(path, mmap_mode='r' if memory_map else None), memory_map
+
+
+def _is_memory_mapped(artifact: Any) -> bool:
+    # Looks for NumPy memory maps among the artifact, its containers and its attributes, e.g. an estimator's arrays
+    numpy = sys.modules.get('numpy')
+    if numpy is None:
+        return False
+
+    seen_ids = set()
+    values = [artifact]
+    while values:
+        value = values.pop()
+        if id(value) in seen_ids:
+            continue
+        seen_ids.add(id(value))
+
+        if isinstance(value, numpy.ndarray):
+            while isinstance(value, numpy.ndarray):
+                if isinstance(value, numpy.memmap):
+                    return True
+                value = value.base
+        elif isinstance(value, dict):
+            values.extend(value.values())
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            values.extend(value)
+        elif hasattr(value, '__dict__') and not isinstance(value, (type, types.ModuleType)):
+            values.extend(vars(value).values())
+    return False
+
+
+def _load_pickle(path: str, memory_map: bool) -> Tuple[Any, bool]:
+    try:
+        import joblib
+    except ImportError:
+        joblib = None
+
+    if joblib is not None:
+        # Memory-maps the NumPy arrays of uncompressed joblib dumps, and unpickles anything else as usual,
+        # e.g. plain pickles and compressed dumps
+        artifact = joblib.load(path, mmap_mode='r' if memory_map else None)
+        return artifact, memory_map and _is_memory_mapped(artifact)
+    with open(path, 'rb') as artifact_file:
+        return pickle.load(artifact_file), False
+
+
+def _load_raw(path: str, memory_map: bool) -> Tuple[Any, bool]:
+    with open(path, 'rb') as artifact_file:
+        # Empty files cannot be memory-mapped
+        if not memory_map or os.fstat(artifact_file.fileno()).st_size == 0:
+            return artifact_file.read(), False
+        return mmap.mmap(artifact_file.fileno(), 0, access=mmap.ACCESS_READ), True
+
+
+class KonanServiceArtifactLoader():
+    """Loads the artifacts of a model, e.g. its weights, from the models directory, once per process.
+
+    Artifacts are memory-mapped whenever their format allows it, so that the operating system reads them lazily
+    and keeps a single physical copy of them, shared by all worker processes serving the model:
+
+    - .npy files are loaded as read-only NumPy memory maps
+    - .joblib, .pkl and .pickle files are loaded with joblib if installed, memory-mapping the NumPy arrays of
+      uncompressed joblib dumps, and with pickle otherwise, without memory-mapping them
+    - .npz archives are loaded with NumPy, reading each array once accessed
+    - any other file is loaded as a read-only mmap.mmap, e.g. for ONNX runtimes accepting bytes, or as b'' if empty
+
+    Pickled artifacts can run arbitrary code when loaded, and must therefore come from a trusted source.
+    """
+    def __init__(self, models_dir: Optional[str] = MODELS_DIR) -> None:
+        """Initialize a new KonanServiceArtifactLoader
+
+        :param models_dir: directory containing the artifacts, defaults to the KONAN_SERVICE_MODELS_DIR environment
+            variable
+        :type models_dir: Optional[str], optional
+        """
+        self.models_dir = models_dir
+        self.stats: Dict[str, KonanServiceArtifactStats] = dict()
+
+        self._artifacts: Dict[str, Any] = dict()
+        self._lock = threading.Lock()
+
+    def resolve(self, name: str) -> str:
+        """Return the absolute path of an artifact
+
+        :param name: path of the artifact, relative to the models directory
+        :type name: str
+        :raises ValueError: if no models directory is set, or if name points outside of it
+        :raises FileNotFoundError: if the artifact does not exist
+        :return: absolute path of the artifact
+        :rtype: str
+        """
+        if self.models_dir is None:
+            raise ValueError("No models directory is set. Set the KONAN_SERVICE_MODELS_DIR environment variable")
+
+        models_dir = os.path.realpath(self.models_dir)
+        path = os.path.realpath(os.path.join(models_dir, name))
+        if os.path.commonpath([models_dir, path]) != models_dir:
+            raise ValueError(f"Artifact {name} is outside of the models directory {models_dir}")
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"Artifact {name} does not exist in the models directory {models_dir}")
+        return path
+
+    def _get_loader(self, path: str) -> Callable[[str, bool], Tuple[Any, bool]]:
+        if path.endswith(('.npy', '.npz')):
+            return _load_numpy
+        if path.endswith(_PICKLE_EXTENSIONS):
+            return _load_pickle
+        return _load_raw
+
+    def load(self, name: str, memory_map: bool = True) -> Any:
+        """Load an artifact, unless already loaded by this loader, recording its load time and resident memory
+
+        :param name: path of the artifact, relative to the models directory
+        :type name: str
+        :param memory_map: whether to memory-map the artifact if its format allows it, defaults to True
+        :type memory_map: bool, optional
+        :return: the loaded artifact
+        :rtype: Any
+        """
+        with self._lock:
+            if name in self._artifacts:
+                return self._artifacts[name]
+
+            path = self.resolve(name)
+            rss_before = _get_rss_bytes()
+            started_at = time.monotonic()
+            artifact, memory_mapped = self._get_loader(path)(path, memory_map)
+            load_time = time.monotonic() - started_at
+            rss_after = _get_rss_bytes()
+
+            stats = KonanServiceArtifactStats(
+                name=name,
+                path=path,
+                size_bytes=os.path.getsize(path),
+                memory_mapped=memory_mapped,
+                load_time=load_time,
+                rss_bytes=rss_after - rss_before if rss_before is not None and rss_after is not None else None,
+            )
+            logger.info(
+                f"Loaded artifact {name} ({stats.size_bytes} bytes, "
+                f"{'memory-mapped' if memory_mapped else 'in memory'}) in {load_time:.2f}s"
+            )
+            self._artifacts[name] = artifact
+            self.stats[name] = stats
+            return artifact
+
+    def get_stats(self) -> List[KonanServiceArtifactStats]:
+        """Return the statistics of the artifacts loaded so far
+
+        :return: statistics of the loaded artifacts, in loading order
+        :rtype: List[KonanServiceArtifactStats]
+        """
+        return list(self.stats.values())
@@ -0,0 +1,173 @@
+import asyncio
+from collections import Counter
+from loguru import logger
+from typing import Any, List, Optional, Tuple
+
+from konan_sdk.konan_service.executors import KonanServiceBaseExecutor
+from konan_sdk.konan_service.serializers import (
+    KonanServiceBasePredictionRequest, KonanServiceBasePredictionResponse, KonanServiceMicroBatcherStats,
+)
+
+
+class KonanServiceOverloadedError(Exception):
+    """Raised when a prediction request is rejected because too many are already waiting to be batched.
+    """
+    def __init__(self, max_queue_size: int) -> None:
+        super().__init__(f"More than {max_queue_size} prediction requests are waiting to be batched")
+        self.max_queue_size = max_queue_size
+
+
+class KonanServiceMicroBatcher():
+    """Collects concurrent prediction requests into batches, predicted by a single call to the model's predict_batch().
+
+    A batch is predicted as soon as it holds max_batch_size requests, or max_wait seconds after its first request
+    arrived, whichever comes first. Batches are predicted one at a time, by the service's executor, while the next one
+    is collected, so batches grow with the load.
+
+    Must be used from within a single running event loop, e.g. the one serving a KonanService.
+    """
+    def __init__(
+        self,
+        max_batch_size: int = 32,
+        max_wait: float = 0.005,
+        max_queue_size: int = 1024,
+    ) -> None:
+        """Initialize a new KonanServiceMicroBatcher
+
+        :param max_batch_size: maximum number of requests per batch, defaults to 32
+        :type max_batch_size: int, optional
+        :param max_wait: maximum seconds to wait for a batch to fill up after its first request, defaults to 0.005
+        :type max_wait: float, optional
+        :param max_queue_size: maximum number of requests waiting to be batched, beyond which requests are
+            rejected with a KonanServiceOverloadedError, defaults to 1024
+        :type max_queue_size: int, optional
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be a positive integer")
+        if max_wait < 0:
+            raise ValueError("max_wait must be a non-negative number")
+        if max_queue_size < 1:
+            raise ValueError("max_queue_size must be a positive integer")
+
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.max_queue_size = max_queue_size
+
+        self.batches_count = 0
+        self.requests_count = 0
+        self.rejected_count = 0
+        self.batch_size_histogram: Counter = Counter()
+
+        self._executor: Optional[KonanServiceBaseExecutor] = None
+        # Created lazily so that they bind to the running event loop
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def bind(self, executor: KonanServiceBaseExecutor) -> None:
+        """Set the executor predicting the batches
+
+        :param executor: executor running the model whose predict_batch() predicts the batches
+        :type executor: KonanServiceBaseExecutor
+        """
+        self._executor = executor
+
+    async def predict(self, req: KonanServiceBasePredictionRequest) -> KonanServiceBasePredictionResponse:
+        """Predict req as part of the next batch
+
+        :param req: raw request data from API
+        :type req: KonanServiceBasePredictionRequest
+        :raises KonanServiceOverloadedError: if max_queue_size requests are already waiting to be batched
+        :return: prediction of req
+        :rtype: KonanServiceBasePredictionResponse
+        """
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.ensure_future(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((req, future))
+        except asyncio.QueueFull:
+            self.rejected_count += 1
+            raise KonanServiceOverloadedError(self.max_queue_size) from None
+        return await future
+
+    async def _collect(self) -> List[Tuple[Any, asyncio.Future]]:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        collect_until = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            timeout = collect_until - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect()
+            # Skip requests whose callers went away while waiting
+            batch = [(req, future) for req, future in batch if not future.done()]
+            if not batch:
+                continue
+
+            self.batches_count += 1
+            self.requests_count += len(batch)
+            self.batch_size_histogram[len(batch)] += 1
+            try:
+                # Predicted off the event loop, so that the next batch is collected meanwhile
+                predictions = await self._executor.run('predict_batch', [req for req, _ in batch])
+                if len(predictions) != len(batch):
+                    raise ValueError(
+                        f"predict_batch() returned {len(predictions)} predictions for {len(batch)} requests"
+                    )
+            except Exception as e:
+                logger.exception(f"Failed to predict a batch of {len(batch)} requests")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), prediction in zip(batch, predictions):
+                if not future.done():
+                    future.set_result(prediction)
+
+    async def aclose(self) -> None:
+        """Stop collecting batches, failing the requests still waiting to be batched
+        """
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        while self._queue is not None and not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            future.cancel()
+
+    def get_stats(self) -> KonanServiceMicroBatcherStats:
+        """Return the counts of batches and requests predicted so far
+
+        :return: statistics of the micro-batcher
+        :rtype: KonanServiceMicroBatcherStats
+        """
+        return KonanServiceMicroBatcherStats(
+            max_batch_size=self.max_batch_size,
+            max_wait=self.max_wait,
+            max_queue_size=self.max_queue_size,
+            queue_size=self._queue.qsize() if self._queue is not None else 0,
+            batches_count=self.batches_count,
+            requests_count=self.requests_count,
+            rejected_count=self.rejected_count,
+            batch_size_histogram=dict(sorted(self.batch_size_histogram.items())),
+        )
@@ -0,0 +1,183 @@
+import abc
+import asyncio
+import inspect
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from konan_sdk.konan_service.models import KonanServiceBaseModel
+
+KonanServiceModelFactory = Callable[[], KonanServiceBaseModel]  #: Callable creating the model of a KonanService
+
+
+class KonanServiceBaseExecutor(abc.ABC):
+    """Strategy running the methods of a KonanService's model, e.g. predict() and evaluate(), on behalf of its routes.
+
+    Routes await the executor from the event loop, which therefore stays free to serve other routes, e.g. /healthz,
+    while the model runs.
+    """
+    model: Optional[KonanServiceBaseModel] = None  #: Model run in this process, if any
+
+    def load(self, model_factory: KonanServiceModelFactory) -> Optional[KonanServiceBaseModel]:
+        """Create the model run by this executor
+
+        :param model_factory: callable creating the model
+        :type model_factory: KonanServiceModelFactory
+        :return: the model, or None if it is not created in this process
+        :rtype: Optional[KonanServiceBaseModel]
+        """
+        self.model = model_factory()
+        return self.model
+
+    @abc.abstractmethod
+    async def run(self, method_name: str, *args: Any) -> Any:
+        """Call a method of the model
+
+        :param method_name: name of the method, e.g. 'predict'
+        :type method_name: str
+        :return: result of the method
+        :rtype: Any
+        """
+        pass
+
+    async def astart(self) -> None:
+        """Start the workers running the model, if any, once it is loaded, so that they create it before any request
+        """
+        pass
+
+    async def awarmup(self, requests: List[Any]) -> None:
+        """Warm the model up, by calling its warmup() hook, then predicting sample requests
+
+        :param requests: sample prediction requests
+        :type requests: List[Any]
+        """
+        await self.run('warmup')
+        for req in requests:
+            await self.run('predict', req)
+
+    async def aclose(self) -> None:
+        """Release the resources held by this executor, e.g. its workers
+        """
+        pass
+
+
+class KonanServiceThreadPoolExecutor(KonanServiceBaseExecutor):
+    """Runs the model in a pool of threads.
+
+    Suits models that release the GIL while they compute, e.g. NumPy or scikit-learn ones.
+    """
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        """Initialize a new KonanServiceThreadPoolExecutor
+
+        :param max_workers: number of threads dedicated to the model, defaults to None.
+            If left as None, the model runs in the threadpool shared by all of the service's synchronous work
+        :type max_workers: Optional[int], optional
+        """
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='konan-model',
+        ) if max_workers is not None else None
+
+    async def run(self, method_name: str, *args: Any) -> Any:
+        method = getattr(self.model, method_name)
+        if self._pool is None:
+            return await run_in_threadpool(method, *args)
+        return await asyncio.get_running_loop().run_in_executor(self._pool, method, *args)
+
+    async def aclose(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+
+
+# Model of the current process pool worker, created once by _initialize_worker()
+_worker_model: Optional[KonanServiceBaseModel] = None
+
+
+def _initialize_worker(model_factory: KonanServiceModelFactory) -> None:
+    global _worker_model
+    _worker_model = model_factory()
+    _worker_model.warmup()
+
+
+def _start_worker() -> None:
+    # Submitted only to have the pool start a worker, which initializes it
+    pass
+
+
+def _run_worker_model(method_name: str, *args: Any) -> Any:
+    return getattr(_worker_model, method_name)(*args)
+
+
+class KonanServiceProcessPoolExecutor(KonanServiceBaseExecutor):
+    """Runs the model in a pool of processes, each creating its own model, and warming it up, once when it starts.
+
+    Suits CPU-bound models holding the GIL, at the cost of pickling every request and response.
+    Their classes, and the model's, must therefore be importable, i.e. defined at the top level of a module.
+    """
+    def __init__(self, max_workers: Optional[int] = None, mp_context: Optional[Any] = None) -> None:
+        """Initialize a new KonanServiceProcessPoolExecutor
+
+        :param max_workers: number of worker processes, defaults to None (the number of CPUs)
+        :type max_workers: Optional[int], optional
+        :param mp_context: multiprocessing context to start the workers with, defaults to None (the default one)
+        :type mp_context: Optional[Any], optional
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.mp_context = mp_context
+        self._model_factory: Optional[KonanServiceModelFactory] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_pid: Optional[int] = None
+
+    def load(self, model_factory: KonanServiceModelFactory) -> Optional[KonanServiceBaseModel]:
+        self._model_factory = model_factory
+        return None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        # Created lazily, and again after a fork, since a pool cannot be used from a forked process
+        if self._pool is None or self._pool_pid != os.getpid():
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=self.mp_context,
+                initializer=_initialize_worker,
+                initargs=(self._model_factory,),
+            )
+            self._pool_pid = os.getpid()
+        return self._pool
+
+    async def run(self, method_name: str, *args: Any) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(
+            self._get_pool(), _run_worker_model, method_name, *args,
+        )
+
+    async def astart(self) -> None:
+        # Workers create their model when they start, so start them all now rather than on the first requests
+        pool = self._get_pool()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(pool, _start_worker) for _ in range(self.max_workers)))
+
+    async def awarmup(self, requests: List[Any]) -> None:
+        # Workers already called the model's warmup() hook when they started
+        for req in requests:
+            await self.run('predict', req)
+
+    async def aclose(self) -> None:
+        if self._pool is not None and self._pool_pid == os.getpid():
+            self._pool.shutdown(wait=False)
+
+
+class KonanServiceAsyncExecutor(KonanServiceBaseExecutor):
+    """Runs models whose methods are coroutines, e.g. ones calling other services, directly on the event loop.
+
+    Synchronous methods are called directly too, and must therefore return quickly.
+    """
+    async def run(self, method_name: str, *args: Any) -> Any:
+        if method_name == 'predict_batch' and type(self.model).predict_batch is KonanServiceBaseModel.predict_batch:
+            # The default predict_batch() would return a list of coroutines
+            return await asyncio.gather(*(self.run('predict', req) for req in args[0]))
+
+        result = getattr(self.model, method_name)(*args)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
@@ -1,4 +1,5 @@
 import abc
+from typing import List
 
 from konan_sdk.konan_service.serializers import (
     KonanServiceBasePredictionRequest, KonanServiceBasePredictionResponse,
@@ -18,6 +19,27 @@ class KonanServiceBaseModel(abc.ABC):
         """
         pass
 
+    def predict_batch(self, reqs: List[KonanServiceBasePredictionRequest]) -> List[KonanServiceBasePredictionResponse]:
+        """Predicts a batch of requests at once
+
+        Defaults to calling predict() on every request.
+        Override it to predict the whole batch in one vectorized pass, e.g. on a matrix of all requests' features
+
+        :param reqs: raw requests data from API
+        :type reqs: List[KonanServiceBasePredictionRequest]
+        :return: predictions, one per request and in the same order
+        :rtype: List[KonanServiceBasePredictionResponse]
+        """
+        return [self.predict(req) for req in reqs]
+
+    def warmup(self) -> None:
+        """Warms the model up before the service reports ready, e.g. by predicting a few sample requests
+        so that lazily initialized caches and compiled code are ready before real traffic arrives
+
+        Defaults to doing nothing
+        """
+        pass
+
     @abc.abstractmethod
     def evaluate(self, req: KonanServiceBaseEvaluateRequest) -> KonanServiceBaseEvaluateResponse:
         """Evaluates the model using past predictions and their feedback
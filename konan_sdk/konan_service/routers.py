@@ -4,7 +4,8 @@ from fastapi.types import DecoratedCallable
 from fastapi_utils.inferring_router import InferringRouter
 
 from konan_sdk.konan_service.serializers import (
-    KonanServiceBasePredictionResponse, KonanServiceBaseEvaluateResponse)
+    KonanServiceBasePredictionResponse, KonanServiceBaseBatchPredictionResponse, KonanServiceBaseEvaluateResponse,
+    KonanServiceMicroBatcherStats)
 
 
 class KonanServiceRouter(InferringRouter):
@@ -12,11 +13,13 @@ class KonanServiceRouter(InferringRouter):
         self,
         *,
         predict_response_class: Type = KonanServiceBasePredictionResponse,
+        predict_batch_response_class: Type = KonanServiceBaseBatchPredictionResponse,
         evaluate_response_class: Type = KonanServiceBaseEvaluateResponse,
         **kwargs,
     ) -> None:
         super().__init__(**kwargs)
         self._predict_response_class = predict_response_class
+        self._predict_batch_response_class = predict_batch_response_class
         self._evaluate_response_class = evaluate_response_class
 
     def healthz(
@@ -28,6 +31,24 @@ class KonanServiceRouter(InferringRouter):
             **kwargs
         )
 
+    def livez(
+        self,
+        **kwargs,
+    ) -> Callable[[DecoratedCallable], DecoratedCallable]:
+        return self.get(
+            '/livez',
+            **kwargs
+        )
+
+    def readyz(
+        self,
+        **kwargs,
+    ) -> Callable[[DecoratedCallable], DecoratedCallable]:
+        return self.get(
+            '/readyz',
+            **kwargs
+        )
+
     def predict(
         self,
         **kwargs,
@@ -38,6 +59,16 @@ class KonanServiceRouter(InferringRouter):
             **kwargs,
         )
 
+    def predict_batch(
+        self,
+        **kwargs,
+    ) -> Callable[[DecoratedCallable], DecoratedCallable]:
+        return self.post(
+            '/predict_batch',
+            response_model=self._predict_batch_response_class,
+            **kwargs,
+        )
+
     def evaluate(
         self,
         **kwargs,
@@ -47,3 +78,13 @@ class KonanServiceRouter(InferringRouter):
             response_model=self._evaluate_response_class,
             **kwargs,
         )
+
+    def batcher_stats(
+        self,
+        **kwargs,
+    ) -> Callable[[DecoratedCallable], DecoratedCallable]:
+        return self.get(
+            '/batcher_stats',
+            response_model=KonanServiceMicroBatcherStats,
+            **kwargs,
+        )
@@ -1,6 +1,6 @@
 from enum import Enum
 from pydantic import BaseModel
-from typing import Any, List, Union
+from typing import Any, Dict, List, Optional, Union
 
 
 class KonanServiceBasePredictionRequest(BaseModel):
@@ -17,6 +17,46 @@ class KonanServiceBasePredictionResponse(BaseModel):
     pass
 
 
+class KonanServiceBaseBatchPredictionRequest(BaseModel):
+    """
+    Batch Predict Request serializer for input format validation.
+    """
+    data: List[KonanServiceBasePredictionRequest]  #: List of prediction requests to predict at once
+
+
+class KonanServiceBaseBatchPredictionResponse(BaseModel):
+    """
+    Batch Predict Response serializer for output format validation.
+    """
+    data: List[KonanServiceBasePredictionResponse]  #: List of predictions, in the order of their requests
+
+
+class KonanServiceMicroBatcherStats(BaseModel):
+    """
+    Statistics of a KonanServiceMicroBatcher
+    """
+    max_batch_size: int  #: Maximum number of requests per batch
+    max_wait: float  #: Maximum seconds to wait for a batch to fill up
+    max_queue_size: int  #: Maximum number of requests waiting to be batched
+    queue_size: int  #: Number of requests currently waiting to be batched
+    batches_count: int  #: Number of batches predicted
+    requests_count: int  #: Number of requests predicted in batches
+    rejected_count: int  #: Number of requests rejected because too many were waiting to be batched
+    batch_size_histogram: Dict[int, int]  #: Number of batches predicted, keyed by batch size
+
+
+class KonanServiceArtifactStats(BaseModel):
+    """
+    Statistics of a model artifact loaded by a KonanServiceArtifactLoader
+    """
+    name: str  #: Name of the artifact, relative to the models directory
+    path: str  #: Absolute path of the artifact
+    size_bytes: int  #: Size of the artifact's file, in bytes
+    memory_mapped: bool  #: Whether the artifact's data is memory-mapped rather than read into the heap
+    load_time: float  #: Seconds taken to load the artifact
+    rss_bytes: Optional[int]  #: Growth of the process' resident memory while loading, in bytes, if measurable
+
+
 class KonanServiceBaseFeedback(BaseModel):
     """
     Evaluation model for input format validation.
@@ -1,16 +1,73 @@
-from typing import List, Type
+import asyncio
+import functools
+import gc
+import threading
+import time
+from loguru import logger
+from typing import Any, Dict, List, Optional, Tuple, Type
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
 from fastapi_utils.cbv import cbv
+from starlette.concurrency import run_in_threadpool
 
+from konan_sdk.konan_service.batchers import KonanServiceMicroBatcher, KonanServiceOverloadedError
+from konan_sdk.konan_service.executors import KonanServiceBaseExecutor, KonanServiceThreadPoolExecutor
+from konan_sdk.konan_service.models import KonanServiceBaseModel
 from konan_sdk.konan_service.routers import KonanServiceRouter
 from konan_sdk.konan_service.serializers import (
-    KonanServiceBaseFeedback, KonanServiceBaseEvaluateRequest, KonanServiceBaseEvaluateResponse
+    KonanServiceBaseBatchPredictionRequest, KonanServiceBaseBatchPredictionResponse,
+    KonanServiceBaseFeedback, KonanServiceBaseEvaluateRequest, KonanServiceBaseEvaluateResponse,
+    KonanServiceMicroBatcherStats,
 )
 
 
+def _check_service_option(name: str, value: Any, expected_types: Tuple[Type, ...]) -> None:
+    # Options of KonanService shadow model keyword arguments of the same name, so values meant for the model fail loudly
+    if not isinstance(value, expected_types):
+        raise TypeError(
+            f"KonanService option {name} must be a {' or '.join(t.__name__ for t in expected_types if t is not type(None))},"
+            f" not {type(value).__name__}. Model arguments named {name} must be passed positionally"
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def _create_evaluate_request_class(
+    predict_response_class: Type,
+    feedback_target_class: Type,
+) -> Type[KonanServiceBaseEvaluateRequest]:
+    class ServiceFeedback(KonanServiceBaseFeedback):
+        prediction: predict_response_class
+        target: feedback_target_class
+
+    class ServiceEvaluateRequest(KonanServiceBaseEvaluateRequest):
+        data: List[ServiceFeedback]
+
+        def __reduce__(self):
+            # Local classes cannot be pickled by reference, e.g. to reach process pool workers,
+            # so instances are rebuilt through this module-level factory instead
+            return _rebuild_evaluate_request, (predict_response_class, feedback_target_class, self.dict())
+
+    return ServiceEvaluateRequest
+
+
+def _rebuild_evaluate_request(
+    predict_response_class: Type,
+    feedback_target_class: Type,
+    data: Dict[str, Any],
+) -> KonanServiceBaseEvaluateRequest:
+    return _create_evaluate_request_class(predict_response_class, feedback_target_class)(**data)
+
+
 class KonanService():
     """Class that implements a Konan webservice
+
+    The model is created when the service is, unless lazy_load is set, in which case it is created in the background
+    once the app starts, e.g. in every worker process. Either way, it is then warmed up in the background.
+    /livez answers throughout, while /readyz, and /healthz, only report ready once the model is loaded and warmed up.
+
+    Any other arguments are passed to the model's constructor. Model keyword arguments named like the service's
+    options, i.e. micro_batcher, executor, lazy_load and warmup_requests, are taken by the service instead,
+    and must therefore be passed positionally.
     """
     def __init__(
         self,
@@ -19,7 +76,12 @@ class KonanService():
         model_class: Type,
         feedback_target_class: Type = None,
         evaluate_response_class: Type = KonanServiceBaseEvaluateResponse,
-        *model_args, **model_kwargs,
+        *model_args,
+        micro_batcher: Optional[KonanServiceMicroBatcher] = None,
+        executor: Optional[KonanServiceBaseExecutor] = None,
+        lazy_load: bool = False,
+        warmup_requests: Optional[List[Any]] = None,
+        **model_kwargs,
     ) -> None:
         """Initializes a konan service
 
@@ -40,44 +102,188 @@ class KonanService():
             Should be a class that inherits from KonanServiceBaseEvaluateResponse,
             defaults to KonanServiceBaseEvaluateResponse
         :type evaluate_response_class: Type, optional
+        :param micro_batcher: if passed, collect concurrent /predict requests into batches,
+            each predicted by a single call to the model's predict_batch(), defaults to None.
+            Its statistics are served at /batcher_stats
+        :type micro_batcher: Optional[KonanServiceMicroBatcher], optional
+        :param executor: strategy running the model off the event loop, e.g. in a dedicated pool of threads
+            or processes, defaults to None.
+            If left as None, a KonanServiceThreadPoolExecutor running the model in the shared threadpool is used
+        :type executor: Optional[KonanServiceBaseExecutor], optional
+        :param lazy_load: whether to create the model once the app starts, instead of when the service is,
+            defaults to False. Call load() explicitly to create it earlier, e.g. before forking workers
+        :type lazy_load: bool, optional
+        :param warmup_requests: sample prediction requests to predict, after the model's warmup() hook,
+            before reporting ready, defaults to None
+        :type warmup_requests: Optional[List[Any]], optional
+        :raises TypeError: if one of the service's options is not of its expected type,
+            e.g. when meant for the model
         :return: None
         :rtype: Type
         """
-        self.model = model_class(*model_args, **model_kwargs)
+        _check_service_option('micro_batcher', micro_batcher, (KonanServiceMicroBatcher, type(None)))
+        _check_service_option('executor', executor, (KonanServiceBaseExecutor, type(None)))
+        _check_service_option('lazy_load', lazy_load, (bool,))
+        _check_service_option('warmup_requests', warmup_requests, (list, tuple, type(None)))
+
+        self.executor = executor if executor is not None else KonanServiceThreadPoolExecutor()
+        self.warmup_requests = warmup_requests or []
+        # None until loaded, and if the model is only created by the executor's workers
+        self.model: Optional[KonanServiceBaseModel] = None
+        self.is_loaded = False
+        self.is_ready = False
+        self.startup_error: Optional[BaseException] = None
+
+        self._model_factory = functools.partial(model_class, *model_args, **model_kwargs)
+        self._needs_warmup = (
+            bool(self.warmup_requests)
+            or getattr(model_class, 'warmup', KonanServiceBaseModel.warmup) is not KonanServiceBaseModel.warmup
+        )
+        self._load_lock = threading.Lock()
+        self._preparation: Optional[asyncio.Task] = None
+
         self.app = FastAPI(openapi_url='/docs', docs_url='/swagger')
+        self.app.add_event_handler('startup', self._astartup)
+        self.app.add_event_handler('shutdown', self._ashutdown)
+        self.micro_batcher = micro_batcher
+        if micro_batcher is not None:
+            micro_batcher.bind(self.executor)
+            self.app.add_event_handler('shutdown', micro_batcher.aclose)
+        self.app.add_event_handler('shutdown', self.executor.aclose)
         feedback_target_class = feedback_target_class or predict_response_class
 
-        class ServiceFeedback(KonanServiceBaseFeedback):
-            prediction: predict_response_class
-            target: feedback_target_class
+        class ServiceBatchPredictionRequest(KonanServiceBaseBatchPredictionRequest):
+            data: List[predict_request_class]
+
+        class ServiceBatchPredictionResponse(KonanServiceBaseBatchPredictionResponse):
+            data: List[predict_response_class]
 
-        class ServiceEvaluateRequest(KonanServiceBaseEvaluateRequest):
-            data: List[ServiceFeedback]
+        evaluate_request_class = _create_evaluate_request_class(predict_response_class, feedback_target_class)
 
         router = KonanServiceRouter(
             predict_response_class=predict_response_class,
+            predict_batch_response_class=ServiceBatchPredictionResponse,
             evaluate_response_class=evaluate_response_class,
         )
 
         @cbv(router)
         class KonanRoutes():
-            __model = self.model
+            __service = self
+            __executor = self.executor
+            __micro_batcher = micro_batcher
+
+            # Health routes are served on the event loop, so that they respond even while the model is busy
+            @router.livez()
+            async def livez(self) -> str:
+                if self.__service.startup_error is not None:
+                    raise HTTPException(status_code=503, detail=f"Failed to start: {self.__service.startup_error}")
+                return "\n"
+
+            @router.readyz()
+            async def readyz(self) -> str:
+                self.__check_ready()
+                return "\n"
 
             @router.healthz()
-            def healthz(self) -> str:
+            async def healthz(self) -> str:
+                self.__check_ready()
                 return "\n"
 
-            @router.predict()
-            def predict(self, req: predict_request_class) -> predict_response_class:
-                prediction = self.__model.predict(req)
-                return prediction
+            def __check_ready(self) -> None:
+                if not self.__service.is_ready:
+                    raise HTTPException(status_code=503, detail="Model is not ready")
+
+            def __check_loaded(self) -> None:
+                if not self.__service.is_loaded:
+                    raise HTTPException(status_code=503, detail="Model is not loaded", headers={'Retry-After': '1'})
+
+            if micro_batcher is None:
+                @router.predict()
+                async def predict(self, req: predict_request_class) -> predict_response_class:
+                    self.__check_loaded()
+                    prediction = await self.__executor.run('predict', req)
+                    return prediction
+            else:
+                @router.predict()
+                async def predict(self, req: predict_request_class) -> predict_response_class:
+                    self.__check_loaded()
+                    try:
+                        prediction = await self.__micro_batcher.predict(req)
+                    except KonanServiceOverloadedError as e:
+                        raise HTTPException(status_code=503, detail=str(e), headers={'Retry-After': '1'})
+                    return prediction
+
+                @router.batcher_stats()
+                def batcher_stats(self) -> KonanServiceMicroBatcherStats:
+                    return self.__micro_batcher.get_stats()
+
+            @router.predict_batch()
+            async def predict_batch(self, req: ServiceBatchPredictionRequest) -> ServiceBatchPredictionResponse:
+                self.__check_loaded()
+                predictions = await self.__executor.run('predict_batch', req.data)
+                if len(predictions) != len(req.data):
+                    raise ValueError(
+                        f"predict_batch() returned {len(predictions)} predictions for {len(req.data)} requests"
+                    )
+                return ServiceBatchPredictionResponse(data=predictions)
 
             @router.evaluate()
-            def evaluate(self, req: ServiceEvaluateRequest) -> evaluate_response_class:
-                evaluation = self.__model.evaluate(req)
+            async def evaluate(self, req: evaluate_request_class) -> evaluate_response_class:
+                self.__check_loaded()
+                evaluation = await self.__executor.run('evaluate', req)
                 return evaluation
 
         self.app.include_router(router)
 
+        if not lazy_load:
+            self.load()
+
+    def load(self, freeze: bool = False) -> None:
+        """Create the model, unless already created
+
+        To share the model's memory between worker processes, e.g. of gunicorn with --preload,
+        call it with freeze=True before they are forked: the garbage collector then stops tracking
+        the objects created so far, so that it never writes to, and thus copies, the pages they live in.
+
+        :param freeze: whether to freeze all objects created so far, using gc.freeze(), defaults to False
+        :type freeze: bool, optional
+        """
+        with self._load_lock:
+            if self.is_loaded:
+                return
+            started_at = time.monotonic()
+            self.model = self.executor.load(self._model_factory)
+            self.is_loaded = True
+            logger.info(f"Loaded the model in {time.monotonic() - started_at:.2f}s")
+
+        if freeze:
+            gc.collect()
+            gc.freeze()
+        # Models created by the executor's workers are only ready once the workers are started, on startup
+        if not self._needs_warmup and self.model is not None:
+            self.is_ready = True
+
+    async def _astartup(self) -> None:
+        # Prepared in the background, so that the app starts serving /livez while the model loads and warms up
+        self._preparation = asyncio.ensure_future(self._aprepare())
+
+    async def _aprepare(self) -> None:
+        try:
+            if not self.is_loaded:
+                await run_in_threadpool(self.load)
+            await self.executor.astart()
+            if self._needs_warmup:
+                started_at = time.monotonic()
+                await self.executor.awarmup(self.warmup_requests)
+                logger.info(f"Warmed the model up in {time.monotonic() - started_at:.2f}s")
+            self.is_ready = True
+        except Exception as e:
+            logger.exception("Failed to prepare the model")
+            self.startup_error = e
+
+    async def _ashutdown(self) -> None:
+        if self._preparation is not None:
+            self._preparation.cancel()
+
     def __call__(self):
         return self.app
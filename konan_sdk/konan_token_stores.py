@@ -0,0 +1,144 @@
+import asyncio
+import json
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager, contextmanager
+from loguru import logger
+from typing import AsyncIterator, Dict, Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    # Advisory file locks are unavailable, e.g. on Windows
+    fcntl = None
+
+
+class KonanBaseTokenStore(ABC):
+    """Base class for stores sharing access and refresh tokens between processes.
+
+    Tokens are stored per key, which identifies the credentials they were obtained with.
+    """
+    @abstractmethod
+    def load(self, key: str) -> Optional[Tuple[str, str]]:
+        """Load the tokens stored under key
+
+        :param key: key of the tokens
+        :type key: str
+        :return: (access token, refresh token), or None if no tokens are stored under key
+        :rtype: Optional[Tuple[str, str]]
+        """
+        ...
+
+    @abstractmethod
+    def save(self, key: str, access_token: str, refresh_token: str) -> None:
+        """Store tokens under key, replacing any stored before
+
+        :param key: key of the tokens
+        :type key: str
+        :param access_token: access token to store
+        :type access_token: str
+        :param refresh_token: refresh token to store
+        :type refresh_token: str
+        """
+        ...
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        """Hold an exclusive lock on the tokens stored under key,
+        so that only one process at a time logs in or refreshes them.
+
+        Stores that cannot coordinate processes may leave this as a no-op.
+
+        :param key: key of the tokens
+        :type key: str
+        """
+        yield
+
+    def _get_async_lock(self, key: str) -> asyncio.Lock:
+        # Created lazily so that it binds to the running event loop
+        async_locks: Dict[str, asyncio.Lock] = self.__dict__.setdefault('_async_locks', dict())
+        if key not in async_locks:
+            async_locks[key] = asyncio.Lock()
+        return async_locks[key]
+
+    @asynccontextmanager
+    async def alock(self, key: str) -> AsyncIterator[None]:
+        """Same as lock(), but waits for the lock without blocking the running event loop.
+
+        The lock is acquired from the loop's default executor, by one task of this process at a time.
+
+        :param key: key of the tokens
+        :type key: str
+        """
+        async with self._get_async_lock(key):
+            lock = self.lock(key)
+            acquiring = asyncio.get_running_loop().run_in_executor(None, lock.__enter__)
+            try:
+                await asyncio.shield(acquiring)
+            except asyncio.CancelledError:
+                # The executor keeps waiting for the lock, which must be released once acquired
+                acquiring.add_done_callback(
+                    lambda f: f.cancelled() or f.exception() is not None or lock.__exit__(None, None, None)
+                )
+                raise
+            try:
+                yield
+            finally:
+                lock.__exit__(None, None, None)
+
+
+class KonanFileTokenStore(KonanBaseTokenStore):
+    """Stores tokens as JSON files in a directory, readable by the current user only.
+
+    Processes on the same host are coordinated using advisory file locks, where the platform supports them.
+    """
+    def __init__(self, directory: Optional[str] = None) -> None:
+        """Initialize a new KonanFileTokenStore
+
+        :param directory: directory to store the tokens in, defaults to None.
+            If left as None, defaults to ~/.cache/konan-sdk/tokens
+        :type directory: Optional[str], optional
+        """
+        self.directory = directory or os.path.join(os.path.expanduser('~'), '.cache', 'konan-sdk', 'tokens')
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+
+    def _path(self, key: str, extension: str) -> str:
+        return os.path.join(self.directory, f"{key}.{extension}")
+
+    def load(self, key: str) -> Optional[Tuple[str, str]]:
+        try:
+            with open(self._path(key, 'json')) as tokens_file:
+                tokens_dict = json.load(tokens_file)
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            logger.warning(f"Ignoring corrupted token store file {self._path(key, 'json')}")
+            return None
+
+        return tokens_dict['access'], tokens_dict['refresh']
+
+    def save(self, key: str, access_token: str, refresh_token: str) -> None:
+        # mkstemp creates the file readable by the current user only
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, prefix='.konan-tokens-')
+        try:
+            with os.fdopen(file_descriptor, 'w') as temporary_file:
+                json.dump({'access': access_token, 'refresh': refresh_token}, temporary_file)
+            os.replace(temporary_path, self._path(key, 'json'))
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        if fcntl is None:
+            yield
+            return
+
+        file_descriptor = os.open(self._path(key, 'lock'), os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(file_descriptor, fcntl.LOCK_EX)
+            yield
+        finally:
+            # Closing the file releases the lock
+            os.close(file_descriptor)
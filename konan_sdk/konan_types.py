@@ -1,7 +1,7 @@
 import datetime
 from enum import Enum
 from functools import total_ordering
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Union
 
 
 class KonanCredentials():
@@ -61,6 +61,199 @@ class KonanPrediction():
         self.feedback = feedback
 
 
+class KonanPredictionView():
+    """Read-only view of a single prediction within a KonanPredictionBatch.
+
+    Exposes the same attributes as a KonanPrediction, without copying them out of the batch.
+    """
+    __slots__ = ('_batch', '_index')
+
+    def __init__(self, batch: 'KonanPredictionBatch', index: int) -> None:
+        """ Initialize a new KonanPredictionView.
+
+        :param batch: Batch the prediction belongs to
+        :type batch: KonanPredictionBatch
+        :param index: Position of the prediction within the batch
+        :type index: int
+        """
+        self._batch = batch
+        self._index = index
+
+    def _get(self, column: Optional[List[Any]]) -> Any:
+        return column[self._index] if column is not None else None
+
+    @property
+    def uuid(self) -> Optional[str]:
+        return self._get(self._batch.uuids)
+
+    @property
+    def output(self) -> Optional[Dict[str, Any]]:
+        return self._get(self._batch.outputs)
+
+    @property
+    def features(self) -> Optional[Dict[str, Any]]:
+        return self._get(self._batch.features)
+
+    @property
+    def feedback(self) -> Optional[Union[str, Dict[str, Any], Any]]:
+        return self._get(self._batch.feedbacks)
+
+    def to_prediction(self) -> KonanPrediction:
+        """Copy the viewed prediction into a standalone KonanPrediction
+
+        :return: viewed prediction
+        :rtype: KonanPrediction
+        """
+        return KonanPrediction(self.uuid, self.output, features=self.features, feedback=self.feedback)
+
+
+class KonanPredictionBatch():
+    """Batch of predictions registered with the Konan API, stored column by column.
+
+    Holds one list per attribute instead of one object per prediction, which saves memory and garbage collection
+    time when handling many predictions. A column is None if its attribute was not retrieved.
+    Indexing or iterating over a batch returns lightweight KonanPredictionViews.
+    """
+    def __init__(
+        self,
+        uuids: Optional[List[str]],
+        outputs: Optional[List[Dict[str, Any]]],
+        features: Optional[List[Optional[Dict[str, Any]]]] = None,
+        feedbacks: Optional[List[Optional[Union[str, Dict[str, Any], Any]]]] = None,
+    ) -> None:
+        """ Initialize a new KonanPredictionBatch.
+
+        :param uuids: Predictions uuids
+        :type uuids: Optional[List[str]]
+        :param outputs: Live model outputs
+        :type outputs: Optional[List[Dict[str, Any]]]
+        :param features: features used to make the Predictions, defaults to None
+        :type features: Optional[List[Optional[Dict[str, Any]]]], optional
+        :param feedbacks: Feedbacks made on the Predictions, defaults to None
+        :type feedbacks: Optional[List[Optional[Union[str, Dict[str, Any], Any]]]], optional
+        """
+        self.uuids = uuids
+        self.outputs = outputs
+        self.features = features
+        self.feedbacks = feedbacks
+
+    @property
+    def columns(self) -> Dict[str, List[Any]]:
+        """Return the retrieved columns of the batch
+
+        :return: columns, keyed by the name of the KonanPrediction attribute they hold
+        :rtype: Dict[str, List[Any]]
+        """
+        return {
+            name: column for name, column in (
+                ('uuid', self.uuids),
+                ('output', self.outputs),
+                ('features', self.features),
+                ('feedback', self.feedbacks),
+            ) if column is not None
+        }
+
+    def __len__(self) -> int:
+        return max((len(column) for column in self.columns.values()), default=0)
+
+    def __getitem__(self, index: int) -> KonanPredictionView:
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("KonanPredictionBatch index out of range")
+        return KonanPredictionView(self, index)
+
+    def __iter__(self) -> Iterator[KonanPredictionView]:
+        return (KonanPredictionView(self, index) for index in range(len(self)))
+
+    def to_predictions(self) -> List[KonanPrediction]:
+        """Copy the batch into a list of standalone KonanPredictions
+
+        :return: predictions
+        :rtype: List[KonanPrediction]
+        """
+        return [view.to_prediction() for view in self]
+
+    def to_numpy(self, column: str) -> Any:
+        """Convert a column of the batch to a NumPy array. Requires the optional numpy package.
+
+        Values are not copied, only references to them.
+
+        :param column: name of the column, one of "uuid", "output", "features" and "feedback"
+        :type column: str
+        :return: numpy.ndarray of dtype object
+        :rtype: numpy.ndarray
+        """
+        try:
+            import numpy
+        except ImportError as e:
+            raise ImportError("KonanPredictionBatch.to_numpy() requires numpy. Install it using `pip install numpy`") from e
+
+        values = self.columns[column]
+        array = numpy.empty(len(values), dtype=object)
+        # Assign one by one, as slice assignment would broadcast values that are themselves sequences
+        for index, value in enumerate(values):
+            array[index] = value
+        return array
+
+    def to_pandas(self) -> Any:
+        """Convert the batch to a pandas DataFrame with one column per retrieved column.
+        Requires the optional pandas package.
+
+        Values are not copied, only references to them.
+
+        :return: pandas.DataFrame
+        :rtype: pandas.DataFrame
+        """
+        try:
+            import pandas
+        except ImportError as e:
+            raise ImportError(
+                "KonanPredictionBatch.to_pandas() requires pandas. Install it using `pip install pandas`"
+            ) from e
+
+        return pandas.DataFrame({
+            name: self.to_numpy(name) for name in self.columns
+        })
+
+
+class KonanBulkPredictionResult():
+    """Result of a single input of a bulk prediction, which is either a successful prediction or an error.
+    """
+    def __init__(
+        self,
+        index: int,
+        uuid: Optional[str] = None,
+        output: Optional[Dict[str, Any]] = None,
+        error: Optional[Exception] = None,
+    ) -> None:
+        """ Initialize a new KonanBulkPredictionResult.
+
+        :param index: Position of the input within the submitted inputs
+        :type index: int
+        :param uuid: Prediction uuid, defaults to None
+        :type uuid: Optional[str], optional
+        :param output: Live model output, defaults to None
+        :type output: Optional[Dict[str, Any]], optional
+        :param error: Error raised while making the prediction, defaults to None
+        :type error: Optional[Exception], optional
+        """
+        self.index = index
+        self.uuid = uuid
+        self.output = output
+        self.error = error
+
+    @property
+    def is_success(self) -> bool:
+        """Whether the prediction was made successfully
+
+        :return: True if no error was raised
+        :rtype: bool
+        """
+        return self.error is None
+
+
 class KonanDockerCredentials():
     """Credentials to use to authenticate with the Docker ContainerRegistry.
     """
@@ -323,6 +516,96 @@ class KonanTimeWindow():
         self.start_time = start_time
         self.end_time = end_time
 
+    def split(self, count: int) -> List['KonanTimeWindow']:
+        """Split the KonanTimeWindow into count consecutive sub-windows of (almost) equal duration.
+
+        Both ends of a KonanTimeWindow are inclusive, so every sub-window ends one microsecond
+        (the finest resolution of datetime) before the next one starts.
+        Every event of the KonanTimeWindow thus falls into exactly one sub-window.
+
+        :param count: number of sub-windows to split into
+        :type count: int
+        :return: sub-windows, in chronological order
+        :rtype: List[KonanTimeWindow]
+        """
+        if count < 1:
+            raise ValueError("count must be a positive integer")
+
+        resolution = datetime.timedelta(microseconds=1)
+        # Number of distinct instants within the window, split using integer arithmetic to avoid rounding errors
+        instants_count = (self.end_time - self.start_time) // resolution + 1
+        # Never produce empty sub-windows if the window is too short to be split count times
+        count = min(count, instants_count)
+
+        boundaries = [
+            self.start_time + resolution * (instants_count * i // count)
+            for i in range(count + 1)
+        ]
+        return [
+            KonanTimeWindow(boundaries[i], boundaries[i + 1] - resolution)
+            for i in range(count)
+        ]
+
+
+class KonanPredictionsCheckpoint():
+    """Progress of iterating over the predictions of a Konan Deployment, to resume iterating from.
+    """
+    def __init__(
+        self,
+        deployment_uuid: str,
+        time_window: KonanTimeWindow,
+        next_url: Optional[str] = None,
+        pages_count: int = 0,
+        predictions_count: int = 0,
+        last_prediction_uuid: Optional[str] = None,
+        updated_at: Optional[datetime.datetime] = None,
+    ) -> None:
+        """ Initialize a new KonanPredictionsCheckpoint.
+
+        :param deployment_uuid: UUID of the Konan Deployment whose predictions are iterated over
+        :type deployment_uuid: str
+        :param time_window: Time window of the predictions iterated over
+        :type time_window: KonanTimeWindow
+        :param next_url: URL of the next page to process, defaults to None.
+            None if no page was processed yet, or if all pages were processed
+        :type next_url: Optional[str], optional
+        :param pages_count: Number of pages processed, defaults to 0
+        :type pages_count: int, optional
+        :param predictions_count: Number of predictions processed, defaults to 0
+        :type predictions_count: int, optional
+        :param last_prediction_uuid: UUID of the last processed prediction, defaults to None
+        :type last_prediction_uuid: Optional[str], optional
+        :param updated_at: Date and time (UTC) at which the checkpoint was last updated, defaults to None
+        :type updated_at: Optional[datetime.datetime], optional
+        """
+        self.deployment_uuid = deployment_uuid
+        self.time_window = time_window
+        self.next_url = next_url
+        self.pages_count = pages_count
+        self.predictions_count = predictions_count
+        self.last_prediction_uuid = last_prediction_uuid
+        self.updated_at = updated_at
+
+    @property
+    def is_finished(self) -> bool:
+        """Whether all pages were processed
+
+        :return: True if at least one page was processed and none are left
+        :rtype: bool
+        """
+        return self.pages_count > 0 and self.next_url is None
+
+
+class KonanPredictionsExportFormat(Enum):
+    """Different file formats predictions can be exported to
+
+    :param Enum: [description]
+    :type Enum: [type]
+    """
+    Parquet = 'parquet'  #: Apache Parquet file
+    Arrow = 'arrow'  #: Apache Arrow IPC file (Feather V2)
+    NDJSON = 'ndjson'  #: Newline-delimited JSON file
+
 
 class KonanFeedbackSubmission():
     """Konan Feedback to send to the Konan API.
@@ -379,3 +662,60 @@ class KonanFeedbacksResult():
         self.success_count = success_count
         self.failure_count = failure_count
         self.total_count = total_count
+
+    @classmethod
+    def aggregate(cls, results: List['KonanFeedbacksResult']) -> 'KonanFeedbacksResult':
+        """Merge the results of several Feedbacks submissions into one.
+
+        :param results: results to merge
+        :type results: List[KonanFeedbacksResult]
+        :return: merged result, with the Feedbacks statuses in the order of results
+        :rtype: KonanFeedbacksResult
+        """
+        return cls(
+            [feedback_status for result in results for feedback_status in result.feedbacks_status],
+            sum(result.success_count for result in results),
+            sum(result.failure_count for result in results),
+            sum(result.total_count for result in results),
+        )
+
+
+class KonanCircuitState(Enum):
+    """Different states of a circuit breaker's circuit
+
+    :param Enum: [description]
+    :type Enum: [type]
+    """
+    Closed = 'closed'  #: Requests are sent, and their outcomes tracked
+    Open = 'open'  #: Requests fail fast without being sent, until the cooldown elapses
+    HalfOpen = 'half_open'  #: A limited number of trial requests are sent to decide whether to close the circuit
+
+
+class KonanCircuitStatus():
+    """Snapshot of a circuit breaker's circuit, e.g. for monitoring dashboards.
+    """
+    def __init__(
+        self, key: str,
+        state: KonanCircuitState,
+        failure_rate: float,
+        calls_count: int,
+        opened_at: Optional[datetime.datetime] = None,
+    ) -> None:
+        """Initialize a new KonanCircuitStatus
+
+        :param key: key of the circuit, e.g. a deployment uuid
+        :type key: str
+        :param state: state of the circuit
+        :type state: KonanCircuitState
+        :param failure_rate: rate of failed requests among the recent requests tracked
+        :type failure_rate: float
+        :param calls_count: number of recent requests tracked
+        :type calls_count: int
+        :param opened_at: last time the circuit opened, defaults to None
+        :type opened_at: Optional[datetime.datetime], optional
+        """
+        self.key = key
+        self.state = state
+        self.failure_rate = failure_rate
+        self.calls_count = calls_count
+        self.opened_at = opened_at
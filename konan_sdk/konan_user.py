@@ -48,6 +48,17 @@ class KonanUser:
 
         self.refresh_exp = refresh_token_payload['exp']
 
+    def update(self, user: 'KonanUser') -> None:
+        """Take the tokens and details of another user, in place
+
+        Endpoints hold on to the user they were created with, e.g. while paginating,
+        so renewed tokens must be set on that same user for them to be sent.
+
+        :param user: user holding the new tokens
+        :type user: KonanUser
+        """
+        self.__dict__.update(user.__dict__)
+
     def _is_token_valid(self, token_type: TokenType):
         now = timegm(datetime.utcnow().utctimetuple())
 
@@ -0,0 +1,217 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Union
+
+DEFAULT_PREDICTION_CACHE_MAX_BYTES = 64 * 1024 * 1024  #: Default maximum size of cached predictions, in bytes
+DEFAULT_PREDICTION_CACHE_TTL = 300.0  #: Default seconds a cached prediction stays valid
+
+# Rough size of an entry's bookkeeping (key, uuid, timestamps and containers), on top of its output
+_ENTRY_OVERHEAD_BYTES = 256
+
+
+def hash_prediction_input(input_data: Union[Dict, str], *scope: Optional[str]) -> str:
+    """Hash the input of a prediction, such that equal inputs in the same scope share a hash
+
+    :param input_data: data passed to the model
+    :type input_data: Union[Dict, str]
+    :param scope: strings scoping the hash, e.g. the uuid of the deployment making the prediction
+    :type scope: Optional[str]
+    :return: hex digest of the input
+    :rtype: str
+    """
+    # Canonical JSON, so that inputs differing only in key order share a hash
+    canonical_input = json.dumps(input_data, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(
+        '\n'.join([*(str(part) for part in scope), canonical_input]).encode()
+    ).hexdigest()
+
+
+class _KonanPredictionCacheEntry():
+    """Prediction cached by a KonanPredictionCache.
+    """
+    __slots__ = ('deployment_uuid', 'prediction_uuid', 'output', 'expires_at', 'size_bytes')
+
+    def __init__(
+        self, deployment_uuid: str, prediction_uuid: str, output: Dict,
+        expires_at: float, size_bytes: int,
+    ) -> None:
+        self.deployment_uuid = deployment_uuid
+        self.prediction_uuid = prediction_uuid
+        self.output = output
+        self.expires_at = expires_at
+        self.size_bytes = size_bytes
+
+
+class KonanPredictionCache():
+    """Thread-safe LRU cache of predictions, for deployments whose models are deterministic.
+
+    Predictions are keyed by a hash of their deployment, the deployment's live model, and their canonical input,
+    so switching the live model never serves predictions made by the previous one.
+    Entries expire after ttl seconds, and the least recently used ones are evicted
+    once the cache grows beyond max_bytes.
+
+    Cache hits return the uuid of the original prediction, and do not register a new prediction with Konan.
+    """
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_PREDICTION_CACHE_MAX_BYTES,
+        ttl: float = DEFAULT_PREDICTION_CACHE_TTL,
+        live_model_ttl: Optional[float] = None,
+    ) -> None:
+        """Initialize a new KonanPredictionCache
+
+        :param max_bytes: maximum approximate size of cached predictions, in bytes,
+            defaults to DEFAULT_PREDICTION_CACHE_MAX_BYTES
+        :type max_bytes: int, optional
+        :param ttl: seconds a cached prediction stays valid, defaults to DEFAULT_PREDICTION_CACHE_TTL
+        :type ttl: float, optional
+        :param live_model_ttl: seconds to remember the live model of a deployment for, defaults to None (ttl).
+            Bounds how long predictions of a live model switched by another client may still be served
+        :type live_model_ttl: Optional[float], optional
+        """
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be a positive integer")
+        if ttl <= 0:
+            raise ValueError("ttl must be a positive number")
+
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.live_model_ttl = live_model_ttl if live_model_ttl is not None else ttl
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size_bytes = 0
+
+        self._entries: "OrderedDict[str, _KonanPredictionCacheEntry]" = OrderedDict()
+        self._live_models: Dict[str, Tuple[str, float]] = dict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(deployment_uuid: str, live_model_uuid: str, input_data: Union[Dict, str]) -> str:
+        """Return the cache key of a prediction
+
+        :param deployment_uuid: uuid of the deployment making the prediction
+        :type deployment_uuid: str
+        :param live_model_uuid: uuid of the deployment's live model
+        :type live_model_uuid: str
+        :param input_data: data passed to the model
+        :type input_data: Union[Dict, str]
+        :return: cache key
+        :rtype: str
+        """
+        return hash_prediction_input(input_data, deployment_uuid, live_model_uuid)
+
+    def get(self, key: str) -> Optional[Tuple[str, Dict]]:
+        """Return the prediction cached under key, counting a hit or a miss
+
+        :param key: cache key, as returned by .key()
+        :type key: str
+        :return: (prediction uuid, prediction output), or None if no valid prediction is cached under key
+        :rtype: Optional[Tuple[str, Dict]]
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.prediction_uuid, entry.output
+
+    def put(self, key: str, deployment_uuid: str, prediction_uuid: str, output: Dict) -> None:
+        """Cache a prediction under key, evicting the least recently used ones if needed
+
+        :param key: cache key, as returned by .key()
+        :type key: str
+        :param deployment_uuid: uuid of the deployment that made the prediction
+        :type deployment_uuid: str
+        :param prediction_uuid: uuid of the prediction
+        :type prediction_uuid: str
+        :param output: output of the prediction
+        :type output: Dict
+        """
+        size_bytes = len(json.dumps(output)) + len(prediction_uuid) + _ENTRY_OVERHEAD_BYTES
+        if size_bytes > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _KonanPredictionCacheEntry(
+                deployment_uuid, prediction_uuid, output,
+                expires_at=time.monotonic() + self.ttl,
+                size_bytes=size_bytes,
+            )
+            self.size_bytes += size_bytes
+            while self.size_bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        self.size_bytes -= self._entries.pop(key).size_bytes
+
+    def get_live_model(self, deployment_uuid: str) -> Optional[str]:
+        """Return the remembered live model of a deployment
+
+        :param deployment_uuid: uuid of the deployment
+        :type deployment_uuid: str
+        :return: uuid of the live model, or None if not remembered or expired
+        :rtype: Optional[str]
+        """
+        with self._lock:
+            live_model = self._live_models.get(deployment_uuid)
+            if live_model is None or live_model[1] <= time.monotonic():
+                return None
+            return live_model[0]
+
+    def set_live_model(self, deployment_uuid: str, live_model_uuid: str) -> None:
+        """Remember the live model of a deployment for live_model_ttl seconds
+
+        :param deployment_uuid: uuid of the deployment
+        :type deployment_uuid: str
+        :param live_model_uuid: uuid of the live model
+        :type live_model_uuid: str
+        """
+        with self._lock:
+            self._live_models[deployment_uuid] = (live_model_uuid, time.monotonic() + self.live_model_ttl)
+
+    def invalidate(self, deployment_uuid: Optional[str] = None) -> None:
+        """Drop the cached predictions and live model of a deployment
+
+        :param deployment_uuid: uuid of the deployment, defaults to None (all deployments)
+        :type deployment_uuid: Optional[str], optional
+        """
+        with self._lock:
+            if deployment_uuid is None:
+                self._entries.clear()
+                self._live_models.clear()
+                self.size_bytes = 0
+                return
+
+            self._live_models.pop(deployment_uuid, None)
+            for key in [key for key, entry in self._entries.items() if entry.deployment_uuid == deployment_uuid]:
+                self._remove(key)
+
+    @property
+    def hit_rate(self) -> float:
+        """Returns the rate of lookups served from the cache
+
+        :return: hits over lookups, or 0 if there were none
+        :rtype: float
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._entries
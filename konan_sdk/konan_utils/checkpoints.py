@@ -0,0 +1,77 @@
+import datetime
+import json
+import os
+import tempfile
+from typing import Optional
+
+from konan_sdk.konan_types import KonanPredictionsCheckpoint, KonanTimeWindow
+
+
+def save_predictions_checkpoint(
+    path: str,
+    checkpoint: KonanPredictionsCheckpoint,
+) -> None:
+    """Persist checkpoint to a JSON file at path.
+
+    The file is replaced atomically, so a crash while saving never leaves a corrupted checkpoint behind.
+
+    :param path: path of the checkpoint file
+    :type path: str
+    :param checkpoint: checkpoint to persist
+    :type checkpoint: KonanPredictionsCheckpoint
+    """
+    checkpoint_dict = {
+        'deployment_uuid': checkpoint.deployment_uuid,
+        'start_time': checkpoint.time_window.start_time.isoformat(),
+        'end_time': checkpoint.time_window.end_time.isoformat(),
+        'next_url': checkpoint.next_url,
+        'pages_count': checkpoint.pages_count,
+        'predictions_count': checkpoint.predictions_count,
+        'last_prediction_uuid': checkpoint.last_prediction_uuid,
+        'updated_at': checkpoint.updated_at.isoformat() if checkpoint.updated_at else None,
+    }
+
+    directory = os.path.dirname(os.path.abspath(path))
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=directory, prefix='.konan-checkpoint-')
+    try:
+        with os.fdopen(file_descriptor, 'w') as temporary_file:
+            json.dump(checkpoint_dict, temporary_file)
+            temporary_file.flush()
+            os.fsync(temporary_file.fileno())
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+
+
+def load_predictions_checkpoint(
+    path: str,
+) -> Optional[KonanPredictionsCheckpoint]:
+    """Load a checkpoint persisted by save_predictions_checkpoint()
+
+    :param path: path of the checkpoint file
+    :type path: str
+    :return: loaded checkpoint, or None if no checkpoint file exists at path
+    :rtype: Optional[KonanPredictionsCheckpoint]
+    """
+    if not os.path.exists(path):
+        return None
+
+    with open(path) as checkpoint_file:
+        checkpoint_dict = json.load(checkpoint_file)
+
+    return KonanPredictionsCheckpoint(
+        deployment_uuid=checkpoint_dict['deployment_uuid'],
+        time_window=KonanTimeWindow(
+            datetime.datetime.fromisoformat(checkpoint_dict['start_time']),
+            datetime.datetime.fromisoformat(checkpoint_dict['end_time']),
+        ),
+        next_url=checkpoint_dict['next_url'],
+        pages_count=checkpoint_dict['pages_count'],
+        predictions_count=checkpoint_dict['predictions_count'],
+        last_prediction_uuid=checkpoint_dict['last_prediction_uuid'],
+        updated_at=(
+            datetime.datetime.fromisoformat(checkpoint_dict['updated_at'])
+            if checkpoint_dict['updated_at'] else None
+        ),
+    )
@@ -0,0 +1,261 @@
+import asyncio
+import concurrent.futures
+import queue
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (
+    Any, Awaitable, Callable, Deque, Dict, Generator, Iterable, Iterator, List, Optional, Tuple, TypeVar,
+)
+
+from konan_sdk.endpoints.deadlines import KonanDeadline
+from konan_sdk.konan_exceptions import KonanDeadlineExceededError
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+def map_concurrently(
+    function: Callable[[T], R],
+    items: Iterable[T],
+    max_concurrency: int,
+    ordered: bool = True,
+) -> Generator[Tuple[int, "Future[R]"], None, None]:
+    """Lazily call function on every item using a pool of threads,
+    keeping at most max_concurrency calls in flight at any time.
+
+    items is consumed only as fast as calls complete, so arbitrarily large iterables use bounded memory.
+    Calls that raise do not stop the others; their exceptions are available on the yielded futures.
+
+    :param function: function to call on every item
+    :type function: Callable[[T], R]
+    :param items: items to call function on
+    :type items: Iterable[T]
+    :param max_concurrency: maximum number of calls in flight
+    :type max_concurrency: int
+    :param ordered: whether to yield futures in the order of items, defaults to True.
+        If False, futures are yielded as soon as they complete
+    :type ordered: bool, optional
+    :return: generator of (index of item, completed future of the call)
+    :rtype: Generator[Tuple[int, Future[R]], None, None]
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be a positive integer")
+
+    executor = ThreadPoolExecutor(max_workers=max_concurrency)
+    in_order: Deque[Tuple[int, Future]] = deque()
+    in_flight: Dict[Future, int] = dict()
+
+    def _complete() -> Generator[Tuple[int, Future], None, None]:
+        # Wait for the oldest call if ordered, for any call otherwise
+        if ordered:
+            index, future = in_order.popleft()
+            wait([future])
+            del in_flight[future]
+            yield index, future
+        else:
+            done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+            for future in done:
+                yield in_flight.pop(future), future
+
+    try:
+        for index, item in enumerate(items):
+            while len(in_flight) >= max_concurrency:
+                yield from _complete()
+            future = executor.submit(function, item)
+            in_flight[future] = index
+            if ordered:
+                in_order.append((index, future))
+        while in_flight:
+            yield from _complete()
+    finally:
+        # Only reached early if the caller stopped iterating, so drop whatever did not start yet
+        for future in in_flight:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+class _GeneratorEnd():
+    """Marks that a generator consumed by merge_generators() is exhausted, or raised error.
+    """
+    def __init__(self, source: int, error: Optional[BaseException] = None) -> None:
+        self.source = source
+        self.error = error
+
+
+def merge_generators(
+    generators: List[Iterator[T]],
+    ordered: bool = True,
+    buffer_size: int = 1,
+) -> Generator[T, None, None]:
+    """Consume generators in parallel, one thread each, and merge their items into a single generator.
+
+    Each generator may run at most buffer_size items ahead of the caller, which bounds memory.
+
+    :param generators: generators to consume
+    :type generators: List[Iterator[T]]
+    :param ordered: whether to yield all items of a generator before those of the next, defaults to True.
+        If False, items are yielded as soon as any generator produces them
+    :type ordered: bool, optional
+    :param buffer_size: maximum number of items buffered per generator, defaults to 1
+    :type buffer_size: int, optional
+    :return: generator of the merged items
+    :rtype: Generator[T, None, None]
+    """
+    if buffer_size < 1:
+        raise ValueError("buffer_size must be a positive integer")
+
+    stop = threading.Event()
+    if ordered:
+        queues = [queue.Queue(maxsize=buffer_size) for _ in generators]
+    else:
+        shared_queue = queue.Queue(maxsize=buffer_size * len(generators))
+        queues = [shared_queue for _ in generators]
+
+    def _put(item_queue: queue.Queue, item: Any) -> bool:
+        # Give up once the caller stops iterating, instead of blocking on a full queue forever
+        while not stop.is_set():
+            try:
+                item_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _consume(source: int, generator: Iterator[T]) -> None:
+        try:
+            for item in generator:
+                if not _put(queues[source], item):
+                    return
+        except BaseException as e:
+            _put(queues[source], _GeneratorEnd(source, error=e))
+        else:
+            _put(queues[source], _GeneratorEnd(source))
+
+    threads = [
+        threading.Thread(target=_consume, args=(source, generator), daemon=True)
+        for source, generator in enumerate(generators)
+    ]
+    for thread in threads:
+        thread.start()
+
+    try:
+        remaining = len(generators)
+        source = 0
+        while remaining:
+            item = queues[source].get()
+            if isinstance(item, _GeneratorEnd):
+                if item.error is not None:
+                    raise item.error
+                remaining -= 1
+                source += 1 if ordered else 0
+                continue
+            yield item
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+
+def prefetch_generator(
+    generator: Iterator[T],
+    prefetch: int,
+) -> Generator[T, None, None]:
+    """Consume generator in a background thread, running at most prefetch items ahead of the caller.
+
+    Useful to overlap producing items (e.g. fetching them over the network) with processing them.
+
+    :param generator: generator to consume
+    :type generator: Iterator[T]
+    :param prefetch: maximum number of items to produce ahead of the caller
+    :type prefetch: int
+    :return: generator of the same items
+    :rtype: Generator[T, None, None]
+    """
+    return merge_generators([generator], buffer_size=prefetch)
+
+
+class KonanSingleFlight():
+    """Coalesces concurrent calls sharing a key into a single call, whose result or error they all share.
+
+    The first caller of a key makes the call, and callers of the same key arriving while it is in flight
+    wait for it instead of making their own. Blocking and asyncio callers are coalesced separately.
+    """
+    def __init__(self) -> None:
+        self.coalesced_count = 0
+
+        self._calls: Dict[str, Future] = dict()
+        self._async_calls: Dict[str, "asyncio.Future"] = dict()
+        self._lock = threading.Lock()
+
+    def call(self, key: str, function: Callable[[], R], deadline: Optional[KonanDeadline] = None) -> R:
+        """Call function, unless a call of key is already in flight, in which case wait for its result
+
+        :param key: key of the call
+        :type key: str
+        :param function: function making the call
+        :type function: Callable[[], R]
+        :param deadline: deadline to stop waiting for a call in flight by, defaults to None (no deadline)
+        :type deadline: Optional[KonanDeadline], optional
+        :raises KonanDeadlineExceededError: if deadline passes while waiting for a call in flight
+        :return: result of the call
+        :rtype: R
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = self._calls[key] = Future()
+            else:
+                self.coalesced_count += 1
+
+        if not is_leader:
+            try:
+                return future.result(timeout=deadline.remaining() if deadline is not None else None)
+            except concurrent.futures.TimeoutError:
+                raise KonanDeadlineExceededError(deadline.seconds) from None
+
+        try:
+            result = function()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    async def acall(
+        self, key: str, function: Callable[[], Awaitable[R]], deadline: Optional[KonanDeadline] = None,
+    ) -> R:
+        """Asyncio counterpart of .call()
+
+        The call runs as a task of its own, so that it completes for the callers still waiting for it
+        even if the caller that started it is cancelled.
+
+        :param key: key of the call
+        :type key: str
+        :param function: coroutine function making the call
+        :type function: Callable[[], Awaitable[R]]
+        :param deadline: deadline to stop waiting for a call in flight by, defaults to None (no deadline)
+        :type deadline: Optional[KonanDeadline], optional
+        :raises KonanDeadlineExceededError: if deadline passes while waiting for a call in flight
+        :return: result of the call
+        :rtype: R
+        """
+        task = self._async_calls.get(key)
+        if task is None:
+            task = self._async_calls[key] = asyncio.ensure_future(function())
+            task.add_done_callback(lambda _: self._async_calls.pop(key, None))
+            return await asyncio.shield(task)
+
+        self.coalesced_count += 1
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(task),
+                timeout=deadline.remaining() if deadline is not None else None,
+            )
+        except asyncio.TimeoutError:
+            raise KonanDeadlineExceededError(deadline.seconds) from None
@@ -0,0 +1,339 @@
+import json
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from typing import Any, Dict, IO, List, Optional, Set, Tuple, Union
+
+from konan_sdk.konan_types import (
+    KonanPrediction,
+    KonanPredictionBatch,
+    KonanPredictionView,
+    KonanPredictionsExportFormat,
+)
+
+_PREDICTION_COLUMNS = ['uuid', 'output', 'features', 'feedback']
+_FLATTENED_COLUMNS = ('output', 'features')
+
+
+def _prediction_to_row(prediction: Union[KonanPrediction, KonanPredictionView], flatten: bool) -> Dict[str, Any]:
+    """Convert a KonanPrediction to a row, optionally flattening its output and features into one column per key
+
+    :param prediction: prediction to convert
+    :type prediction: Union[KonanPrediction, KonanPredictionView]
+    :param flatten: whether to flatten output and features
+    :type flatten: bool
+    :return: row of the prediction
+    :rtype: Dict[str, Any]
+    """
+    row = {column: getattr(prediction, column) for column in _PREDICTION_COLUMNS}
+    if flatten:
+        for column in _FLATTENED_COLUMNS:
+            if isinstance(row[column], dict):
+                for key, value in row.pop(column).items():
+                    row[f"{column}.{key}"] = value
+    return row
+
+
+def _get_columns(predictions: Union[List[KonanPrediction], KonanPredictionBatch]) -> Dict[str, List[Any]]:
+    """Return the values of every prediction attribute, column by column
+
+    Batches are already stored column by column, so only lists of predictions are gone through one by one.
+    Columns that were not retrieved are filled with None.
+
+    :param predictions: predictions to return the columns of
+    :type predictions: Union[List[KonanPrediction], KonanPredictionBatch]
+    :return: values of every attribute, keyed by attribute name
+    :rtype: Dict[str, List[Any]]
+    """
+    if isinstance(predictions, KonanPredictionBatch):
+        columns = predictions.columns
+        return {column: columns.get(column) or [None] * len(predictions) for column in _PREDICTION_COLUMNS}
+    return {
+        column: [getattr(prediction, column) for prediction in predictions]
+        for column in _PREDICTION_COLUMNS
+    }
+
+
+def _to_json(value: Any) -> Optional[str]:
+    return json.dumps(value) if value is not None else None
+
+
+class KonanBasePredictionsWriter(ABC):
+    """Base class for writers that stream pages of KonanPredictions to a file.
+    """
+    def __init__(self, path: str, flatten: bool = False) -> None:
+        """Initialize a new KonanBasePredictionsWriter
+
+        :param path: path of the file to write to
+        :type path: str
+        :param flatten: whether to write every key of the predictions' output and features
+            to its own column (named e.g. "output.<key>"), defaults to False
+        :type flatten: bool, optional
+        """
+        self.path = path
+        self.flatten = flatten
+        self.predictions_count = 0
+
+    @abstractmethod
+    def write_page(self, predictions: Union[List[KonanPrediction], KonanPredictionBatch]) -> None:
+        """Write a page of predictions
+
+        :param predictions: predictions to write
+        :type predictions: Union[List[KonanPrediction], KonanPredictionBatch]
+        """
+        ...
+
+    @abstractmethod
+    def close(self) -> None:
+        """Flush and close the file written to
+        """
+        ...
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class KonanNDJSONPredictionsWriter(KonanBasePredictionsWriter):
+    """Writes predictions as newline-delimited JSON, one prediction per line.
+    """
+    def __init__(self, path: str, flatten: bool = False) -> None:
+        super().__init__(path, flatten=flatten)
+        self._file: IO[str] = open(path, 'w')
+
+    def write_page(self, predictions: Union[List[KonanPrediction], KonanPredictionBatch]) -> None:
+        self._file.writelines(
+            json.dumps(_prediction_to_row(prediction, self.flatten)) + '\n'
+            for prediction in predictions
+        )
+        self.predictions_count += len(predictions)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class KonanArrowPredictionsWriter(KonanBasePredictionsWriter):
+    """Writes predictions as record batches of a Parquet file or an Arrow IPC file.
+
+    Requires the optional pyarrow package.
+    Output, features and feedback are written as JSON strings, since their types may vary from one prediction
+    to the next, and a file's schema is fixed once its first record batch is written.
+
+    If flattened, every key of output and features is written to its own column, typed as inferred from its values:
+    booleans, integers, floats or strings. Keys holding values of several types, or nested values, are written as
+    JSON strings, and columns holding integers and floats as floats. Since later pages may add keys or change types,
+    pages are spilled to temporary Arrow files next to path, and only written once the file is closed, under the
+    schema of all pages, with null values where a page has no value for a column.
+    """
+    def __init__(
+        self, path: str,
+        flatten: bool = False,
+        export_format: KonanPredictionsExportFormat = KonanPredictionsExportFormat.Parquet,
+    ) -> None:
+        """Initialize a new KonanArrowPredictionsWriter
+
+        :param path: path of the file to write to
+        :type path: str
+        :param flatten: whether to write every key of the predictions' output and features
+            to its own column (named e.g. "output.<key>"), defaults to False
+        :type flatten: bool, optional
+        :param export_format: format of the file, defaults to KonanPredictionsExportFormat.Parquet
+        :type export_format: KonanPredictionsExportFormat, optional
+        """
+        try:
+            import pyarrow
+        except ImportError as e:
+            raise ImportError(
+                f"Exporting predictions to {export_format.value} requires the pyarrow package."
+                " Install it using `pip install pyarrow`"
+            ) from e
+
+        super().__init__(path, flatten=flatten)
+        self.export_format = export_format
+        self._pyarrow = pyarrow
+        self._schema: Optional[Any] = None
+        self._writer: Optional[Any] = None
+
+        # Flattened pages waiting to be written, with the names of their columns holding JSON strings
+        self._spill_directory: Optional[tempfile.TemporaryDirectory] = None
+        self._spilled_pages: List[Tuple[str, Set[str]]] = []
+
+    def _get_column_names(self, columns: Dict[str, List[Any]]) -> List[str]:
+        if not self.flatten:
+            return list(_PREDICTION_COLUMNS)
+
+        names = ['uuid']
+        for column in _PREDICTION_COLUMNS[1:]:
+            values = columns[column]
+            if column in _FLATTENED_COLUMNS:
+                # Values that are not dicts, if any, stay in the column itself
+                if not all(isinstance(value, dict) for value in values):
+                    names.append(column)
+                names.extend(dict.fromkeys(
+                    f"{column}.{key}" for value in values if isinstance(value, dict) for key in value
+                ))
+            else:
+                names.append(column)
+        return names
+
+    def _get_json_array(self, values: List[Any]) -> Any:
+        return self._pyarrow.array([_to_json(value) for value in values], type=self._pyarrow.string())
+
+    def _infer_array(self, values: List[Any]) -> Optional[Any]:
+        # Typed array of values, or None if they are nested or of several types
+        try:
+            array = self._pyarrow.array(values)
+        except (self._pyarrow.ArrowInvalid, self._pyarrow.ArrowTypeError):
+            return None
+        array_type = array.type
+        types = self._pyarrow.types
+        if (
+            types.is_null(array_type) or types.is_boolean(array_type) or types.is_integer(array_type)
+            or types.is_floating(array_type) or types.is_string(array_type)
+        ):
+            return array
+        return None
+
+    def _get_array(self, name: str, columns: Dict[str, List[Any]]) -> Tuple[Any, bool]:
+        # Returns the array of column name, and whether it holds JSON strings
+        column, _, key = name.partition('.')
+        values = columns[column]
+        if column == 'uuid':
+            return self._pyarrow.array(values, type=self._pyarrow.string()), False
+        if key:
+            values = [value.get(key) if isinstance(value, dict) else None for value in values]
+            array = self._infer_array(values)
+            if array is not None:
+                return array, False
+            return self._get_json_array(values), True
+        if self.flatten and column in _FLATTENED_COLUMNS:
+            return self._get_json_array([None if isinstance(value, dict) else value for value in values]), True
+        return self._get_json_array(values), True
+
+    def _create_schema(self, names: List[str]) -> Any:
+        return self._pyarrow.schema([(name, self._pyarrow.string()) for name in names])
+
+    def _open(self, schema: Any) -> Any:
+        if self.export_format == KonanPredictionsExportFormat.Parquet:
+            import pyarrow.parquet
+
+            return pyarrow.parquet.ParquetWriter(self.path, schema)
+        return self._pyarrow.ipc.new_file(self.path, schema)
+
+    def _spill_page(self, columns: Dict[str, List[Any]]) -> None:
+        if self._spill_directory is None:
+            self._spill_directory = tempfile.TemporaryDirectory(
+                prefix='.konan-export-', dir=os.path.dirname(os.path.abspath(self.path)),
+            )
+
+        names = self._get_column_names(columns)
+        arrays, json_names = [], set()
+        for name in names:
+            array, is_json = self._get_array(name, columns)
+            arrays.append(array)
+            if is_json:
+                json_names.add(name)
+        page = self._pyarrow.Table.from_arrays(arrays, names=names)
+
+        page_path = os.path.join(self._spill_directory.name, f"{len(self._spilled_pages)}.arrow")
+        with self._pyarrow.ipc.new_file(page_path, page.schema) as page_writer:
+            page_writer.write_table(page)
+        self._spilled_pages.append((page_path, json_names))
+
+    def _get_spilled_schema(self) -> Tuple[Any, Set[str]]:
+        # Schema of all spilled pages, and the names of its columns holding JSON strings
+        page_types: Dict[str, List[Any]] = dict()
+        json_names: Set[str] = set()
+        for page_path, page_json_names in self._spilled_pages:
+            json_names.update(page_json_names)
+            for field in self._pyarrow.ipc.open_file(page_path).schema:
+                page_types.setdefault(field.name, []).append(field.type)
+
+        # Flattened columns follow the column they were flattened from, in order of first appearance
+        names = sorted(page_types, key=lambda name: (_PREDICTION_COLUMNS.index(name.partition('.')[0]), '.' in name))
+        fields = []
+        for name in names:
+            types = set(page_type for page_type in page_types[name] if not self._pyarrow.types.is_null(page_type))
+            if name not in json_names and len(types) > 1 and all(
+                self._pyarrow.types.is_integer(page_type) or self._pyarrow.types.is_floating(page_type)
+                for page_type in types
+            ):
+                types = {self._pyarrow.float64()}
+            if name in json_names or len(types) != 1:
+                json_names.add(name)
+                fields.append((name, self._pyarrow.string()))
+            else:
+                fields.append((name, types.pop()))
+        return self._pyarrow.schema(fields), json_names
+
+    def _write_spilled_pages(self) -> None:
+        self._schema, json_names = self._get_spilled_schema()
+        self._writer = self._open(self._schema)
+        for page_path, page_json_names in self._spilled_pages:
+            page = self._pyarrow.ipc.open_file(self._pyarrow.memory_map(page_path)).read_all()
+            arrays = []
+            for field in self._schema:
+                if field.name not in page.column_names:
+                    arrays.append(self._pyarrow.nulls(page.num_rows, type=field.type))
+                    continue
+                array = page.column(field.name)
+                if field.name in json_names and field.name not in page_json_names:
+                    # Typed on this page, but not on others
+                    array = self._get_json_array(array.to_pylist())
+                arrays.append(array.cast(field.type))
+            self._writer.write_table(self._pyarrow.Table.from_arrays(arrays, schema=self._schema))
+            os.remove(page_path)
+
+    def write_page(self, predictions: Union[List[KonanPrediction], KonanPredictionBatch]) -> None:
+        if not predictions:
+            return
+
+        columns = _get_columns(predictions)
+        if self.flatten:
+            self._spill_page(columns)
+        else:
+            if self._writer is None:
+                self._schema = self._create_schema(self._get_column_names(columns))
+                self._writer = self._open(self._schema)
+            self._writer.write_batch(self._pyarrow.RecordBatch.from_arrays(
+                [self._get_array(name, columns)[0] for name in self._schema.names],
+                schema=self._schema,
+            ))
+        self.predictions_count += len(predictions)
+
+    def close(self) -> None:
+        try:
+            if self._spilled_pages:
+                self._write_spilled_pages()
+            elif self._writer is None:
+                # Nothing was written, but still leave a valid empty file behind
+                self._schema = self._create_schema(list(_PREDICTION_COLUMNS))
+                self._writer = self._open(self._schema)
+            self._writer.close()
+        finally:
+            if self._spill_directory is not None:
+                self._spill_directory.cleanup()
+
+
+def create_predictions_writer(
+    path: str,
+    export_format: KonanPredictionsExportFormat,
+    flatten: bool = False,
+) -> KonanBasePredictionsWriter:
+    """Create the writer of the given export format
+
+    :param path: path of the file to write to
+    :type path: str
+    :param export_format: format of the file
+    :type export_format: KonanPredictionsExportFormat
+    :param flatten: whether to write every key of the predictions' output and features
+        to its own column, defaults to False
+    :type flatten: bool, optional
+    :return: predictions writer
+    :rtype: KonanBasePredictionsWriter
+    """
+    if export_format == KonanPredictionsExportFormat.NDJSON:
+        return KonanNDJSONPredictionsWriter(path, flatten=flatten)
+    return KonanArrowPredictionsWriter(path, flatten=flatten, export_format=export_format)
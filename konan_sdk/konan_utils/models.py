@@ -1,10 +1,14 @@
-from typing import List
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from konan_sdk.konan_types import (
     KonanModel,
     KonanModelState,
 )
 
+DEFAULT_MODEL_REGISTRY_TTL = 60.0  #: Default seconds the models of a deployment stay cached
+
 
 def find_model_state(
     model_uuid: str,
@@ -41,3 +45,195 @@ def find_live_model(
         if model.state == KonanModelState.Live:
             return model.uuid
     return None
+
+
+class KonanModelIndex():
+    """Snapshot of the models of a deployment, indexed by uuid and by state.
+    """
+    def __init__(self, models: Iterable[KonanModel]) -> None:
+        """Initialize a new KonanModelIndex
+
+        :param models: models of the deployment
+        :type models: Iterable[KonanModel]
+        """
+        self._models_by_uuid: Dict[str, KonanModel] = {model.uuid: model for model in models}
+        self._models_by_state: Dict[KonanModelState, List[KonanModel]] = dict()
+        for model in self._models_by_uuid.values():
+            self._models_by_state.setdefault(model.state, []).append(model)
+
+    @property
+    def models(self) -> List[KonanModel]:
+        """Returns all models of the deployment
+
+        :return: models of the deployment
+        :rtype: List[KonanModel]
+        """
+        return list(self._models_by_uuid.values())
+
+    def get_model(self, model_uuid: str) -> Optional[KonanModel]:
+        """Return a model given its UUID
+
+        :param model_uuid: UUID of the model
+        :type model_uuid: str
+        :return: model, or None if not a model of the deployment
+        :rtype: Optional[KonanModel]
+        """
+        return self._models_by_uuid.get(model_uuid)
+
+    def get_model_state(self, model_uuid: str) -> Optional[KonanModelState]:
+        """Return the state of a model given its UUID
+
+        :param model_uuid: UUID of the model
+        :type model_uuid: str
+        :return: state of the model, or None if not a model of the deployment
+        :rtype: Optional[KonanModelState]
+        """
+        model = self._models_by_uuid.get(model_uuid)
+        return model.state if model is not None else None
+
+    def get_models_in_state(self, state: KonanModelState) -> List[KonanModel]:
+        """Return the models in a given state
+
+        :param state: state of the models
+        :type state: KonanModelState
+        :return: models in state
+        :rtype: List[KonanModel]
+        """
+        return list(self._models_by_state.get(state, []))
+
+    @property
+    def live_model_uuid(self) -> Optional[str]:
+        """Returns the UUID of the live model, assuming that only 1 Model is live
+
+        :return: live_model_uuid, or None if no model is live
+        :rtype: Optional[str]
+        """
+        live_models = self._models_by_state.get(KonanModelState.Live)
+        return live_models[0].uuid if live_models else None
+
+
+class KonanModelRegistry():
+    """Thread-safe cache of the models of each deployment, indexed by uuid and by state.
+
+    The models of a deployment are cached for ttl seconds after being listed,
+    and kept up to date in the meantime with the models created, switched and deleted through the SDK.
+    Changes made by other clients are only picked up once the deployment's models expire,
+    or after invalidating them explicitly.
+    """
+    def __init__(self, ttl: float = DEFAULT_MODEL_REGISTRY_TTL) -> None:
+        """Initialize a new KonanModelRegistry
+
+        :param ttl: seconds the models of a deployment stay cached, defaults to DEFAULT_MODEL_REGISTRY_TTL
+        :type ttl: float, optional
+        """
+        if ttl <= 0:
+            raise ValueError("ttl must be a positive number")
+
+        self.ttl = ttl
+
+        self.hits = 0
+        self.misses = 0
+
+        # Indexes are never modified in place, but replaced, so that callers can read them without locking
+        self._indexes: Dict[str, Tuple[KonanModelIndex, float]] = dict()
+        self._lock = threading.Lock()
+
+    def get(self, deployment_uuid: str) -> Optional[KonanModelIndex]:
+        """Return the cached models of a deployment, counting a hit or a miss
+
+        :param deployment_uuid: uuid of the deployment
+        :type deployment_uuid: str
+        :return: models of the deployment, or None if not cached or expired
+        :rtype: Optional[KonanModelIndex]
+        """
+        with self._lock:
+            index = self._get_index(deployment_uuid)
+            if index is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return index
+
+    def _get_index(self, deployment_uuid: str) -> Optional[KonanModelIndex]:
+        index_expiry = self._indexes.get(deployment_uuid)
+        if index_expiry is None:
+            return None
+        if index_expiry[1] <= time.monotonic():
+            del self._indexes[deployment_uuid]
+            return None
+        return index_expiry[0]
+
+    def _replace_index(self, deployment_uuid: str, models: Iterable[KonanModel]) -> None:
+        # Keeps the expiry of the listing the deployment's models were cached from
+        self._indexes[deployment_uuid] = (KonanModelIndex(models), self._indexes[deployment_uuid][1])
+
+    def set(self, deployment_uuid: str, models: Iterable[KonanModel]) -> KonanModelIndex:
+        """Cache the models of a deployment for ttl seconds
+
+        :param deployment_uuid: uuid of the deployment
+        :type deployment_uuid: str
+        :param models: all models of the deployment
+        :type models: Iterable[KonanModel]
+        :return: models of the deployment
+        :rtype: KonanModelIndex
+        """
+        index = KonanModelIndex(models)
+        with self._lock:
+            self._indexes[deployment_uuid] = (index, time.monotonic() + self.ttl)
+        return index
+
+    def add_model(self, deployment_uuid: str, model: KonanModel) -> None:
+        """Add a newly created model to the cached models of its deployment, if cached
+
+        :param deployment_uuid: uuid of the deployment
+        :type deployment_uuid: str
+        :param model: created model
+        :type model: KonanModel
+        """
+        with self._lock:
+            index = self._get_index(deployment_uuid)
+            if index is not None:
+                self._replace_index(deployment_uuid, index.models + [model])
+
+    def set_model_states(self, deployment_uuid: str, states: Dict[str, KonanModelState]) -> None:
+        """Update the states of switched models of a deployment, if cached
+
+        :param deployment_uuid: uuid of the deployment
+        :type deployment_uuid: str
+        :param states: new states, keyed by model UUID
+        :type states: Dict[str, KonanModelState]
+        """
+        with self._lock:
+            index = self._get_index(deployment_uuid)
+            if index is not None:
+                self._replace_index(deployment_uuid, [
+                    KonanModel(model.uuid, model.name, model.created_at, states[model.uuid])
+                    if model.uuid in states else model
+                    for model in index.models
+                ])
+
+    def remove_model(self, model_uuid: str) -> None:
+        """Remove a deleted model from the cached models of its deployment
+
+        :param model_uuid: UUID of the deleted model
+        :type model_uuid: str
+        """
+        with self._lock:
+            for deployment_uuid, (index, _) in list(self._indexes.items()):
+                if index.get_model(model_uuid) is not None:
+                    self._replace_index(
+                        deployment_uuid,
+                        [model for model in index.models if model.uuid != model_uuid],
+                    )
+
+    def invalidate(self, deployment_uuid: Optional[str] = None) -> None:
+        """Drop the cached models of a deployment
+
+        :param deployment_uuid: uuid of the deployment, defaults to None (all deployments)
+        :type deployment_uuid: Optional[str], optional
+        """
+        with self._lock:
+            if deployment_uuid is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(deployment_uuid, None)
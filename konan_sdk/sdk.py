@@ -1,10 +1,11 @@
 import datetime
-import sys
+import itertools
 import deprecated
 from loguru import logger
 from typing import (
     Dict,
     Generator,
+    Iterable,
     List,
     Optional,
     Tuple,
@@ -14,6 +15,9 @@ from typing import (
 from requests import HTTPError
 
 from konan_sdk.auth import KonanAPIKeyAuth, KonanAuth
+from konan_sdk.base_sdk import _AbstractKonanSDK
+from konan_sdk.endpoints.circuit_breakers import KonanCircuitBreaker
+from konan_sdk.endpoints.deadlines import KonanDeadline, KonanDeadlineLike
 from konan_sdk.endpoints.deployments import (
     CreateDeploymentEndpoint,
     CreateProjectEndpoint,
@@ -29,16 +33,27 @@ from konan_sdk.endpoints.models import (
 )
 from konan_sdk.endpoints.predictions import (
     FeedbackEndpoint,
-    GetPaginatedPredictionsEndpoint,
     PredictionEndpoint,
 )
+from konan_sdk.endpoints.rate_limiters import KonanRateLimiter
+from konan_sdk.endpoints.retries import KonanRetryPolicy
+from konan_sdk.endpoints.transports import (
+    DEFAULT_POOL_MAXSIZE,
+    DEFAULT_TIMEOUT,
+    KonanBaseTransport,
+    KonanSessionTransport,
+    KonanTimeout,
+)
 from konan_sdk.konan_metrics import KonanBaseMetric
+from konan_sdk.konan_token_stores import KonanBaseTokenStore
 from konan_sdk.konan_types import (
+    KonanBulkPredictionResult,
     KonanDeployment,
     KonanDeploymentCreationRequest,
     KonanDeploymentCreationResponse,
     KonanDockerCredentials,
     KonanDockerImage,
+    KonanFeedbackStatus,
     KonanFeedbackSubmission,
     KonanFeedbacksResult,
     KonanLiveModelSwitchState,
@@ -46,37 +61,103 @@ from konan_sdk.konan_types import (
     KonanModelCreationRequest,
     KonanModelState,
     KonanPrediction,
+    KonanPredictionBatch,
+    KonanPredictionsCheckpoint,
+    KonanPredictionsExportFormat,
     KonanProjectCreationRequest,
     KonanTimeWindow,
 )
-from konan_sdk.konan_utils.models import (
-    find_live_model,
-    find_model_state,
+from konan_sdk.konan_utils.checkpoints import (
+    load_predictions_checkpoint,
+    save_predictions_checkpoint,
 )
+from konan_sdk.konan_utils.concurrency import KonanSingleFlight, map_concurrently, merge_generators
+from konan_sdk.konan_utils.caches import KonanPredictionCache
+from konan_sdk.konan_utils.exports import create_predictions_writer
+from konan_sdk.konan_utils.models import KonanModelIndex, KonanModelRegistry
 
 
-class KonanSDK:
+class KonanSDK(_AbstractKonanSDK):
     """konan-sdk's main class for API integration.
     """
     def __init__(
         self, auth_url="https://auth.konan.ai", api_url="https://api.konan.ai",
-        verbose=False
+        verbose=False,
+        transport: Optional[KonanBaseTransport] = None,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        timeout: Optional[KonanTimeout] = DEFAULT_TIMEOUT,
+        retry_policy: Optional[KonanRetryPolicy] = None,
+        circuit_breaker: Optional[KonanCircuitBreaker] = None,
+        rate_limiter: Optional[KonanRateLimiter] = None,
+        prediction_cache: Optional[KonanPredictionCache] = None,
+        single_flight: Optional[KonanSingleFlight] = None,
+        model_registry: Optional[KonanModelRegistry] = None,
     ):
-        self.auth_url = auth_url
-        self.api_url = api_url
-
-        self.auth: Optional[KonanAuth] = None
-
-        if not verbose:
-            logger.remove()
-            logger.add(sys.stderr, level="INFO")
+        """Initialize a new KonanSDK
+
+        :param auth_url: base URL of the Konan authentication API, defaults to "https://auth.konan.ai"
+        :type auth_url: str, optional
+        :param api_url: base URL of the Konan API, defaults to "https://api.konan.ai"
+        :type api_url: str, optional
+        :param verbose: whether to log debug messages, defaults to False
+        :type verbose: bool, optional
+        :param transport: transport shared by all requests, defaults to None.
+            If left as None, a pooled keep-alive KonanSessionTransport is created
+        :type transport: Optional[KonanBaseTransport], optional
+        :param pool_maxsize: maximum number of connections to keep alive per host, defaults to DEFAULT_POOL_MAXSIZE.
+            Ignored if transport is passed
+        :type pool_maxsize: int, optional
+        :param timeout: default (connect, read) timeout of every request, defaults to DEFAULT_TIMEOUT.
+            Pass None to wait indefinitely. Ignored if transport is passed
+        :type timeout: Optional[KonanTimeout], optional
+        :param retry_policy: policy to retry failed requests with, defaults to None.
+            If left as None, a default KonanRetryPolicy is used, which never retries non-idempotent requests
+            such as predictions. Pass KonanRetryPolicy(max_attempts=1) to never retry
+        :type retry_policy: Optional[KonanRetryPolicy], optional
+        :param circuit_breaker: circuit breaker failing predictions and evaluations fast, per deployment,
+            while the deployment is unhealthy, defaults to None (never fail fast).
+            Its circuits' states are available through circuit_breaker.get_statuses()
+        :type circuit_breaker: Optional[KonanCircuitBreaker], optional
+        :param rate_limiter: limiter smoothing the rate and number in flight of all requests,
+            with optional tighter limits per endpoint, defaults to None (unlimited)
+        :type rate_limiter: Optional[KonanRateLimiter], optional
+        :param prediction_cache: cache serving repeated predictions of the same input by the same live model,
+            for deployments whose models are deterministic, defaults to None (never cache).
+            Its hit and miss counts are available through prediction_cache.hits and prediction_cache.misses
+        :type prediction_cache: Optional[KonanPredictionCache], optional
+        :param single_flight: coalescer sharing one prediction request, and its result, between concurrent
+            predictions of the same input by the same deployment, defaults to None (never coalesce).
+            The number of coalesced predictions is available through single_flight.coalesced_count
+        :type single_flight: Optional[KonanSingleFlight], optional
+        :param model_registry: cache of the models of each deployment, used to switch model states
+            without listing the deployment's models every time, defaults to None (always list them)
+        :type model_registry: Optional[KonanModelRegistry], optional
+        """
+        super().__init__(
+            auth_url=auth_url, api_url=api_url,
+            verbose=verbose,
+            transport=transport or KonanSessionTransport(
+                pool_maxsize=pool_maxsize,
+                timeout=timeout,
+            ),
+            retry_policy=retry_policy,
+            circuit_breaker=circuit_breaker,
+            rate_limiter=rate_limiter,
+            prediction_cache=prediction_cache,
+            single_flight=single_flight,
+            model_registry=model_registry,
+        )
 
     @deprecated.deprecated(
         reason='Password-based authentication will be removed in a future release.',
         version='1.4.0',
         category=DeprecationWarning,
     )
-    def login(self, email: str = None, password: str = None, api_key: str = None) -> None:
+    def login(
+        self, email: str = None, password: str = None, api_key: str = None,
+        background_refresh_margin: Optional[float] = None,
+        token_store: Optional[KonanBaseTokenStore] = None,
+    ) -> None:
         """Login to Konan with _either_ email + password credentails _or_ an API Key.
 
         At least one of the two authentication methods *must* be passed.
@@ -88,16 +169,40 @@ class KonanSDK:
         :type password: str, optional
         :param api_key: API Key of registered user, defaults to None
         :type api_key: str, optional
+        :param background_refresh_margin: if passed, renew the tokens from a background thread
+            this many seconds before they expire, instead of inline on the first request after they do,
+            defaults to None. Only supported with API Key authentication
+        :type background_refresh_margin: Optional[float], optional
+        :param token_store: store to share tokens through with other processes using the same API Key,
+            e.g. a KonanFileTokenStore, defaults to None. Only supported with API Key authentication
+        :type token_store: Optional[KonanBaseTokenStore], optional
         """
+        if isinstance(self.auth, KonanAPIKeyAuth):
+            self.auth.stop_background_refresh()
+
         if api_key is None:
             if email is None or password is None:
                 raise ValueError("Parameters for at least one authentication method must be passed")
-            self.auth = KonanAuth(auth_url=self.auth_url, email=email, password=password)
+            if background_refresh_margin is not None:
+                raise ValueError("Background token refresh is only supported with API Key authentication")
+            if token_store is not None:
+                raise ValueError("Token stores are only supported with API Key authentication")
+            self.auth = KonanAuth(
+                auth_url=self.auth_url, email=email, password=password,
+                transport=self.transport, retry_policy=self.retry_policy,
+            )
         else:
-            self.auth = KonanAPIKeyAuth(auth_url=self.auth_url, api_key=api_key)
+            self.auth = KonanAPIKeyAuth(
+                auth_url=self.auth_url, api_key=api_key,
+                transport=self.transport, retry_policy=self.retry_policy,
+                token_store=token_store,
+            )
 
         self.auth.login()
 
+        if background_refresh_margin is not None:
+            self.auth.start_background_refresh(margin=background_refresh_margin)
+
     def _create_project(self, name: str, description: str = None) -> KonanDeployment:
         """Call the create project function
 
@@ -114,10 +219,7 @@ class KonanSDK:
         # Check if access token is valid and retrieve a new one if needed
         self.auth.auto_refresh_token()
 
-        deployment = CreateProjectEndpoint(
-            self.api_url,
-            user=self.auth.user
-        ).request(
+        deployment = self._create_endpoint(CreateProjectEndpoint).request(
             KonanProjectCreationRequest(
                 name=name,
                 description=description,
@@ -155,10 +257,7 @@ class KonanSDK:
         # Check if access token is valid and retrieve a new one if needed
         self.auth.auto_refresh_token()
 
-        deployment_creation_response = CreateDeploymentEndpoint(
-            self.api_url,
-            user=self.auth.user
-        ).request(
+        deployment_creation_response = self._create_endpoint(CreateDeploymentEndpoint).request(
             KonanDeploymentCreationRequest(
                 name=name,
                 description=None,
@@ -257,9 +356,8 @@ class KonanSDK:
         # Check if access token is valid and retrieve a new one if needed
         self.auth.auto_refresh_token()
 
-        konan_model = CreateModelEndpoint(
-            self.api_url,
-            user=self.auth.user,
+        konan_model = self._create_endpoint(
+            CreateModelEndpoint,
             deployment_uuid=deployment_uuid,
         ).request(
             KonanModelCreationRequest(
@@ -269,46 +367,72 @@ class KonanSDK:
                 state=model_state,
             )
         )
+        self._on_model_created(deployment_uuid, konan_model, model_state)
         return konan_model
 
     def get_models(
         self,
         deployment_uuid: str,
+        timeout: Optional[KonanTimeout] = None,
+        deadline: Optional[KonanDeadlineLike] = None,
     ) -> List[KonanModel]:
         """Call the get models function
 
         :param deployment_uuid: uuid of the deployment to get its models
         :type deployment_uuid: str
+        :param timeout: timeout of every request, defaults to None (the SDK's default timeout)
+        :type timeout: Optional[KonanTimeout], optional
+        :param deadline: seconds the whole call may take, including retries and token refresh,
+            or a KonanDeadline shared with other calls, defaults to None (no deadline).
+            Once it passes, a KonanDeadlineExceededError is raised
+        :type deadline: Optional[KonanDeadlineLike], optional
         :return: konan_models
         :rtype: List[KonanModel]
         """
+        deadline = KonanDeadline.create(deadline)
         # check user performed login
         self.auth._post_login_checks()
 
         # Check if access token is valid and retrieve a new one if needed
-        self.auth.auto_refresh_token()
+        self.auth.auto_refresh_token(deadline=deadline)
 
-        konan_models = GetModelsEndpoint(
-            self.api_url,
-            user=self.auth.user,
+        konan_models = self._create_endpoint(
+            GetModelsEndpoint,
+            timeout=timeout, deadline=deadline,
             deployment_uuid=deployment_uuid,
         ).request(None)
 
+        self._on_models_listed(deployment_uuid, konan_models)
         return konan_models
 
+    def _get_model_index(
+        self,
+        deployment_uuid: str,
+        model_uuids: Iterable[Optional[str]] = (),
+        timeout: Optional[KonanTimeout] = None,
+        deadline: Optional[KonanDeadline] = None,
+    ) -> KonanModelIndex:
+        index = self._get_registered_model_index(deployment_uuid, model_uuids)
+        if index is not None:
+            return index
+        return KonanModelIndex(self.get_models(deployment_uuid, timeout=timeout, deadline=deadline))
+
     def _switch_nonlive_model(
         self,
         model_uuid: str,
         switch_to: KonanModelState,
+        timeout: Optional[KonanTimeout] = None,
+        deadline: Optional[KonanDeadlineLike] = None,
     ) -> None:
+        deadline = KonanDeadline.create(deadline)
         # check user performed login
         self.auth._post_login_checks()
         # Check if access token is valid and retrieve a new one if needed
-        self.auth.auto_refresh_token()
+        self.auth.auto_refresh_token(deadline=deadline)
 
-        return SwitchNonLiveModelEndpoint(
-            self.api_url,
-            user=self.auth.user,
+        return self._create_endpoint(
+            SwitchNonLiveModelEndpoint,
+            timeout=timeout, deadline=deadline,
             model_uuid=model_uuid,
         ).request(
             switch_to,
@@ -319,36 +443,21 @@ class KonanSDK:
         deployment_uuid: str,
         live_model_uuid: str,
         switch_to: KonanModelState,
-        models: List[KonanModel],
+        models: KonanModelIndex,
         new_live_model_uuid: str = None,
+        timeout: Optional[KonanTimeout] = None,
+        deadline: Optional[KonanDeadlineLike] = None,
     ) -> None:
-        assert live_model_uuid, (
-            f"Unable to find live model of deployment with uuid {deployment_uuid}",
-        )
-        assert new_live_model_uuid, (
-            f"Attempting to demote live model with uuid {live_model_uuid}",
-            " and no model to promote specified",
-        )
-        assert live_model_uuid != new_live_model_uuid, (
-            f"Attempting to demote live model with uuid {live_model_uuid}",
-            " and model to promote instead is the same",
-        )
-        # Get the state of the model to be promoted
-        new_live_model_current_state = find_model_state(new_live_model_uuid, models)
-        assert new_live_model_current_state, (
-            f"Attempting to demote live model with uuid {live_model_uuid}",
-            f" and model to promote instead with uuid {new_live_model_uuid}",
-            " not found",
-            f" within the models of deployment with uuid {deployment_uuid}",
-        )
+        deadline = KonanDeadline.create(deadline)
+        self._check_live_model_switch(deployment_uuid, live_model_uuid, models, new_live_model_uuid)
         # check user performed login
         self.auth._post_login_checks()
         # Check if access token is valid and retrieve a new one if needed
-        self.auth.auto_refresh_token()
+        self.auth.auto_refresh_token(deadline=deadline)
 
-        return SwitchLiveModelEndpoint(
-            self.api_url,
-            user=self.auth.user,
+        switch_result = self._create_endpoint(
+            SwitchLiveModelEndpoint,
+            timeout=timeout, deadline=deadline,
             deployment_uuid=deployment_uuid,
         ).request(
             KonanLiveModelSwitchState(
@@ -356,6 +465,11 @@ class KonanSDK:
                 new_live_model_uuid,
             ),
         )
+        self._on_model_states_switched(deployment_uuid, {
+            live_model_uuid: switch_to,
+            new_live_model_uuid: KonanModelState.Live,
+        })
+        return switch_result
 
     def switch_model_state(
         self,
@@ -363,6 +477,8 @@ class KonanSDK:
         model_uuid: str,
         switch_to: KonanModelState,
         new_live_model_uuid: str = None,
+        timeout: Optional[KonanTimeout] = None,
+        deadline: Optional[KonanDeadlineLike] = None,
     ) -> None:
         """Switch the sate of a Konan Model
 
@@ -379,56 +495,48 @@ class KonanSDK:
         :param new_live_model_uuid: _description_, defaults to None.
         Required only if model_uuid is the UUID of the current Live model
         :type new_live_model_uuid: str, optional
+        :param timeout: timeout of every request, defaults to None (the SDK's default timeout)
+        :type timeout: Optional[KonanTimeout], optional
+        :param deadline: seconds the whole call may take, including retries and token refresh,
+            or a KonanDeadline shared with other calls, defaults to None (no deadline).
+            Once it passes, a KonanDeadlineExceededError is raised
+        :type deadline: Optional[KonanDeadlineLike], optional
         :return: None
         :rtype: None
         """
-        # Retrieve list of models linked with this deployment
-        models = self.get_models(deployment_uuid)
-
-        live_model_uuid = find_live_model(
-            models=models,
-        )
-        model_state = find_model_state(model_uuid, models)
-
-        assert model_state, (
-            f"Model with uuid {model_uuid} not found",
-            f" within the models of Deployment with uuid {deployment_uuid}",
+        deadline = KonanDeadline.create(deadline)
+        # Retrieve models linked with this deployment, indexed by uuid and state
+        models = self._get_model_index(
+            deployment_uuid,
+            model_uuids=(model_uuid, new_live_model_uuid),
+            timeout=timeout, deadline=deadline,
         )
-        assert model_state != switch_to, (
-            f"Model with uuid {model_uuid} already at {switch_to} state",
+        live_model_switch = self._get_live_model_switch(
+            deployment_uuid, model_uuid, switch_to, models, new_live_model_uuid,
         )
-        if model_state == KonanModelState.Live:
-            return self._switch_live_model(
-                deployment_uuid=deployment_uuid,
-                live_model_uuid=model_uuid,
-                switch_to=switch_to,
-                models=models,
-                new_live_model_uuid=new_live_model_uuid,
-            )
-        elif switch_to == KonanModelState.Live:
-            return self._switch_live_model(
-                deployment_uuid=deployment_uuid,
-                live_model_uuid=live_model_uuid,
-                switch_to=KonanModelState.Challenger,
-                models=models,
-                new_live_model_uuid=model_uuid,
-            )
-        else:
-            # check user performed login
-            self.auth._post_login_checks()
-            # Check if access token is valid and retrieve a new one if needed
-            self.auth.auto_refresh_token()
-            return SwitchNonLiveModelEndpoint(
-                self.api_url,
-                user=self.auth.user,
-                model_uuid=model_uuid,
-            ).request(
-                switch_to,
+        try:
+            if live_model_switch is not None:
+                return self._switch_live_model(
+                    deployment_uuid=deployment_uuid,
+                    models=models,
+                    timeout=timeout, deadline=deadline,
+                    **live_model_switch,
+                )
+            switch_result = self._switch_nonlive_model(
+                model_uuid, switch_to,
+                timeout=timeout, deadline=deadline,
             )
+            self._on_model_states_switched(deployment_uuid, {model_uuid: switch_to})
+            return switch_result
+        except Exception:
+            self._on_model_switch_failed(deployment_uuid)
+            raise
 
     def predict(
         self,
-        deployment_uuid: str, input_data: Union[Dict, str]
+        deployment_uuid: str, input_data: Union[Dict, str],
+        timeout: Optional[KonanTimeout] = None,
+        deadline: Optional[KonanDeadlineLike] = None,
     ) -> Tuple[str, Dict]:
         """Call the predict function for a given deployment
 
@@ -436,24 +544,126 @@ class KonanSDK:
         :type deployment_uuid: str
         :param input_data: data to pass to the model
         :type input_data: Union[Dict, str]
+        :param timeout: timeout of every request, defaults to None (the SDK's default timeout)
+        :type timeout: Optional[KonanTimeout], optional
+        :param deadline: seconds the whole call may take, including retries and token refresh,
+            or a KonanDeadline shared with other calls, defaults to None (no deadline).
+            Once it passes, a KonanDeadlineExceededError is raised
+        :type deadline: Optional[KonanDeadlineLike], optional
         :return: A tuple of prediction uuid and the prediction output
         :rtype: Tuple[str, Dict]
         """
+        deadline = KonanDeadline.create(deadline)
+        cache_key = None
+        if self.prediction_cache is not None:
+            cache_key, cached_prediction = self._get_cached_prediction(
+                deployment_uuid,
+                self._get_live_model_uuid(deployment_uuid, timeout=timeout, deadline=deadline),
+                input_data,
+            )
+            if cached_prediction is not None:
+                return cached_prediction
+
+        if self.single_flight is None:
+            return self._request_prediction(deployment_uuid, input_data, cache_key, timeout, deadline)
+        # Identical predictions arriving while this one is in flight share its request
+        return self.single_flight.call(
+            self._get_single_flight_key(deployment_uuid, input_data),
+            lambda: self._request_prediction(deployment_uuid, input_data, cache_key, timeout, deadline),
+            deadline=deadline,
+        )
+
+    def _request_prediction(
+        self,
+        deployment_uuid: str, input_data: Union[Dict, str],
+        cache_key: Optional[str],
+        timeout: Optional[KonanTimeout],
+        deadline: Optional[KonanDeadline],
+    ) -> Tuple[str, Dict]:
         # check user performed login
         self.auth._post_login_checks()
 
         # Check if access token is valid and retrieve a new one if needed
-        self.auth.auto_refresh_token()
+        self.auth.auto_refresh_token(deadline=deadline)
 
-        prediction = PredictionEndpoint(
-            self.api_url,
-            deployment_uuid=deployment_uuid, user=self.auth.user
+        prediction = self._create_endpoint(
+            PredictionEndpoint,
+            timeout=timeout, deadline=deadline,
+            deployment_uuid=deployment_uuid,
+            circuit_breaker=self.circuit_breaker,
         ).request(input_data)
-        return prediction.uuid, prediction.output
+        return self._on_prediction(deployment_uuid, cache_key, prediction)
+
+    def _get_live_model_uuid(
+        self,
+        deployment_uuid: str,
+        timeout: Optional[KonanTimeout] = None,
+        deadline: Optional[KonanDeadline] = None,
+    ) -> Optional[str]:
+        # Remembered by the prediction cache, to avoid listing the deployment's models on every prediction
+        live_model_uuid = self.prediction_cache.get_live_model(deployment_uuid)
+        if live_model_uuid is None:
+            live_model_uuid = self._get_model_index(deployment_uuid, timeout=timeout, deadline=deadline).live_model_uuid
+            self.prediction_cache.set_live_model(deployment_uuid, live_model_uuid)
+        return live_model_uuid
+
+    def predict_many(
+        self,
+        deployment_uuid: str, inputs: Iterable[Union[Dict, str]],
+        max_concurrency: int = DEFAULT_POOL_MAXSIZE,
+        ordered: bool = True,
+    ) -> Generator[KonanBulkPredictionResult, None, None]:
+        """Call the predict function for a given deployment on many inputs concurrently
+
+        Inputs are consumed lazily, so any iterable (e.g. a generator reading a file) can be passed.
+        A failed prediction does not abort the others, but is reported as a result with its error set.
+        To reuse connections, max_concurrency should not exceed the transport's pool_maxsize.
+
+        :param deployment_uuid: uuid of deployment to use for prediction
+        :type deployment_uuid: str
+        :param inputs: data to pass to the model, one prediction per item
+        :type inputs: Iterable[Union[Dict, str]]
+        :param max_concurrency: maximum number of predictions in flight, defaults to DEFAULT_POOL_MAXSIZE
+        :type max_concurrency: int, optional
+        :param ordered: whether to yield results in the order of inputs, defaults to True.
+            If False, results are yielded as soon as they are available
+        :type ordered: bool, optional
+        :return: generator of one result per input
+        :rtype: Generator[KonanBulkPredictionResult, None, None]
+        """
+        # check user performed login
+        self.auth._post_login_checks()
+
+        def _refreshed_inputs() -> Generator[Union[Dict, str], None, None]:
+            for input_data in inputs:
+                # Check if access token is valid and retrieve a new one if needed
+                self.auth.auto_refresh_token()
+                yield input_data
+
+        def _predict(input_data: Union[Dict, str]) -> KonanPrediction:
+            return self._create_endpoint(
+                PredictionEndpoint,
+                deployment_uuid=deployment_uuid,
+                circuit_breaker=self.circuit_breaker,
+            ).request(input_data)
+
+        for index, future in map_concurrently(
+            _predict, _refreshed_inputs(),
+            max_concurrency=max_concurrency, ordered=ordered,
+        ):
+            error = future.exception()
+            if error is not None:
+                logger.debug(f"Prediction of input {index} failed: {error}")
+                yield KonanBulkPredictionResult(index, error=error)
+            else:
+                prediction: KonanPrediction = future.result()
+                yield KonanBulkPredictionResult(index, uuid=prediction.uuid, output=prediction.output)
 
     def evaluate(
         self, deployment_uuid: str,
-        start_time: datetime.datetime, end_time: datetime.datetime
+        start_time: datetime.datetime, end_time: datetime.datetime,
+        timeout: Optional[KonanTimeout] = None,
+        deadline: Optional[KonanDeadlineLike] = None,
     ) -> List[KonanBaseMetric]:
         """Call the evaluate function for a given deployment
 
@@ -463,25 +673,36 @@ class KonanSDK:
         :type start_time: datetime.datetime
         :param end_time: use predictions made before or at this time
         :type end_time: datetime.datetime
+        :param timeout: timeout of every request, defaults to None (the SDK's default timeout)
+        :type timeout: Optional[KonanTimeout], optional
+        :param deadline: seconds the whole call may take, including retries and token refresh,
+            or a KonanDeadline shared with other calls, defaults to None (no deadline).
+            Once it passes, a KonanDeadlineExceededError is raised
+        :type deadline: Optional[KonanDeadlineLike], optional
         :return: A model evaluation object
         :rtype: EvaluateEndpoint.ResponseObject
         """
+        deadline = KonanDeadline.create(deadline)
         # check user performed login
         self.auth._post_login_checks()
 
         # Check if access token is valid and retrieve a new one if needed
-        self.auth.auto_refresh_token()
+        self.auth.auto_refresh_token(deadline=deadline)
 
-        model_metrics = EvaluateEndpoint(
-            self.api_url,
-            deployment_uuid=deployment_uuid, user=self.auth.user
+        model_metrics = self._create_endpoint(
+            EvaluateEndpoint,
+            deployment_uuid=deployment_uuid,
+            timeout=timeout, deadline=deadline,
+            circuit_breaker=self.circuit_breaker,
         ).request(KonanTimeWindow(start_time, end_time))
 
         return model_metrics
 
     def feedback(
         self, deployment_uuid: str,
-        feedbacks: List[KonanFeedbackSubmission]
+        feedbacks: List[KonanFeedbackSubmission],
+        timeout: Optional[KonanTimeout] = None,
+        deadline: Optional[KonanDeadlineLike] = None,
     ) -> KonanFeedbacksResult:
         """Call the feedback function for a given deployment
 
@@ -489,84 +710,392 @@ class KonanSDK:
         :type deployment_uuid: str
         :param feedbacks: feedback objects to register with the deployment
         :type feedbacks: List[KonanFeedbackSubmission]
+        :param timeout: timeout of every request, defaults to None (the SDK's default timeout)
+        :type timeout: Optional[KonanTimeout], optional
+        :param deadline: seconds the whole call may take, including retries and token refresh,
+            or a KonanDeadline shared with other calls, defaults to None (no deadline).
+            Once it passes, a KonanDeadlineExceededError is raised
+        :type deadline: Optional[KonanDeadlineLike], optional
         :return: feedback result
         :rtype: KonanFeedbacksResult
         """
+        deadline = KonanDeadline.create(deadline)
         # check user performed login
         self.auth._post_login_checks()
 
         # Check if access token is valid and retrieve a new one if needed
-        self.auth.auto_refresh_token()
+        self.auth.auto_refresh_token(deadline=deadline)
 
-        feedbacks_result = FeedbackEndpoint(
-            self.api_url,
-            deployment_uuid=deployment_uuid, user=self.auth.user
+        feedbacks_result = self._create_endpoint(
+            FeedbackEndpoint,
+            deployment_uuid=deployment_uuid,
+            timeout=timeout, deadline=deadline,
         ).request(feedbacks)
         return feedbacks_result
 
+    def feedback_stream(
+        self, deployment_uuid: str,
+        feedbacks: Iterable[KonanFeedbackSubmission],
+        chunk_size: int = 1000,
+        max_concurrency: int = 4,
+    ) -> KonanFeedbacksResult:
+        """Call the feedback function for a given deployment on any number of feedbacks, in concurrent chunks
+
+        Feedbacks are consumed lazily, so any iterable (e.g. a generator reading a file) can be passed.
+        If submitting a chunk fails, its feedbacks are reported as failed, and the other chunks are still submitted.
+
+        :param deployment_uuid: uuid of deployment to use for prediction
+        :type deployment_uuid: str
+        :param feedbacks: feedback objects to register with the deployment
+        :type feedbacks: Iterable[KonanFeedbackSubmission]
+        :param chunk_size: maximum number of feedbacks per request, defaults to 1000
+        :type chunk_size: int, optional
+        :param max_concurrency: maximum number of requests in flight, defaults to 4
+        :type max_concurrency: int, optional
+        :return: feedback result aggregated over all chunks
+        :rtype: KonanFeedbacksResult
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+
+        # check user performed login
+        self.auth._post_login_checks()
+
+        def _refreshed_chunks() -> Generator[List[KonanFeedbackSubmission], None, None]:
+            feedbacks_iterator = iter(feedbacks)
+            chunk = list(itertools.islice(feedbacks_iterator, chunk_size))
+            while chunk:
+                # Check if access token is valid and retrieve a new one if needed
+                self.auth.auto_refresh_token()
+                yield chunk
+                chunk = list(itertools.islice(feedbacks_iterator, chunk_size))
+
+        def _feedback(chunk: List[KonanFeedbackSubmission]) -> KonanFeedbacksResult:
+            try:
+                return self._create_endpoint(
+                    FeedbackEndpoint,
+                    deployment_uuid=deployment_uuid,
+                ).request(chunk)
+            except Exception as e:
+                logger.debug(f"Submitting a chunk of {len(chunk)} feedbacks failed: {e}")
+                status_code = getattr(getattr(e, 'response', None), 'status_code', None) or 0
+                return KonanFeedbacksResult(
+                    [
+                        KonanFeedbackStatus(feedback.prediction_uuid, status_code, str(e))
+                        for feedback in chunk
+                    ],
+                    0, len(chunk), len(chunk),
+                )
+
+        return KonanFeedbacksResult.aggregate([
+            future.result() for _, future in map_concurrently(
+                _feedback, _refreshed_chunks(),
+                max_concurrency=max_concurrency, ordered=False,
+            )
+        ])
+
     def delete_model(
         self,
         model_uuid: str,
+        timeout: Optional[KonanTimeout] = None,
+        deadline: Optional[KonanDeadlineLike] = None,
     ) -> bool:
         """Call the delete function for a given model
         WARNING: Using this method with a valid mode_uuid will DELETE it!!
         :param model_uuid: uuid of model to delete
         :type model_uuid: str
+        :param timeout: timeout of every request, defaults to None (the SDK's default timeout)
+        :type timeout: Optional[KonanTimeout], optional
+        :param deadline: seconds the whole call may take, including retries and token refresh,
+            or a KonanDeadline shared with other calls, defaults to None (no deadline).
+            Once it passes, a KonanDeadlineExceededError is raised
+        :type deadline: Optional[KonanDeadlineLike], optional
         :return: success
         :rtype: bool
         """
+        deadline = KonanDeadline.create(deadline)
         # check user performed login
         self.auth._post_login_checks()
 
         # Check if access token is valid and retrieve a new one if needed
-        self.auth.auto_refresh_token()
+        self.auth.auto_refresh_token(deadline=deadline)
 
-        delete_model_result = DeleteModelEndpoint(
-            self.api_url,
-            user=self.auth.user,
+        delete_model_result = self._create_endpoint(
+            DeleteModelEndpoint,
+            timeout=timeout, deadline=deadline,
             model_uuid=model_uuid,
         ).request(None)
+        self._on_model_deleted(model_uuid)
         return delete_model_result
 
     def delete_deployment(
         self,
         deployment_uuid: str,
+        timeout: Optional[KonanTimeout] = None,
+        deadline: Optional[KonanDeadlineLike] = None,
     ) -> bool:
         """Call the delete function for a given deployment
         WARNING: Using this method with a valid deployment_uuid will DELETE it!!
         :param deployment_uuid: uuid of deployment to delete
         :type deployment_uuid: str
+        :param timeout: timeout of every request, defaults to None (the SDK's default timeout)
+        :type timeout: Optional[KonanTimeout], optional
+        :param deadline: seconds the whole call may take, including retries and token refresh,
+            or a KonanDeadline shared with other calls, defaults to None (no deadline).
+            Once it passes, a KonanDeadlineExceededError is raised
+        :type deadline: Optional[KonanDeadlineLike], optional
         :return: success
         :rtype: bool
         """
+        deadline = KonanDeadline.create(deadline)
 
         # check user performed login
         self.auth._post_login_checks()
 
         # Check if access token is valid and retrieve a new one if needed
-        self.auth.auto_refresh_token()
+        self.auth.auto_refresh_token(deadline=deadline)
 
-        delete_deployment_result = DeleteDeployment(
-            self.api_url,
+        delete_deployment_result = self._create_endpoint(
+            DeleteDeployment,
             deployment_uuid=deployment_uuid,
-            user=self.auth.user
+            timeout=timeout, deadline=deadline,
         ).request(None)
+        self._on_deployment_deleted(deployment_uuid)
         return delete_deployment_result
 
     def get_predictions(
         self, deployment_uuid: str,
         start_time: datetime.datetime, end_time: datetime.datetime,
-    ) -> Generator[List[KonanPrediction], None, None]:
+        shards: int = 1,
+        ordered: bool = True,
+        max_buffered_pages: int = 8,
+        prefetch: int = 0,
+        page_size: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_every: int = 1,
+        resume_from: Optional[str] = None,
+        as_batches: bool = False,
+        timeout: Optional[KonanTimeout] = None,
+        deadline: Optional[KonanDeadlineLike] = None,
+    ) -> Generator[Union[List[KonanPrediction], KonanPredictionBatch], None, None]:
+        """Iterate over the pages of predictions made by a given deployment
+
+        If shards is more than 1, the time window is split into that many consecutive, non-overlapping
+        sub-windows whose pages are fetched in parallel. Each prediction is still returned exactly once.
+
+        :param deployment_uuid: uuid of deployment to list its predictions
+        :type deployment_uuid: str
+        :param start_time: list predictions made at or after this time
+        :type start_time: datetime.datetime
+        :param end_time: list predictions made before or at this time
+        :type end_time: datetime.datetime
+        :param shards: number of sub-windows to fetch in parallel, defaults to 1
+        :type shards: int, optional
+        :param ordered: whether to return all pages of a sub-window before those of the next one, defaults to True.
+            If False, pages are returned as soon as any sub-window fetches them.
+            Only used if shards is more than 1
+        :type ordered: bool, optional
+        :param max_buffered_pages: maximum number of pages each sub-window may fetch ahead of the caller,
+            defaults to 8. Only used if shards is more than 1
+        :type max_buffered_pages: int, optional
+        :param prefetch: number of pages to fetch in the background while the caller processes the current one,
+            defaults to 0. Only used if shards is 1, as sub-windows are already fetched ahead
+        :type prefetch: int, optional
+        :param page_size: number of predictions per page, defaults to None (the API's default).
+            Larger pages mean fewer round trips
+        :type page_size: Optional[int], optional
+        :param fields: KonanPrediction attributes to retrieve, any of "uuid", "output", "features" and "feedback",
+            defaults to None (all of them). Attributes left out are None, and are not sent by the API
+        :type fields: Optional[List[str]], optional
+        :param checkpoint_path: path of a file to persist progress to, defaults to None (no checkpointing).
+            Progress is saved once the caller moves on from a page, so a resumed iteration restarts
+            at the first page that was not fully processed. Not supported if shards is more than 1
+        :type checkpoint_path: Optional[str], optional
+        :param checkpoint_every: number of processed pages between two saved checkpoints, defaults to 1
+        :type checkpoint_every: int, optional
+        :param resume_from: path of a checkpoint file to resume from, defaults to None.
+            The checkpoint must be of the same deployment_uuid, start_time and end_time.
+            If no file exists at resume_from, iteration starts from the first page.
+            If checkpoint_path is None, progress keeps being saved to resume_from
+        :type resume_from: Optional[str], optional
+        :param as_batches: whether to return each page as a columnar KonanPredictionBatch
+            instead of a list of KonanPredictions, defaults to False.
+            Batches use far less memory when handling many predictions
+        :type as_batches: bool, optional
+        :param timeout: timeout of every request, defaults to None (the SDK's default timeout)
+        :type timeout: Optional[KonanTimeout], optional
+        :param deadline: seconds the whole iteration may take, including retries and token refresh,
+            or a KonanDeadline shared with other calls, defaults to None (no deadline).
+            Once it passes, a KonanDeadlineExceededError is raised when fetching the next page
+        :type deadline: Optional[KonanDeadlineLike], optional
+        :raises ValueError: if checkpointing is used with shards,
+            or if the checkpoint to resume from is of another deployment or time window
+        :return: generator of pages of predictions
+        :rtype: Generator[Union[List[KonanPrediction], KonanPredictionBatch], None, None]
+        """
+        deadline = KonanDeadline.create(deadline)
+
         # check user performed login
         self.auth._post_login_checks()
 
         # Check if access token is valid and retrieve a new one if needed
-        self.auth.auto_refresh_token()
+        self.auth.auto_refresh_token(deadline=deadline)
+
+        time_window = KonanTimeWindow(start_time, end_time)
+        if checkpoint_path is not None or resume_from is not None:
+            if shards != 1:
+                raise ValueError("Checkpointing is not supported when fetching predictions in shards")
+
+            checkpoint = load_predictions_checkpoint(resume_from) if resume_from is not None else None
+            if checkpoint is None:
+                checkpoint = KonanPredictionsCheckpoint(deployment_uuid, time_window)
+            elif (
+                checkpoint.deployment_uuid != deployment_uuid
+                or checkpoint.time_window.start_time != start_time
+                or checkpoint.time_window.end_time != end_time
+            ):
+                raise ValueError(
+                    f"Checkpoint at {resume_from} was not made for the predictions of deployment {deployment_uuid}"
+                    f" between {start_time.isoformat()} and {end_time.isoformat()}"
+                )
+            return self._get_checkpointed_predictions_pages(
+                checkpoint, checkpoint_path or resume_from,
+                checkpoint_every=checkpoint_every,
+                prefetch=prefetch, page_size=page_size, fields=fields, as_batches=as_batches,
+                timeout=timeout, deadline=deadline,
+            )
 
-        predictions_generator = GetPaginatedPredictionsEndpoint(
-            auth_object=self.auth,
-            api_url=self.api_url,
-            deployment_uuid=deployment_uuid, user=self.auth.user
-        ).get_pages(request_object=KonanTimeWindow(start_time, end_time))
+        if shards == 1:
+            return self._get_predictions_pages(
+                deployment_uuid, time_window,
+                prefetch=prefetch, page_size=page_size, fields=fields, as_batches=as_batches,
+                timeout=timeout, deadline=deadline,
+            )
+
+        return merge_generators(
+            [
+                self._get_predictions_pages(
+                    deployment_uuid, shard_time_window,
+                    page_size=page_size, fields=fields, as_batches=as_batches,
+                    timeout=timeout, deadline=deadline,
+                )
+                for shard_time_window in time_window.split(shards)
+            ],
+            ordered=ordered,
+            buffer_size=max_buffered_pages,
+        )
+
+    def _get_checkpointed_predictions_pages(
+        self, checkpoint: KonanPredictionsCheckpoint, checkpoint_path: str,
+        checkpoint_every: int = 1,
+        prefetch: int = 0,
+        page_size: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        as_batches: bool = False,
+        timeout: Optional[KonanTimeout] = None,
+        deadline: Optional[KonanDeadline] = None,
+    ) -> Generator[Union[List[KonanPrediction], KonanPredictionBatch], None, None]:
+        if checkpoint.is_finished:
+            return
+
+        pages = self._create_predictions_endpoint(
+            checkpoint.deployment_uuid,
+            page_size=page_size, fields=fields, as_batches=as_batches,
+            timeout=timeout, deadline=deadline,
+        ).get_pages_with_cursors(
+            request_object=checkpoint.time_window,
+            prefetch=prefetch,
+            next_url=checkpoint.next_url,
+        )
+        for page, next_url in pages:
+            yield page
+            # Only reached once the caller is done with the page and asks for the next one
+            checkpoint.next_url = next_url
+            checkpoint.pages_count += 1
+            checkpoint.predictions_count += len(page)
+            if page:
+                checkpoint.last_prediction_uuid = page[-1].uuid
+            checkpoint.updated_at = datetime.datetime.utcnow()
+            if checkpoint.pages_count % checkpoint_every == 0 or next_url is None:
+                save_predictions_checkpoint(checkpoint_path, checkpoint)
+
+    def _get_predictions_pages(
+        self, deployment_uuid: str,
+        time_window: KonanTimeWindow,
+        prefetch: int = 0,
+        page_size: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        as_batches: bool = False,
+        timeout: Optional[KonanTimeout] = None,
+        deadline: Optional[KonanDeadline] = None,
+    ) -> Generator[Union[List[KonanPrediction], KonanPredictionBatch], None, None]:
+        return self._create_predictions_endpoint(
+            deployment_uuid,
+            page_size=page_size, fields=fields, as_batches=as_batches,
+            timeout=timeout, deadline=deadline,
+        ).get_pages(request_object=time_window, prefetch=prefetch)
+
+    def export_predictions(
+        self, deployment_uuid: str,
+        start_time: datetime.datetime, end_time: datetime.datetime,
+        path: str,
+        format: Union[KonanPredictionsExportFormat, str] = KonanPredictionsExportFormat.Parquet,
+        flatten: bool = False,
+        page_size: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        prefetch: int = 1,
+        timeout: Optional[KonanTimeout] = None,
+        deadline: Optional[KonanDeadlineLike] = None,
+    ) -> int:
+        """Export the predictions made by a given deployment to a file
+
+        Pages of predictions are written as soon as they are fetched,
+        so memory stays bounded however many predictions are exported.
+        The "parquet" and "arrow" formats require the pyarrow package.
+
+        :param deployment_uuid: uuid of deployment to export its predictions
+        :type deployment_uuid: str
+        :param start_time: export predictions made at or after this time
+        :type start_time: datetime.datetime
+        :param end_time: export predictions made before or at this time
+        :type end_time: datetime.datetime
+        :param path: path of the file to export to
+        :type path: str
+        :param format: file format, one of "parquet", "arrow" or "ndjson", defaults to "parquet"
+        :type format: Union[KonanPredictionsExportFormat, str], optional
+        :param flatten: whether to write every key of the predictions' output and features
+            to its own column (named e.g. "output.<key>"), defaults to False.
+            Parquet and Arrow exports then spill their pages to temporary files until all are fetched,
+            so that their columns and types cover all pages
+        :type flatten: bool, optional
+        :param page_size: number of predictions per page, defaults to None (the API's default)
+        :type page_size: Optional[int], optional
+        :param fields: KonanPrediction attributes to export, any of "uuid", "output", "features" and "feedback",
+            defaults to None (all of them)
+        :type fields: Optional[List[str]], optional
+        :param prefetch: number of pages to fetch in the background while the previous one is written, defaults to 1
+        :type prefetch: int, optional
+        :param timeout: timeout of every request, defaults to None (the SDK's default timeout)
+        :type timeout: Optional[KonanTimeout], optional
+        :param deadline: seconds the whole export may take, including retries and token refresh,
+            or a KonanDeadline shared with other calls, defaults to None (no deadline).
+            Once it passes, a KonanDeadlineExceededError is raised
+        :type deadline: Optional[KonanDeadlineLike], optional
+        :return: number of exported predictions
+        :rtype: int
+        """
+        export_format = KonanPredictionsExportFormat(format)
+
+        predictions_generator = self.get_predictions(
+            deployment_uuid, start_time, end_time,
+            prefetch=prefetch, page_size=page_size, fields=fields,
+            as_batches=True,
+            timeout=timeout, deadline=deadline,
+        )
+        with create_predictions_writer(path, export_format, flatten=flatten) as writer:
+            for predictions in predictions_generator:
+                writer.write_page(predictions)
 
-        return predictions_generator
+        logger.debug(f"Exported {writer.predictions_count} predictions to {path}")
+        return writer.predictions_count
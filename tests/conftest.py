@@ -0,0 +1,109 @@
+import itertools
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Iterator, List, Optional
+
+import jwt
+import pytest
+
+_SECRET = 'konan-sdk-tests-secret-of-32-bytes'
+
+
+class FakeKonanServer():
+    """Local stand-in for Konan's auth and API servers.
+
+    Counts the requests made to every path, and remembers the access tokens that predictions were made with.
+    Predictions answer with an echo of their input. Also used by the benchmarks.
+    """
+    def __init__(
+        self,
+        access_ttl: float = 3600,
+        refresh_ttl: float = 86400,
+        refresh_delay: float = 0.0,
+        predict_delay: float = 0.0,
+        fail_predict: Optional[Callable[[Any], bool]] = None,
+    ) -> None:
+        self.access_ttl = access_ttl
+        self.refresh_ttl = refresh_ttl
+        self.refresh_delay = refresh_delay
+        self.predict_delay = predict_delay
+        # Predicate on the input of a prediction, answering it with a 500 status when true
+        self.fail_predict = fail_predict
+        self.counts: Counter = Counter()
+        self.prediction_tokens: List[str] = []
+
+        self._token_ids = itertools.count()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._create_handler())
+        self._server.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self._server.server_address[1]}'
+
+    def issue_token(self, ttl: float) -> str:
+        # Unique per call, so that tests can tell tokens apart
+        return jwt.encode(
+            {
+                'email': 'tests@konan.ai', 'first_name': 'Konan', 'last_name': 'Tests',
+                'organization_id': 'tests', 'exp': int(time.time() + ttl), 'jti': next(self._token_ids),
+            },
+            _SECRET, algorithm='HS256',
+        )
+
+    def _create_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def _send(self, status: int, body: dict) -> None:
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self) -> None:  # noqa: N802
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)) or b'null')
+                with server._lock:
+                    server.counts[self.path] += 1
+                if self.path == '/api/auth/api_key/':
+                    return self._send(200, {
+                        'access': server.issue_token(server.access_ttl),
+                        'refresh': server.issue_token(server.refresh_ttl),
+                    })
+                if self.path == '/api/auth/token/refresh/':
+                    time.sleep(server.refresh_delay)
+                    return self._send(200, {'access': server.issue_token(server.access_ttl)})
+                if self.path.endswith('/predict/'):
+                    time.sleep(server.predict_delay)
+                    if server.fail_predict is not None and server.fail_predict(body):
+                        return self._send(500, {'detail': 'Internal Server Error'})
+                    with server._lock:
+                        server.prediction_tokens.append(self.headers['Authorization'].split(' ', 1)[1])
+                        prediction_uuid = f"prediction-{len(server.prediction_tokens)}"
+                    return self._send(200, {'prediction_uuid': prediction_uuid, 'output': {'echo': body}})
+                return self._send(404, {'detail': 'Not Found'})
+
+        return Handler
+
+    def start(self) -> None:
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def fake_konan_server() -> Iterator[FakeKonanServer]:
+    server = FakeKonanServer()
+    server.start()
+    yield server
+    server.stop()
@@ -0,0 +1,46 @@
+import pickle
+import warnings
+
+import pytest
+
+from konan_sdk.konan_service.artifacts import KonanServiceArtifactLoader
+
+
+def test_raw_artifacts_are_memory_mapped(tmp_path):
+    (tmp_path / 'model.onnx').write_bytes(b'weights')
+    loader = KonanServiceArtifactLoader(str(tmp_path))
+
+    assert loader.load('model.onnx')[:] == b'weights'
+    assert loader.get_stats()[0].memory_mapped
+
+
+def test_empty_raw_artifacts_load_as_empty_bytes(tmp_path):
+    (tmp_path / 'empty.onnx').write_bytes(b'')
+    loader = KonanServiceArtifactLoader(str(tmp_path))
+
+    assert loader.load('empty.onnx') == b''
+    assert not loader.get_stats()[0].memory_mapped
+
+
+@pytest.mark.parametrize('compress, memory_mapped', [(0, True), (3, False)])
+def test_joblib_artifacts_report_whether_their_arrays_are_memory_mapped(tmp_path, compress, memory_mapped):
+    joblib = pytest.importorskip('joblib')
+    numpy = pytest.importorskip('numpy')
+    joblib.dump({'weights': numpy.arange(1000, dtype=numpy.float64)}, str(tmp_path / 'model.joblib'), compress=compress)
+    loader = KonanServiceArtifactLoader(str(tmp_path))
+
+    with warnings.catch_warnings():
+        # joblib warns that compressed dumps cannot be memory-mapped
+        warnings.simplefilter('ignore', UserWarning)
+        artifact = loader.load('model.joblib')
+
+    assert artifact['weights'].sum() == 499500
+    assert loader.get_stats()[0].memory_mapped is memory_mapped
+
+
+def test_plain_pickle_artifacts_are_not_memory_mapped(tmp_path):
+    (tmp_path / 'model.pkl').write_bytes(pickle.dumps({'threshold': 0.5}))
+    loader = KonanServiceArtifactLoader(str(tmp_path))
+
+    assert loader.load('model.pkl') == {'threshold': 0.5}
+    assert not loader.get_stats()[0].memory_mapped
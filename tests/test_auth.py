@@ -0,0 +1,132 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from konan_sdk.async_sdk import AsyncKonanSDK
+from konan_sdk.endpoints.predictions import PredictionEndpoint
+from konan_sdk.konan_token_stores import KonanFileTokenStore
+from konan_sdk.sdk import KonanSDK
+
+REFRESH_PATH = '/api/auth/token/refresh/'
+LOGIN_PATH = '/api/auth/api_key/'
+CALLERS_COUNT = 64
+
+
+def expire_access_token(sdk) -> None:
+    sdk.auth.user.access_exp = 0
+
+
+def test_concurrent_threads_refresh_once(fake_konan_server):
+    fake_konan_server.refresh_delay = 0.2
+    sdk = KonanSDK(auth_url=fake_konan_server.url, api_url=fake_konan_server.url, pool_maxsize=CALLERS_COUNT)
+    sdk.login(api_key='api-key')
+    expire_access_token(sdk)
+
+    barrier = threading.Barrier(CALLERS_COUNT)
+    errors = []
+
+    def predict() -> None:
+        barrier.wait()
+        try:
+            for _ in range(5):
+                sdk.predict('deployment', {'feature': 1})
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=predict) for _ in range(CALLERS_COUNT)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert fake_konan_server.counts[REFRESH_PATH] == 1
+    assert fake_konan_server.counts[LOGIN_PATH] == 1
+    assert set(fake_konan_server.prediction_tokens) == {sdk.auth.user.access_token}
+
+
+def test_concurrent_tasks_refresh_once(fake_konan_server):
+    pytest.importorskip('httpx')
+    fake_konan_server.refresh_delay = 0.2
+
+    async def predict_concurrently() -> str:
+        async with AsyncKonanSDK(
+            auth_url=fake_konan_server.url, api_url=fake_konan_server.url, max_concurrency=CALLERS_COUNT,
+        ) as sdk:
+            await sdk.login(api_key='api-key')
+            expire_access_token(sdk)
+            await asyncio.gather(*(sdk.predict('deployment', {'feature': 1}) for _ in range(CALLERS_COUNT * 4)))
+            return sdk.auth.user.access_token
+
+    access_token = asyncio.run(predict_concurrently())
+
+    assert fake_konan_server.counts[REFRESH_PATH] == 1
+    assert set(fake_konan_server.prediction_tokens) == {access_token}
+
+
+def test_background_login_renews_tokens_of_existing_endpoints(fake_konan_server):
+    sdk = KonanSDK(auth_url=fake_konan_server.url, api_url=fake_konan_server.url)
+    sdk.login(api_key='api-key')
+    endpoint = PredictionEndpoint(
+        fake_konan_server.url, deployment_uuid='deployment', user=sdk.auth.user, transport=sdk.transport,
+    )
+
+    # A margin longer than the refresh token's lifetime makes the background thread log in again right away
+    sdk.auth.start_background_refresh(margin=fake_konan_server.refresh_ttl * 2)
+    deadline = time.monotonic() + 5
+    while fake_konan_server.counts[LOGIN_PATH] < 2 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    sdk.auth.stop_background_refresh()
+    endpoint.request({'feature': 1})
+
+    assert fake_konan_server.counts[LOGIN_PATH] >= 2
+    assert fake_konan_server.prediction_tokens == [sdk.auth.user.access_token]
+
+
+def test_tokens_reused_from_store_reach_existing_endpoints(fake_konan_server, tmp_path):
+    token_store = KonanFileTokenStore(str(tmp_path))
+    sdk = KonanSDK(auth_url=fake_konan_server.url, api_url=fake_konan_server.url)
+    sdk.login(api_key='api-key', token_store=token_store)
+    endpoint = PredictionEndpoint(
+        fake_konan_server.url, deployment_uuid='deployment', user=sdk.auth.user, transport=sdk.transport,
+    )
+
+    # Another process renews the tokens and saves them to the store, where this one picks them up
+    access_token = fake_konan_server.issue_token(fake_konan_server.access_ttl)
+    token_store.save(sdk.auth._token_store_key, access_token, fake_konan_server.issue_token(60))
+    expire_access_token(sdk)
+    sdk.auth.auto_refresh_token()
+    endpoint.request({'feature': 1})
+
+    assert fake_konan_server.counts[REFRESH_PATH] == 0
+    assert fake_konan_server.prediction_tokens == [access_token]
+
+
+def test_tasks_sharing_token_store_refresh_without_blocking_loop(fake_konan_server, tmp_path):
+    pytest.importorskip('httpx')
+    fake_konan_server.refresh_delay = 0.2
+    token_store = KonanFileTokenStore(str(tmp_path))
+
+    async def predict_concurrently() -> None:
+        sdks = [AsyncKonanSDK(auth_url=fake_konan_server.url, api_url=fake_konan_server.url) for _ in range(2)]
+        for sdk in sdks:
+            await sdk.login(api_key='api-key', token_store=token_store)
+            expire_access_token(sdk)
+        token_store.save(sdks[0].auth._token_store_key, fake_konan_server.issue_token(-60), sdks[0].auth.user.refresh_token)
+        try:
+            await asyncio.gather(*(sdk.predict('deployment', {'feature': 1}) for sdk in sdks for _ in range(8)))
+        finally:
+            for sdk in sdks:
+                await sdk.aclose()
+
+    # Waiting for the store's file lock from within the event loop would deadlock it
+    thread = threading.Thread(target=asyncio.run, args=(predict_concurrently(),), daemon=True)
+    thread.start()
+    thread.join(timeout=10)
+
+    assert not thread.is_alive()
+    assert fake_konan_server.counts[REFRESH_PATH] == 1
+    assert fake_konan_server.counts[LOGIN_PATH] == 1
+    assert len(fake_konan_server.prediction_tokens) == 16
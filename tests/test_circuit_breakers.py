@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from konan_sdk.endpoints.circuit_breakers import KonanCircuitBreaker
+from konan_sdk.endpoints.predictions import PredictionEndpoint
+from konan_sdk.endpoints.transports import KonanBaseAsyncTransport
+from konan_sdk.konan_exceptions import KonanCircuitOpenError
+from konan_sdk.konan_types import KonanCircuitState
+from konan_sdk.konan_user import KonanUser
+
+KEY = 'deployment'
+
+
+def open_circuit(circuit_breaker: KonanCircuitBreaker) -> None:
+    for _ in range(circuit_breaker.minimum_calls):
+        circuit_breaker.record(KEY, circuit_breaker.before_call(KEY), success=False)
+
+
+def test_half_open_circuit_only_counts_trial_requests():
+    circuit_breaker = KonanCircuitBreaker(minimum_calls=2, cooldown=0)
+    # Sent while the circuit is closed, and finishing once it is half-open
+    stale_generation = circuit_breaker.before_call(KEY)
+    open_circuit(circuit_breaker)
+
+    trial_generation = circuit_breaker.before_call(KEY)
+    circuit_breaker.record(KEY, stale_generation, success=True)
+    assert circuit_breaker.get_status(KEY).state == KonanCircuitState.HalfOpen
+    with pytest.raises(KonanCircuitOpenError):
+        circuit_breaker.before_call(KEY)
+
+    circuit_breaker.record(KEY, trial_generation, success=True)
+    assert circuit_breaker.get_status(KEY).state == KonanCircuitState.Closed
+
+
+def test_half_open_circuit_ignores_failures_of_earlier_requests():
+    circuit_breaker = KonanCircuitBreaker(minimum_calls=2, cooldown=0)
+    stale_generation = circuit_breaker.before_call(KEY)
+    open_circuit(circuit_breaker)
+
+    trial_generation = circuit_breaker.before_call(KEY)
+    circuit_breaker.record(KEY, stale_generation, success=False)
+    circuit_breaker.record(KEY, trial_generation, success=True)
+    assert circuit_breaker.get_status(KEY).state == KonanCircuitState.Closed
+
+
+class HangingTransport(KonanBaseAsyncTransport):
+    async def request(self, method, url, headers=None, json=None, params=None, timeout=None):
+        await asyncio.Event().wait()
+
+
+def test_cancelled_trial_request_frees_its_slot(fake_konan_server):
+    circuit_breaker = KonanCircuitBreaker(minimum_calls=2, cooldown=0)
+    open_circuit(circuit_breaker)
+    user = KonanUser(fake_konan_server.issue_token(60), fake_konan_server.issue_token(60))
+    endpoint = PredictionEndpoint(
+        fake_konan_server.url, deployment_uuid=KEY, user=user,
+        transport=HangingTransport(), circuit_breaker=circuit_breaker,
+    )
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(asyncio.wait_for(endpoint.arequest({'feature': 1}), timeout=0.05))
+
+    # The next request is a trial one, instead of being rejected until the circuit is reset
+    trial_generation = circuit_breaker.before_call(KEY)
+    circuit_breaker.record(KEY, trial_generation, success=True)
+    assert circuit_breaker.get_status(KEY).state == KonanCircuitState.Closed
@@ -0,0 +1,26 @@
+import pytest
+
+from konan_sdk.konan_types import KonanPredictionBatch, KonanPredictionsExportFormat
+from konan_sdk.konan_utils.exports import create_predictions_writer
+
+pyarrow = pytest.importorskip('pyarrow')
+pyarrow_parquet = pytest.importorskip('pyarrow.parquet')
+
+
+def test_flattened_export_keeps_keys_of_later_pages_with_their_types(tmp_path):
+    path = str(tmp_path / 'predictions.parquet')
+    with create_predictions_writer(path, KonanPredictionsExportFormat.Parquet, flatten=True) as writer:
+        writer.write_page(KonanPredictionBatch(
+            ['a', 'b'], [{'score': 1}, {'score': 2}], [{'age': 30}, {'age': 'unknown'}], [None, None],
+        ))
+        writer.write_page(KonanPredictionBatch(['c'], [{'score': 0.5, 'label': 'yes'}], [{'age': 41}], [None]))
+
+    table = pyarrow_parquet.read_table(path)
+
+    assert table.schema.field('output.score').type == pyarrow.float64()
+    assert table.schema.field('output.label').type == pyarrow.string()
+    assert table.column('output.score').to_pylist() == [1.0, 2.0, 0.5]
+    assert table.column('output.label').to_pylist() == [None, None, 'yes']
+    # Keys holding values of several types are kept as JSON
+    assert table.column('features.age').to_pylist() == ['30', '"unknown"', '41']
+    assert list(tmp_path.iterdir()) == [tmp_path / 'predictions.parquet']
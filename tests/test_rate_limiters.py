@@ -0,0 +1,25 @@
+import threading
+import time
+
+from konan_sdk.endpoints.rate_limiters import KonanRateLimiter
+
+
+def test_requests_waiting_for_endpoint_rate_hold_no_in_flight_slot():
+    rate_limiter = KonanRateLimiter(max_in_flight=1, endpoint_limiters={'predict': KonanRateLimiter(rate=2, burst=1)})
+    with rate_limiter.limit('predict'):
+        pass
+
+    def predict() -> None:
+        # Waits half a second for the predict rate, which must not hold back requests to other endpoints
+        with rate_limiter.limit('predict'):
+            pass
+
+    predict_thread = threading.Thread(target=predict)
+    predict_thread.start()
+    time.sleep(0.05)
+    started_at = time.monotonic()
+    with rate_limiter.limit('feedback'):
+        waited = time.monotonic() - started_at
+    predict_thread.join()
+
+    assert waited < 0.2
@@ -0,0 +1,87 @@
+import asyncio
+import os
+import time
+
+import pytest
+from pydantic import BaseModel
+
+from konan_sdk.konan_service.executors import KonanServiceProcessPoolExecutor
+from konan_sdk.konan_service.models import KonanServiceBaseModel
+from konan_sdk.konan_service.serializers import KonanServiceBaseEvaluateResponse
+from konan_sdk.konan_service.services import KonanService
+
+
+class PredictionRequest(BaseModel):
+    feature: int
+
+
+class PredictionResponse(BaseModel):
+    score: float
+
+
+class ThresholdModel(KonanServiceBaseModel):
+    def __init__(self, threshold: float = 0.5, executor: str = 'numpy') -> None:
+        self.threshold = threshold
+        self.executor = executor
+
+    def predict(self, req: PredictionRequest) -> PredictionResponse:
+        return PredictionResponse(score=self.threshold)
+
+    def evaluate(self, req):
+        ...
+
+
+class WorkerModel(KonanServiceBaseModel):
+    def __init__(self, started_path: str) -> None:
+        with open(started_path, 'a') as started_file:
+            started_file.write(f"{os.getpid()}\n")
+
+    def predict(self, req: PredictionRequest) -> PredictionResponse:
+        return PredictionResponse(score=1.0)
+
+    def evaluate(self, req):
+        ...
+
+
+def test_model_parameters_named_like_service_options_keep_their_defaults():
+    service = KonanService(PredictionRequest, PredictionResponse, ThresholdModel, threshold=0.7)
+
+    assert service.model.threshold == 0.7
+    assert service.model.executor == 'numpy'
+
+
+def test_service_options_meant_for_the_model_are_rejected():
+    with pytest.raises(TypeError, match='executor'):
+        KonanService(PredictionRequest, PredictionResponse, ThresholdModel, executor='torch')
+
+
+def test_model_parameters_named_like_service_options_can_be_passed_positionally():
+    service = KonanService(
+        PredictionRequest, PredictionResponse, ThresholdModel, None, KonanServiceBaseEvaluateResponse, 0.7, 'torch',
+    )
+
+    assert service.model.threshold == 0.7
+    assert service.model.executor == 'torch'
+
+
+def test_process_pool_service_is_ready_once_workers_created_the_model(tmp_path):
+    started_path = tmp_path / 'started'
+    service = KonanService(
+        PredictionRequest, PredictionResponse, WorkerModel, started_path=str(started_path),
+        executor=KonanServiceProcessPoolExecutor(max_workers=2),
+    )
+    assert not service.is_ready
+
+    async def start() -> None:
+        await service.app.router.startup()
+        try:
+            deadline = time.monotonic() + 30
+            while not service.is_ready and service.startup_error is None and time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+            # Every worker created the model before the service reported ready
+            assert service.is_ready
+            assert len(started_path.read_text().split()) == 2
+        finally:
+            await service.app.router.shutdown()
+
+    asyncio.run(start())